@@ -0,0 +1,294 @@
+"""Concurrent Batched Embedding Stage for SuperStream RAG System."""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from llama_index.core.async_utils import asyncio_run
+
+from ingest.profiling import span
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+RATE_LIMIT_STATUS = 429
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Check whether an exception is a provider rate-limit (HTTP 429) response.
+
+    Args:
+        error: Exception raised by the embedding model.
+
+    Returns:
+        True if the error carries a 429 status code.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status == RATE_LIMIT_STATUS
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the Retry-After header from a rate-limit error, if present.
+
+    Args:
+        error: Exception raised by the embedding model.
+
+    Returns:
+        Number of seconds to wait, or None if the header is missing.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBudget:
+    """
+    Sliding one-minute window limiting tokens sent to the embedding provider.
+
+    Attributes:
+        tokens_per_minute: Maximum tokens admitted in any 60 second window.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, tokens_per_minute: int):
+        """
+        Initialize token budget.
+
+        Args:
+            tokens_per_minute: Token limit per minute.
+
+        Raises:
+            ValueError: If tokens_per_minute is not positive.
+        """
+        if tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be positive")
+
+        self.tokens_per_minute = tokens_per_minute
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._used = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _expire(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= self.WINDOW_SECONDS:
+            _, tokens = self._window.popleft()
+            self._used -= tokens
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until ``tokens`` fit into the current window, then reserve them.
+
+        A request larger than the whole budget is admitted once the window is
+        empty so it cannot block forever.
+
+        Args:
+            tokens: Number of tokens about to be sent.
+        """
+        # Locks are bound to an event loop and each embed() call may run on a new one
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                if self._used + tokens <= self.tokens_per_minute or not self._window:
+                    self._window.append((now, tokens))
+                    self._used += tokens
+                    return
+                oldest = self._window[0][0]
+                await asyncio.sleep(self.WINDOW_SECONDS - (now - oldest))
+
+
+class AsyncBatchEmbedder:
+    """
+    Embeds texts in concurrent batches with rate-limit aware scheduling.
+
+    Texts are split into batches of ``batch_size`` and up to
+    ``max_concurrency`` batches are in flight at once. Models that set
+    ``plans_batches`` (see CpuHuggingFaceEmbedding) receive all texts in
+    one call and batch them by length themselves. Each batch reserves
+    its estimated tokens from an optional per-minute budget before it is
+    sent, and batches rejected with HTTP 429 are retried with exponential
+    backoff (honouring Retry-After when the provider sends it).
+
+    Attributes:
+        embedding: LlamaIndex embedding model instance.
+        batch_size: Number of texts per embedding request.
+        max_concurrency: Maximum number of requests in flight.
+        budget: Token budget, or None when unlimited.
+        max_retries: Maximum retries per batch on rate-limit errors.
+        last_stats: Throughput statistics of the most recent run.
+    """
+
+    def __init__(
+        self,
+        embedding: Any,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        model_name: Optional[str] = None
+    ):
+        """
+        Initialize batch embedder.
+
+        Args:
+            embedding: LlamaIndex embedding model instance.
+            batch_size: Number of texts per embedding request.
+            max_concurrency: Maximum number of requests in flight.
+            tokens_per_minute: Provider token limit per minute (None = unlimited).
+            max_retries: Maximum retries per batch on rate-limit errors.
+            base_delay: Initial backoff delay in seconds.
+            max_delay: Upper bound for a single backoff delay in seconds.
+            model_name: Model name used to pick a tokenizer for token estimates.
+
+        Raises:
+            ValueError: If batch_size or max_concurrency is not positive.
+        """
+        if batch_size <= 0 or max_concurrency <= 0:
+            raise ValueError("batch_size and max_concurrency must be positive")
+
+        self.embedding = embedding
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.budget = TokenBudget(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.last_stats: Dict[str, float] = {}
+
+        self._encoding = None
+        if HAS_TIKTOKEN:
+            try:
+                try:
+                    self._encoding = tiktoken.encoding_for_model(model_name or "")
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                # Encoding files are downloaded on first use; offline we estimate
+                self._encoding = None
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Estimate the number of tokens in a text.
+
+        Args:
+            text: Text to measure.
+
+        Returns:
+            Token count from tiktoken, or a 4-characters-per-token estimate.
+        """
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return max(1, len(text) // 4)
+
+    async def _embed_batch(
+        self,
+        batch: List[str],
+        semaphore: asyncio.Semaphore,
+        stats: Dict[str, float]
+    ) -> List[List[float]]:
+        tokens = sum(self.count_tokens(text) for text in batch)
+
+        for attempt in range(self.max_retries + 1):
+            if self.budget is not None:
+                await self.budget.acquire(tokens)
+
+            async with semaphore:
+                try:
+                    with span("embedding_request", items=len(batch), tokens=tokens, attempt=attempt):
+                        embeddings = await self.embedding._aget_text_embeddings(batch)
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt == self.max_retries:
+                        raise
+                    error = e
+                else:
+                    stats["tokens"] += tokens
+                    return embeddings
+
+            stats["retries"] += 1
+            delay = retry_after_seconds(error)
+            if delay is None:
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+            await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts concurrently, preserving input order.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            Embeddings aligned with ``texts``.
+        """
+        if getattr(self.embedding, "plans_batches", False):
+            # Local models that group texts by length need them all at once
+            batches = [texts]
+        else:
+            batches = [
+                texts[start:start + self.batch_size]
+                for start in range(0, len(texts), self.batch_size)
+            ]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        stats = {"tokens": 0, "retries": 0}
+
+        start_time = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._embed_batch(batch, semaphore, stats) for batch in batches)
+        )
+        elapsed = time.perf_counter() - start_time
+
+        self.last_stats = {
+            "texts": len(texts),
+            "batches": len(batches),
+            "tokens": stats["tokens"],
+            "retries": stats["retries"],
+            "seconds": elapsed,
+            "texts_per_second": len(texts) / elapsed if elapsed else 0.0,
+            "tokens_per_second": stats["tokens"] / elapsed if elapsed else 0.0,
+        }
+        return [embedding for batch in results for embedding in batch]
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Synchronous wrapper around aembed that prints achieved throughput.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            Embeddings aligned with ``texts``.
+        """
+        if not texts:
+            return []
+
+        embeddings = asyncio_run(self.aembed(texts))
+        stats = self.last_stats
+        print(
+            f"Embedded {stats['texts']} texts in {stats['batches']} batches "
+            f"({stats['seconds']:.2f}s, {stats['texts_per_second']:.1f} texts/s, "
+            f"{stats['tokens_per_second']:.0f} tokens/s, {stats['retries']} retries)"
+        )
+        return embeddings
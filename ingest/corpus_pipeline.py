@@ -0,0 +1,563 @@
+"""Streaming Corpus Ingestion Pipeline for SuperStream RAG System."""
+
+import json
+import os
+import queue
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from bs4 import BeautifulSoup
+
+from ingest.faiss_index import FaissIndexConfig, create_faiss_index, train_faiss_index
+from ingest.index_store import RECORDS_FILE, VECTOR_STORE_FILE, ColumnarRecordsWriter
+from ingest.profiling import span
+
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+CORPUS_SUFFIXES = (".html", ".htm", ".pdf", ".txt", ".md")
+
+CHECKPOINT_FILE = "checkpoint.json"
+CHECKPOINT_INDEX_FILE = "checkpoint.faiss"
+SPOOL_DIR = "spool"
+STATE_DIR = ".ingest_state"
+
+RECORD_COLUMNS = ("node_id", "doc_id", "text", "source", "file_name", "doc_type", "page")
+
+CHUNK_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "superstream-rag/corpus")
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+@dataclass
+class SourceText:
+    """
+    Parsed text of one source file, or of one page of a PDF.
+
+    Attributes:
+        key: Source path relative to the corpus root.
+        path: Source file path.
+        text: Extracted plain text.
+        page: Page number for PDFs, 0 otherwise.
+        last: Whether this is the final part of the source.
+    """
+
+    key: str
+    path: Path
+    text: str
+    page: int = 0
+    last: bool = True
+
+
+@dataclass
+class Chunk:
+    """
+    One chunk of source text, optionally with its embedding.
+
+    Attributes:
+        record: Column values stored in the records file.
+        source_key: Key of the source the chunk belongs to.
+        last: Whether this is the final chunk of the source.
+        embedding: Embedding, filled in by the embed stage.
+    """
+
+    record: Dict[str, str]
+    source_key: str
+    last: bool
+    embedding: Optional[List[float]] = field(default=None, repr=False)
+
+
+def discover_sources(source_dir: Path, suffixes: Tuple[str, ...] = CORPUS_SUFFIXES) -> Iterator[Path]:
+    """
+    Find corpus files in sorted order without listing everything up front.
+
+    Args:
+        source_dir: Corpus root directory.
+        suffixes: File suffixes to include.
+
+    Yields:
+        Source file paths, directories walked in sorted order.
+    """
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(suffixes):
+                yield Path(root) / name
+
+
+def html_to_text(html_path: Path) -> str:
+    """
+    Extract readable text from an HTML page.
+
+    Args:
+        html_path: HTML file path.
+
+    Returns:
+        Text with one line per block element, scripts and styles removed.
+    """
+    with open(html_path, "r", encoding="utf-8", errors="replace") as f:
+        soup = BeautifulSoup(f.read(), "html.parser")
+    for element in soup(["script", "style", "noscript", "nav", "header", "footer"]):
+        element.decompose()
+    lines = (line.strip() for line in soup.get_text("\n").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def parse_source(path: Path, source_dir: Path) -> Iterator[SourceText]:
+    """
+    Parse one source file into text.
+
+    PDFs are yielded page by page so a long document is never held in
+    memory whole; other formats are yielded as a single part.
+
+    Args:
+        path: Source file path.
+        source_dir: Corpus root, used for the source key.
+
+    Yields:
+        Parsed text parts, the final one marked ``last``.
+
+    Raises:
+        ImportError: If a PDF is found and pdfplumber is not installed.
+    """
+    key = path.relative_to(source_dir).as_posix()
+    suffix = path.suffix.lower()
+
+    if suffix == ".pdf":
+        if not HAS_PDFPLUMBER:
+            raise ImportError("pdfplumber is required for PDF extraction. Install with: pip install pdfplumber")
+        with pdfplumber.open(path) as pdf:
+            page_count = len(pdf.pages)
+            for number, page in enumerate(pdf.pages, 1):
+                text = page.extract_text() or ""
+                page.close()
+                yield SourceText(key, path, text, page=number, last=number == page_count)
+            if page_count == 0:
+                yield SourceText(key, path, "")
+        return
+
+    if suffix in (".html", ".htm"):
+        text = html_to_text(path)
+    else:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    yield SourceText(key, path, text)
+
+
+def chunk_id(source_key: str, page: int, number: int) -> str:
+    """
+    Return the stable node ID of a chunk.
+
+    Args:
+        source_key: Source key.
+        page: Page number (0 for single-part sources).
+        number: Chunk number within the page.
+
+    Returns:
+        UUID string.
+    """
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{source_key}#{page}:{number}"))
+
+
+def _run_stage(
+    name: str,
+    inputs: Optional["queue.Queue[Any]"],
+    outputs: "queue.Queue[Any]",
+    process: Callable[[Iterator[Any]], Iterable[Any]],
+    errors: List[BaseException],
+    stop: threading.Event
+) -> threading.Thread:
+    """Run ``process`` over a queue (or nothing) in a thread, feeding ``outputs``."""
+    def drain() -> Iterator[Any]:
+        while inputs is not None and not stop.is_set():
+            try:
+                item = inputs.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+    def put(item: Any) -> None:
+        # Give up on a full queue once another stage has failed
+        while not stop.is_set():
+            try:
+                outputs.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def run() -> None:
+        try:
+            with span(name):
+                for item in process(drain()):
+                    put(item)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put(_DONE)
+
+    thread = threading.Thread(target=run, name=f"ingest-{name}", daemon=True)
+    thread.start()
+    return thread
+
+
+class CorpusPipeline:
+    """
+    Streams a document corpus into a FAISS index with constant memory.
+
+    Stages run in their own threads connected by bounded queues::
+
+        discover -> parse -> chunk -> embed (batches) -> add to index
+
+    so at most ``queue_size`` items wait between any two stages no matter
+    how large the corpus is. Chunk records are appended to spool files
+    (ColumnarRecordsWriter) rather than kept in memory.
+
+    After every ``checkpoint_every`` completed sources the FAISS index,
+    spool sizes and completed source keys are written to a state directory.
+    A crashed or interrupted run resumes from the last checkpoint: spools
+    are truncated back to it and completed sources are skipped. The output
+    is the compact query format read by CompactIndex.
+
+    Attributes:
+        index_builder: Provides embed_texts (embedding cache + batching).
+        output_dir: Directory for the finished index.
+        state_dir: Directory for checkpoints and spools.
+        embedding_model: Embedding model name recorded in the metadata.
+        index_config: FAISS index configuration.
+        chunk_size: Chunk size in tokens.
+        chunk_overlap: Chunk overlap in tokens.
+        batch_size: Chunks per embedding call.
+        queue_size: Capacity of each inter-stage queue.
+        checkpoint_every: Completed sources between checkpoints.
+    """
+
+    def __init__(
+        self,
+        index_builder: Any,
+        output_dir: Path,
+        embedding_model: str,
+        index_config: Optional[FaissIndexConfig] = None,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        batch_size: int = 256,
+        queue_size: int = 64,
+        checkpoint_every: int = 50,
+        state_dir: Optional[Path] = None
+    ):
+        """
+        Initialize corpus pipeline.
+
+        Args:
+            index_builder: IndexBuilder used for embedding.
+            output_dir: Directory for the finished index.
+            embedding_model: Embedding model name recorded in the metadata.
+            index_config: FAISS index configuration. "auto" cannot see the
+                          corpus size up front and resolves to "hnsw".
+            chunk_size: Chunk size in tokens.
+            chunk_overlap: Chunk overlap in tokens.
+            batch_size: Chunks per embedding call.
+            queue_size: Capacity of each inter-stage queue.
+            checkpoint_every: Completed sources between checkpoints.
+            state_dir: Checkpoint directory. Defaults to output_dir/.ingest_state.
+        """
+        self.index_builder = index_builder
+        self.output_dir = Path(output_dir)
+        self.state_dir = Path(state_dir) if state_dir else self.output_dir / STATE_DIR
+        self.embedding_model = embedding_model
+        self.index_config = index_config or FaissIndexConfig()
+        if self.index_config.index_type == "auto":
+            self.index_config = replace(self.index_config, index_type="hnsw")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.checkpoint_every = checkpoint_every
+
+        self._faiss_index: Optional[faiss.Index] = None
+        self._train_rows = 0
+        self._pending: List[Tuple[np.ndarray, List[Dict[str, str]]]] = []
+        self._writer: Optional[ColumnarRecordsWriter] = None
+        self._completed: List[str] = []
+        self._since_checkpoint = 0
+
+    def _settings(self) -> Dict[str, Any]:
+        """Settings a resumed run must share with the checkpoint."""
+        return {
+            "embedding_model": self.embedding_model,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "index": vars(self.index_config),
+        }
+
+    # Stage functions
+
+    def _parse(self, paths: Iterator[Path], source_dir: Path) -> Iterator[SourceText]:
+        for path in paths:
+            key = path.relative_to(source_dir).as_posix()
+            try:
+                yield from parse_source(path, source_dir)
+            except Exception as e:
+                # Keep whatever parsed and close the source so the pipeline
+                # (and its checkpoints) move on
+                print(f"  [ERROR] {key}: {type(e).__name__}: {e}")
+                yield SourceText(key, path, "", last=True)
+
+    def _chunk(self, parts: Iterator[SourceText]) -> Iterator[Chunk]:
+        from llama_index.core.node_parser import SentenceSplitter
+
+        splitter = SentenceSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        for part in parts:
+            texts = splitter.split_text(part.text) if part.text.strip() else []
+            if not texts and part.last:
+                # Still report the source as finished
+                yield Chunk({}, part.key, last=True)
+                continue
+            for number, text in enumerate(texts):
+                yield Chunk(
+                    {
+                        "node_id": chunk_id(part.key, part.page, number),
+                        "doc_id": part.key,
+                        "text": text,
+                        "source": part.key.split("/", 1)[0],
+                        "file_name": part.path.name,
+                        "doc_type": part.path.suffix.lower().lstrip("."),
+                        "page": str(part.page) if part.page else "",
+                    },
+                    part.key,
+                    last=part.last and number == len(texts) - 1
+                )
+
+    def _embed(self, chunks: Iterator[Chunk]) -> Iterator[List[Chunk]]:
+        batch: List[Chunk] = []
+
+        def flush() -> List[Chunk]:
+            texts = [chunk.record["text"] for chunk in batch if chunk.record]
+            embeddings = iter(self.index_builder.embed_texts(texts) if texts else [])
+            for chunk in batch:
+                if chunk.record:
+                    chunk.embedding = next(embeddings)
+            return batch
+
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= self.batch_size:
+                yield flush()
+                batch = []
+        if batch:
+            yield flush()
+
+    # Index stage (runs in the calling thread)
+
+    def _add(self, vectors: np.ndarray, records: List[Dict[str, str]]) -> None:
+        if self._faiss_index is None and not self._pending:
+            index = create_faiss_index(
+                dimension=vectors.shape[1],
+                n_vectors=self.index_config.train_sample_size,
+                config=self.index_config
+            )
+            if index.is_trained:
+                self._faiss_index = index
+
+        if self._faiss_index is None:
+            # IVF/PQ: hold vectors back until there are enough to train on,
+            # then size the index by what was actually collected
+            self._pending.append((vectors, records))
+            self._train_rows += len(vectors)
+            if self._train_rows >= self.index_config.train_sample_size:
+                self._train()
+            return
+
+        start = self._writer.count
+        self._faiss_index.add_with_ids(
+            vectors,
+            np.arange(start, start + len(vectors), dtype=np.int64)
+        )
+        for record in records:
+            self._writer.append(record)
+
+    def _train(self) -> None:
+        pending, self._pending, self._train_rows = self._pending, [], 0
+        if not pending:
+            return
+        sample = np.concatenate([vectors for vectors, _ in pending])
+        self._faiss_index = create_faiss_index(
+            dimension=sample.shape[1],
+            n_vectors=len(sample),
+            config=self.index_config
+        )
+        train_faiss_index(self._faiss_index, sample, self.index_config)
+        del sample
+        for vectors, records in pending:
+            self._add(vectors, records)
+
+    def _index_batch(self, batch: List[Chunk]) -> None:
+        run: List[Chunk] = []
+        for chunk in batch:
+            if chunk.record:
+                run.append(chunk)
+            if chunk.last:
+                self._flush_run(run)
+                run = []
+                self._completed.append(chunk.source_key)
+                self._since_checkpoint += 1
+                if self._since_checkpoint >= self.checkpoint_every and not self._pending:
+                    self._checkpoint()
+        self._flush_run(run)
+
+    def _flush_run(self, run: List[Chunk]) -> None:
+        if run:
+            vectors = np.array([chunk.embedding for chunk in run], dtype="float32")
+            self._add(vectors, [chunk.record for chunk in run])
+
+    # Checkpoints
+
+    def _checkpoint(self) -> None:
+        """Persist index, spool sizes and completed sources atomically."""
+        with span("checkpoint", items=self._writer.count):
+            if self._faiss_index is not None:
+                tmp_index = self.state_dir / (CHECKPOINT_INDEX_FILE + ".tmp")
+                faiss.write_index(self._faiss_index, str(tmp_index))
+                os.replace(tmp_index, self.state_dir / CHECKPOINT_INDEX_FILE)
+
+            state = {
+                "settings": self._settings(),
+                "completed": self._completed,
+                "spool": self._writer.checkpoint(),
+                "has_index": self._faiss_index is not None,
+            }
+            path = self.state_dir / CHECKPOINT_FILE
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        self._since_checkpoint = 0
+
+    def _restore(self, restart: bool) -> None:
+        if restart and self.state_dir.exists():
+            shutil.rmtree(self.state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self._writer = ColumnarRecordsWriter(self.state_dir / SPOOL_DIR, RECORD_COLUMNS)
+
+        path = self.state_dir / CHECKPOINT_FILE
+        if not path.exists():
+            # Spools without a checkpoint come from a run that never got far
+            self._writer.truncate({"count": 0, "data_bytes": {name: 0 for name in RECORD_COLUMNS}})
+            return
+
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state["settings"] != json.loads(json.dumps(self._settings())):
+            raise ValueError(
+                f"Checkpoint in {self.state_dir} was made with different settings; "
+                "rerun with restart=True"
+            )
+
+        self._writer.truncate(state["spool"])
+        self._completed = list(state["completed"])
+        if state["has_index"]:
+            self._faiss_index = faiss.read_index(str(self.state_dir / CHECKPOINT_INDEX_FILE))
+        print(f"Resuming from checkpoint: {len(self._completed)} sources, "
+              f"{self._writer.count} chunks")
+
+    def run(self, source_dir: Path, restart: bool = False) -> Dict[str, Any]:
+        """
+        Ingest every source under ``source_dir``.
+
+        Args:
+            source_dir: Corpus root directory.
+            restart: Discard any checkpoint and start from scratch.
+
+        Returns:
+            Dictionary with output directory, chunk count, sources ingested
+            in this run and sources skipped from a checkpoint.
+
+        Raises:
+            ValueError: If the checkpoint settings differ, or no chunks were produced.
+        """
+        source_dir = Path(source_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._restore(restart)
+        completed = set(self._completed)
+        resumed = len(completed)
+
+        errors: List[BaseException] = []
+        stop = threading.Event()
+        paths, parts, chunks = (queue.Queue(maxsize=self.queue_size) for _ in range(3))
+        # Each embedded batch already holds batch_size chunks
+        embedded: "queue.Queue[Any]" = queue.Queue(maxsize=2)
+
+        def discover(_: Iterator[Any]) -> Iterator[Path]:
+            for path in discover_sources(source_dir):
+                if path.relative_to(source_dir).as_posix() not in completed:
+                    yield path
+
+        threads = [
+            _run_stage("discover", None, paths, discover, errors, stop),
+            _run_stage("parse", paths, parts,
+                       lambda items: self._parse(items, source_dir), errors, stop),
+            _run_stage("chunk", parts, chunks, self._chunk, errors, stop),
+            _run_stage("embed", chunks, embedded, self._embed, errors, stop),
+        ]
+
+        try:
+            with span("index_add") as add_span:
+                while True:
+                    try:
+                        batch = embedded.get(timeout=0.1)
+                    except queue.Empty:
+                        if stop.is_set():
+                            break
+                        continue
+                    if batch is _DONE:
+                        break
+                    self._index_batch(batch)
+                add_span.items = self._writer.count
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join(timeout=5)
+        if errors:
+            raise errors[0]
+
+        if self._pending:
+            self._train()
+        self._checkpoint()
+        if self._faiss_index is None or self._writer.count == 0:
+            raise ValueError(f"No text chunks produced from {source_dir}")
+
+        with span("persist", items=self._writer.count):
+            faiss.write_index(self._faiss_index, str(self.output_dir / VECTOR_STORE_FILE))
+            count = self._writer.count
+            self._writer.finish(
+                self.output_dir / RECORDS_FILE,
+                arrays={"faiss_ids": np.arange(count, dtype=np.int64)},
+                meta={
+                    "embedding_model": self.embedding_model,
+                    "dimension": self._faiss_index.d,
+                    "count": count,
+                    "chunk_size": self.chunk_size,
+                    "chunk_overlap": self.chunk_overlap,
+                }
+            )
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+        return {
+            "output_dir": self.output_dir,
+            "chunks": count,
+            "sources": len(self._completed) - resumed,
+            "resumed_sources": resumed,
+        }
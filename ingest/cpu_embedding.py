@@ -0,0 +1,233 @@
+"""CPU-Optimized Local HuggingFace Embedding for SuperStream RAG System."""
+
+import os
+from typing import Any, ClassVar, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from pydantic import Field, PrivateAttr
+from sentence_transformers import SentenceTransformer
+
+from ingest.embedding_backends import PRECISION_ENV_VAR
+
+PRECISIONS = ("fp32", "bf16", "int8")
+THREADS_ENV_VAR = "SUPERSTREAM_EMBED_THREADS"
+BATCH_TOKENS_ENV_VAR = "SUPERSTREAM_EMBED_BATCH_TOKENS"
+
+# Instruction prefixes the model families were trained with, matching
+# the ones llama-index applies for HuggingFaceEmbedding
+MODEL_INSTRUCTIONS = {
+    "e5": ("query: ", "passage: "),
+    "bge": ("Represent this question for searching relevant passages: ", ""),
+}
+
+
+def default_instructions(model_name: str) -> Tuple[str, str]:
+    """
+    Get the query and passage prefixes for a model.
+
+    Args:
+        model_name: HuggingFace model name.
+
+    Returns:
+        (query_instruction, text_instruction), empty strings if none apply.
+    """
+    name = model_name.lower().rsplit("/", 1)[-1]
+    for family, instructions in MODEL_INSTRUCTIONS.items():
+        if name.startswith(family) or f"-{family}" in name:
+            return instructions
+    return "", ""
+
+
+def plan_batches(
+    lengths: Sequence[int],
+    max_batch_tokens: int,
+    max_batch_size: int
+) -> List[List[int]]:
+    """
+    Group inputs into batches of similar length under a padded-token budget.
+
+    Inputs are sorted longest first and packed while the padded batch
+    (size times its longest input) stays within ``max_batch_tokens``, so
+    short glossary entries are batched with each other instead of being
+    padded to a long one. An input longer than the budget gets a batch
+    of its own.
+
+    Args:
+        lengths: Token count of every input.
+        max_batch_tokens: Maximum padded tokens per batch.
+        max_batch_size: Maximum inputs per batch.
+
+    Returns:
+        Batches of input positions; every position appears exactly once.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    for i in order:
+        # Sorted descending, so the first input of a batch is its longest
+        longest = lengths[batch[0]] if batch else lengths[i]
+        if batch and (len(batch) >= max_batch_size or (len(batch) + 1) * longest > max_batch_tokens):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _env(name: str, cast: Any, default: Any) -> Any:
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+
+class CpuHuggingFaceEmbedding(BaseEmbedding):
+    """
+    Local sentence-transformers embedding tuned for GPU-less build nodes.
+
+    Unlike HuggingFaceEmbedding, which pads each fixed-size batch to its
+    longest input in arbitrary order, texts are tokenized once, grouped by
+    length into batches sized by a padded-token budget (see plan_batches),
+    and the results are written back in input order. Inference runs under
+    torch.inference_mode with a fixed number of intra-op threads, and the
+    model can run in bf16 (autocast) or with int8 dynamic quantization of
+    its linear layers.
+
+    Because batching is planned over whatever texts are passed in, callers
+    should hand over as many texts per call as possible;
+    AsyncBatchEmbedder does so for models with ``plans_batches`` set.
+
+    Attributes:
+        max_batch_tokens: Maximum padded tokens per forward pass.
+        max_batch_size: Maximum texts per forward pass.
+        num_threads: Torch intra-op threads.
+        precision: "fp32", "bf16" or "int8".
+        max_length: Maximum tokens per text (longer texts are truncated).
+        query_instruction: Prefix added to queries.
+        text_instruction: Prefix added to documents.
+    """
+
+    plans_batches: ClassVar[bool] = True
+
+    max_batch_tokens: int = Field(default=16384, gt=0)
+    max_batch_size: int = Field(default=256, gt=0)
+    num_threads: int = Field(default=1, gt=0)
+    precision: str = Field(default="fp32")
+    max_length: int = Field(default=512, gt=0)
+    query_instruction: str = Field(default="")
+    text_instruction: str = Field(default="")
+
+    _model: Any = PrivateAttr()
+    _autocast: bool = PrivateAttr(default=False)
+
+    def __init__(
+        self,
+        model_name: str,
+        max_batch_tokens: Optional[int] = None,
+        max_batch_size: int = 256,
+        num_threads: Optional[int] = None,
+        precision: Optional[str] = None,
+        max_length: Optional[int] = None,
+        query_instruction: Optional[str] = None,
+        text_instruction: Optional[str] = None,
+        **kwargs: Any
+    ):
+        """
+        Load the model on CPU.
+
+        Settings left as None are read from the SUPERSTREAM_EMBED_THREADS,
+        SUPERSTREAM_EMBED_PRECISION and SUPERSTREAM_EMBED_BATCH_TOKENS
+        environment variables, falling back to all cores, fp32 and 16384.
+
+        Args:
+            model_name: HuggingFace model name.
+            max_batch_tokens: Maximum padded tokens per forward pass.
+            max_batch_size: Maximum texts per forward pass.
+            num_threads: Torch intra-op threads.
+            precision: "fp32", "bf16" or "int8".
+            max_length: Maximum tokens per text. Defaults to the model's
+                        maximum sequence length.
+            query_instruction: Prefix added to queries. Defaults to the
+                               model family's prefix (e.g. "query: " for E5).
+            text_instruction: Prefix added to documents.
+            **kwargs: Extra BaseEmbedding fields.
+
+        Raises:
+            ValueError: If the precision is unknown.
+        """
+        precision = precision or _env(PRECISION_ENV_VAR, str, "fp32")
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"Unknown precision: {precision}. Choose one of {', '.join(PRECISIONS)}"
+            )
+        num_threads = num_threads or _env(THREADS_ENV_VAR, int, os.cpu_count() or 1)
+        torch.set_num_threads(num_threads)
+
+        model = SentenceTransformer(model_name, device="cpu")
+        model.eval()
+        if precision == "int8":
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        default_query, default_text = default_instructions(model_name)
+        kwargs.setdefault("embed_batch_size", 2048)
+        super().__init__(
+            model_name=model_name,
+            max_batch_tokens=max_batch_tokens or _env(BATCH_TOKENS_ENV_VAR, int, 16384),
+            max_batch_size=max_batch_size,
+            num_threads=num_threads,
+            precision=precision,
+            max_length=max_length or model.max_seq_length or 512,
+            query_instruction=default_query if query_instruction is None else query_instruction,
+            text_instruction=default_text if text_instruction is None else text_instruction,
+            **kwargs
+        )
+        model.max_seq_length = self.max_length
+        self._model = model
+        self._autocast = precision == "bf16"
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CpuHuggingFaceEmbedding"
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        lengths = [
+            len(ids) for ids in self._model.tokenizer(
+                texts, truncation=True, max_length=self.max_length
+            )["input_ids"]
+        ]
+        output: Optional[np.ndarray] = None
+        with torch.inference_mode(), torch.autocast("cpu", dtype=torch.bfloat16, enabled=self._autocast):
+            for batch in plan_batches(lengths, self.max_batch_tokens, self.max_batch_size):
+                features = self._model.tokenize([texts[i] for i in batch])
+                embeddings = self._model(features)["sentence_embedding"]
+                embeddings = F.normalize(embeddings.float(), p=2, dim=1).numpy()
+                if output is None:
+                    output = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+                output[batch] = embeddings
+        return output.tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._encode([self.query_instruction + query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        return self._encode([self.query_instruction + query for query in queries])
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._encode([self.text_instruction + text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._encode([self.text_instruction + text for text in texts])
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        # The default embeds text by text; keep the whole list for batching
+        return self._get_text_embeddings(texts)
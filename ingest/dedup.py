@@ -0,0 +1,231 @@
+"""Exact and Near-Duplicate Detection for SuperStream Glossary Records."""
+
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from ingest.glossary_records import GlossaryRecords
+from ingest.lexical_index import tokenize
+
+# Separator of the merged terms stored in a collapsed record's "aliases"
+ALIAS_SEPARATOR = " | "
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Split text into overlapping word n-grams.
+
+    Args:
+        text: Input text.
+        size: Words per shingle.
+
+    Returns:
+        Set of shingles; a text shorter than ``size`` words is one shingle.
+    """
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)}
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """
+    MinHash signatures with banded locality-sensitive hashing.
+
+    Each shingle is hashed once and pushed through ``num_perm`` universal
+    hash functions; the signature keeps the minimum per function, so two
+    signatures agree on a fraction of positions close to the Jaccard
+    similarity of the shingle sets. Signatures are cut into ``bands``
+    bands; documents sharing any band are candidate pairs.
+
+    Attributes:
+        num_perm: Number of hash functions.
+        bands: Number of LSH bands (must divide num_perm).
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, seed: int = 1):
+        """
+        Initialize MinHasher.
+
+        Args:
+            num_perm: Number of hash functions.
+            bands: Number of LSH bands.
+            seed: Seed for the hash function parameters.
+
+        Raises:
+            ValueError: If bands does not divide num_perm.
+        """
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.num_perm = num_perm
+        self.bands = bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: Set[str]) -> np.ndarray:
+        """
+        Compute the MinHash signature of a shingle set.
+
+        Args:
+            shingle_set: Shingles of one document.
+
+        Returns:
+            uint64 array of length num_perm.
+        """
+        hashes = np.array([_hash64(shingle) & 0xFFFFFFFF for shingle in shingle_set], dtype=np.uint64)
+        # Wrapping uint64 arithmetic, as in the usual numpy MinHash formulation
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    def candidate_pairs(self, signatures: Sequence[np.ndarray]) -> Set[Tuple[int, int]]:
+        """
+        Find pairs of signatures sharing at least one LSH band.
+
+        Args:
+            signatures: Signatures from signature().
+
+        Returns:
+            Set of (i, j) position pairs with i < j.
+        """
+        rows = self.num_perm // self.bands
+        pairs: Set[Tuple[int, int]] = set()
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = defaultdict(list)
+            for position, signature in enumerate(signatures):
+                buckets[signature[band * rows:(band + 1) * rows].tobytes()].append(position)
+            for members in buckets.values():
+                for i, first in enumerate(members):
+                    for second in members[i + 1:]:
+                        pairs.add((first, second))
+        return pairs
+
+
+def _find(parents: List[int], i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def deduplicate_records(
+    records: GlossaryRecords,
+    threshold: float = 0.85,
+    num_perm: int = 128,
+    bands: int = 32
+) -> Tuple[GlossaryRecords, List[Dict[str, Any]]]:
+    """
+    Collapse exact and near-duplicate glossary records.
+
+    Records are first grouped by a hash of their normalized text
+    (lower-cased alphanumeric tokens of "term: definition"), which catches
+    the same entry copied across pages with different whitespace or
+    punctuation. One record per group then goes through MinHash LSH over
+    word 3-grams; candidate pairs whose exact Jaccard similarity reaches
+    ``threshold`` are merged as near-duplicates.
+
+    Each cluster becomes its representative, the last record in input
+    order (later files win, as in extract_multiple), annotated with
+    ``duplicate_count``, ``duplicate_files`` and, when the cluster spans
+    several terms, ``aliases``. Extra metadata is excluded from the
+    embedded text, so the representative embeds exactly as before.
+
+    Args:
+        records: Glossary records in input order.
+        threshold: Minimum Jaccard similarity for a near-duplicate.
+        num_perm: MinHash hash functions.
+        bands: LSH bands.
+
+    Returns:
+        (deduplicated records in input order of their representatives,
+        report with one entry per collapsed cluster).
+    """
+    if not len(records):
+        return records, []
+
+    texts = [" ".join(tokenize(records.text(row))) for row in range(len(records))]
+    parents = list(range(len(records)))
+
+    exact_groups: Dict[str, List[int]] = defaultdict(list)
+    for row, text in enumerate(texts):
+        exact_groups[hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()].append(row)
+    for members in exact_groups.values():
+        for row in members[1:]:
+            parents[row] = members[0]
+
+    heads = [members[0] for members in exact_groups.values()]
+    shingle_sets = [shingles(texts[row]) for row in heads]
+    hasher = MinHasher(num_perm=num_perm, bands=bands)
+    signatures = [hasher.signature(shingle_set) for shingle_set in shingle_sets]
+    for i, j in sorted(hasher.candidate_pairs(signatures)):
+        similarity = jaccard(shingle_sets[i], shingle_sets[j])
+        if similarity < threshold:
+            continue
+        root_i, root_j = _find(parents, heads[i]), _find(parents, heads[j])
+        if root_i != root_j:
+            parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for row in range(len(records)):
+        clusters[_find(parents, row)].append(row)
+
+    kept: List[int] = []
+    provenance: Dict[int, Dict[str, Any]] = {}
+    report: List[Dict[str, Any]] = []
+    for members in clusters.values():
+        representative = members[-1]
+        kept.append(representative)
+        if len(members) == 1:
+            continue
+
+        term = records.term[representative]
+        aliases = []
+        for row in members:
+            other = records.term[row]
+            if other and other != term and other not in aliases:
+                aliases.append(other)
+        files = sorted({records.file_name[row] for row in members} - {""})
+
+        extra: Dict[str, Any] = {
+            "duplicate_count": len(members),
+            "duplicate_files": "; ".join(files),
+        }
+        if aliases:
+            extra["aliases"] = ALIAS_SEPARATOR.join(aliases)
+        provenance[representative] = extra
+
+        collapsed = []
+        for row in members[:-1]:
+            exact = texts[row] == texts[representative]
+            collapsed.append({
+                "term": records.term[row],
+                "file_name": records.file_name[row],
+                "match": "exact" if exact else "near",
+                "similarity": 1.0 if exact else round(
+                    jaccard(shingles(texts[row]), shingles(texts[representative])), 4
+                ),
+            })
+        report.append({
+            "term": term,
+            "file_name": records.file_name[representative],
+            "collapsed": collapsed,
+        })
+
+    return records.select(sorted(kept), extra=provenance), report
@@ -0,0 +1,177 @@
+"""Embedding Backend Registry for SuperStream RAG System."""
+
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from config import EMBEDDING_MODEL_TYPE, OPENAI_API_KEY, OPENAI_API_BASE
+
+# Inference precision of local backends that support more than fp32
+PRECISION_ENV_VAR = "SUPERSTREAM_EMBED_PRECISION"
+DEFAULT_PRECISION = "fp32"
+PRECISION_BACKENDS = ("huggingface_cpu",)
+
+# Backend name -> factory(model_name, api_key, api_base, **model_kwargs)
+EmbeddingFactory = Callable[..., Any]
+EMBEDDING_BACKENDS: Dict[str, EmbeddingFactory] = {}
+
+
+def register_embedding_backend(name: str) -> Callable[[EmbeddingFactory], EmbeddingFactory]:
+    """
+    Register an embedding backend factory under a model type name.
+
+    Factories import their provider package inside the function body, so
+    only the backend that is actually used gets imported.
+
+    Args:
+        name: Model type name, as used in EMBEDDING_MODEL_TYPE.
+
+    Returns:
+        Decorator registering the factory.
+    """
+    def decorator(factory: EmbeddingFactory) -> EmbeddingFactory:
+        EMBEDDING_BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+@register_embedding_backend("openai")
+def _openai_backend(
+    model_name: str,
+    api_key: Optional[str] = None,
+    api_base: Optional[str] = None,
+    **model_kwargs: Any
+) -> Any:
+    from llama_index.embeddings.openai import OpenAIEmbedding
+
+    return OpenAIEmbedding(
+        model=model_name,
+        api_key=api_key or OPENAI_API_KEY,
+        api_base=api_base or OPENAI_API_BASE,
+        **model_kwargs
+    )
+
+
+@register_embedding_backend("huggingface")
+def _huggingface_backend(
+    model_name: str,
+    api_key: Optional[str] = None,
+    api_base: Optional[str] = None,
+    **model_kwargs: Any
+) -> Any:
+    # Pulls in torch, transformers and sentence-transformers
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+    # HuggingFace embedding models (like E5-Large-V2)
+    return HuggingFaceEmbedding(model_name=model_name)
+
+
+@register_embedding_backend("huggingface_cpu")
+def _huggingface_cpu_backend(
+    model_name: str,
+    api_key: Optional[str] = None,
+    api_base: Optional[str] = None,
+    **model_kwargs: Any
+) -> Any:
+    # Pulls in torch and sentence-transformers
+    from ingest.cpu_embedding import CpuHuggingFaceEmbedding
+
+    # Length-bucketed, token-budgeted batching for CPU-only hosts
+    return CpuHuggingFaceEmbedding(model_name=model_name, **model_kwargs)
+
+
+def create_embedding_model(
+    model_name: str,
+    model_type: str = EMBEDDING_MODEL_TYPE,
+    api_key: Optional[str] = None,
+    api_base: Optional[str] = None,
+    **model_kwargs: Any
+) -> Any:
+    """
+    Create embedding model based on type.
+
+    The backend package is imported on first use, so selecting "openai"
+    never imports torch.
+
+    Args:
+        model_name: Name of the embedding model.
+        model_type: Registered backend name, e.g. "openai", "huggingface"
+                    or "huggingface_cpu".
+        api_key: OpenAI API key (required for OpenAI models).
+        api_base: OpenAI API base URL (optional for OpenAI models).
+        **model_kwargs: Extra keyword arguments for the backend (e.g.
+                        max_retries for OpenAI, precision or num_threads
+                        for huggingface_cpu).
+
+    Returns:
+        Embedding model instance.
+
+    Raises:
+        ValueError: If no backend is registered for model_type.
+    """
+    factory = EMBEDDING_BACKENDS.get(model_type)
+    if factory is None:
+        raise ValueError(
+            f"Unsupported embedding model type: {model_type}. "
+            f"Choose one of {', '.join(sorted(EMBEDDING_BACKENDS))}"
+        )
+    return factory(model_name, api_key=api_key, api_base=api_base, **model_kwargs)
+
+
+def embedding_fingerprint(
+    model_name: str,
+    model_type: str = EMBEDDING_MODEL_TYPE,
+    precision: Optional[str] = None
+) -> str:
+    """
+    Identify the vectors a backend configuration produces.
+
+    Used as the embedding cache key, so vectors from another backend or
+    another precision of the same model are never served from the cache.
+
+    Args:
+        model_name: Name of the embedding model.
+        model_type: Registered backend name.
+        precision: Inference precision. Defaults to PRECISION_ENV_VAR (or
+                   fp32) for backends that honor it, fp32 for the rest.
+
+    Returns:
+        Fingerprint of the form "model_type:model_name:precision".
+    """
+    if precision is None:
+        precision = DEFAULT_PRECISION
+        if model_type in PRECISION_BACKENDS:
+            precision = os.environ.get(PRECISION_ENV_VAR) or DEFAULT_PRECISION
+    return f"{model_type}:{model_name}:{precision}"
+
+
+def embed_queries(embed_model: Any, queries: List[str]) -> List[List[float]]:
+    """
+    Embed several queries with as few model calls as the backend allows.
+
+    LlamaIndex only exposes batched embedding for documents, which may use
+    a different prompt or engine than queries, so this picks a batched path
+    that keeps query semantics per backend.
+
+    Args:
+        embed_model: LlamaIndex embedding model.
+        queries: Query texts.
+
+    Returns:
+        Query embeddings aligned with ``queries``.
+    """
+    if len(queries) == 1:
+        return [embed_model.get_query_embedding(queries[0])]
+
+    if hasattr(embed_model, "_get_query_embeddings"):
+        return embed_model._get_query_embeddings(queries)
+
+    # HuggingFaceEmbedding: one forward pass with the query prompt
+    if hasattr(embed_model, "_embed"):
+        return embed_model._embed(queries, prompt_name="query")
+
+    # OpenAIEmbedding: current models use the same engine for queries and texts
+    query_engine = getattr(embed_model, "_query_engine", None)
+    if query_engine is not None and query_engine == getattr(embed_model, "_text_engine", None):
+        return embed_model.get_text_embedding_batch(queries)
+
+    return [embed_model.get_query_embedding(query) for query in queries]
@@ -0,0 +1,225 @@
+"""Persistent Embedding Cache for SuperStream RAG System."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import DATA_DIR
+
+DEFAULT_CACHE_PATH = DATA_DIR / "cache" / "embedding_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def text_hash(text: str) -> str:
+    """
+    Compute the content hash used as embedding cache key.
+
+    Args:
+        text: Text that is sent to the embedding model.
+
+    Returns:
+        Hex-encoded SHA-256 digest of the UTF-8 text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of text embeddings backed by SQLite.
+
+    Entries are keyed by (model fingerprint, text hash), so the same text
+    embedded with a different model never collides. When the cache grows
+    beyond ``max_entries`` the least recently used entries are evicted.
+
+    The connection may be used from threads other than the one that
+    created the cache (e.g. the embed stage of CorpusPipeline); a lock
+    serializes access to it.
+
+    Attributes:
+        cache_path: Path to the SQLite database file.
+        max_entries: Maximum number of cached embeddings kept on disk.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that required calling the model.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            cache_path: SQLite file path. Defaults to DEFAULT_CACHE_PATH.
+            max_entries: Maximum number of entries before LRU eviction.
+
+        Raises:
+            ValueError: If max_entries is not positive.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.cache_path = Path(cache_path or DEFAULT_CACHE_PATH)
+        self.cache_path.parent.mkdir(exist_ok=True, parents=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access "
+            "ON embeddings (last_access)"
+        )
+        self._conn.commit()
+
+    def get_many(
+        self,
+        model_name: str,
+        texts: Sequence[str]
+    ) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for a batch of texts.
+
+        Args:
+            model_name: Fingerprint of the model the vectors were produced with
+                        (see embedding_fingerprint).
+            texts: Texts to look up.
+
+        Returns:
+            List aligned with ``texts`` holding the cached embedding or None.
+        """
+        hashes = [text_hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+
+        # SQLite limits the number of bound parameters per statement
+        unique_hashes = list(dict.fromkeys(hashes))
+        with self._lock:
+            for start in range(0, len(unique_hashes), 500):
+                chunk = unique_hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model_name, *chunk]
+                ).fetchall()
+                for row_hash, blob in rows:
+                    found[row_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? "
+                    "WHERE model = ? AND text_hash = ?",
+                    [(now, model_name, h) for h in found]
+                )
+                self._conn.commit()
+
+            results = [found.get(h) for h in hashes]
+            hit_count = sum(1 for r in results if r is not None)
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+        return results
+
+    def put_many(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]]
+    ) -> None:
+        """
+        Store embeddings for a batch of texts and evict if over capacity.
+
+        Args:
+            model_name: Fingerprint of the model the vectors were produced with
+                        (see embedding_fingerprint).
+            texts: Texts that were embedded.
+            embeddings: Embeddings aligned with ``texts``.
+
+        Raises:
+            ValueError: If texts and embeddings differ in length.
+        """
+        if len(texts) != len(embeddings):
+            raise ValueError("texts and embeddings must have the same length")
+
+        now = time.time()
+        rows = []
+        for text, embedding in zip(texts, embeddings):
+            vector = np.asarray(embedding, dtype=np.float32)
+            rows.append(
+                (model_name, text_hash(text), vector.shape[0], vector.tobytes(), now)
+            )
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model, text_hash, dimension, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries beyond max_entries (lock held)."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN ("
+            "SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,)
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return count
+
+    def clear(self) -> None:
+        """Remove all cached embeddings and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return cache hit/miss statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and current entry count.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,294 @@
+"""FAISS Index Factory for SuperStream RAG System."""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("auto", "flat", "hnsw", "ivf_flat", "ivf_pq")
+
+# How vectors are stored inside the index: raw float32 ("none"), scalar
+# quantized to float16 or int8 per dimension, or product quantized
+QUANTIZATION_TYPES = ("none", "fp16", "int8", "pq")
+
+# Corpus sizes at which "auto" switches to the next index family
+AUTO_HNSW_THRESHOLD = 10_000
+AUTO_IVF_PQ_THRESHOLD = 1_000_000
+
+# FAISS k-means wants roughly this many training points per centroid
+MIN_POINTS_PER_CENTROID = 39
+
+
+@dataclass
+class FaissIndexConfig:
+    """
+    Index family and parameters for building a FAISS index.
+
+    Attributes:
+        index_type: One of INDEX_TYPES. "auto" picks by vector count.
+        hnsw_m: Number of neighbours per HNSW graph node.
+        ef_construction: HNSW candidate list size while building.
+        ef_search: HNSW candidate list size while searching.
+        nlist: Number of IVF cells. None derives 4 * sqrt(n).
+        nprobe: Number of IVF cells visited per query.
+        pq_m: Number of PQ sub-quantizers (bytes per code at 8 bits).
+              None picks dimension / 16 or the nearest divisor below it.
+        pq_nbits: Bits per PQ sub-quantizer code.
+        train_sample_size: Maximum number of vectors used to train IVF/PQ.
+        quantization: One of QUANTIZATION_TYPES. Applies to flat, HNSW and
+                      IVF-Flat storage; IVF-PQ is already product quantized.
+    """
+
+    index_type: str = "auto"
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+    nlist: Optional[int] = None
+    nprobe: int = 16
+    pq_m: Optional[int] = None
+    pq_nbits: int = 8
+    train_sample_size: int = 100_000
+    quantization: str = "none"
+
+    def __post_init__(self):
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported index type: {self.index_type}. "
+                f"Choose one of {', '.join(INDEX_TYPES)}"
+            )
+        if self.quantization not in QUANTIZATION_TYPES:
+            raise ValueError(
+                f"Unsupported quantization: {self.quantization}. "
+                f"Choose one of {', '.join(QUANTIZATION_TYPES)}"
+            )
+        if self.index_type == "ivf_pq" and self.quantization in ("fp16", "int8"):
+            raise ValueError("ivf_pq already uses product quantization")
+
+
+def choose_index_type(n_vectors: int) -> str:
+    """
+    Pick an index family for a corpus size.
+
+    Exact search is fastest below a few thousand vectors; HNSW keeps query
+    latency flat up to around a million vectors; beyond that IVF-PQ keeps
+    memory bounded.
+
+    Args:
+        n_vectors: Number of vectors to index.
+
+    Returns:
+        Concrete index type name.
+    """
+    if n_vectors < AUTO_HNSW_THRESHOLD:
+        return "flat"
+    if n_vectors < AUTO_IVF_PQ_THRESHOLD:
+        return "hnsw"
+    return "ivf_pq"
+
+
+def resolve_nlist(n_vectors: int, nlist: Optional[int] = None) -> int:
+    """
+    Choose the number of IVF cells, bounded by the available training data.
+
+    Args:
+        n_vectors: Number of vectors that will be used for training.
+        nlist: Requested number of cells, or None for 4 * sqrt(n).
+
+    Returns:
+        Number of IVF cells (at least 1).
+    """
+    if nlist is None:
+        nlist = int(4 * math.sqrt(max(n_vectors, 1)))
+    return max(1, min(nlist, n_vectors // MIN_POINTS_PER_CENTROID))
+
+
+def resolve_pq_m(dimension: int, pq_m: Optional[int] = None) -> int:
+    """
+    Choose a PQ sub-quantizer count that divides the dimension.
+
+    Args:
+        dimension: Vector dimension.
+        pq_m: Requested number of sub-quantizers, or None for dimension / 16.
+
+    Returns:
+        Largest divisor of ``dimension`` not exceeding the requested count.
+    """
+    target = pq_m or max(1, dimension // 16)
+    for m in range(min(target, dimension), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+def resolve_pq_nbits(n_train: int, pq_nbits: int = 8) -> int:
+    """
+    Bound the PQ code width so k-means has a training point per centroid.
+
+    Args:
+        n_train: Number of training vectors.
+        pq_nbits: Requested bits per sub-quantizer code.
+
+    Returns:
+        Bits per code (at least 1).
+    """
+    return max(1, min(pq_nbits, int(math.log2(max(n_train, 2)))))
+
+
+def scalar_quantizer_type(quantization: str) -> int:
+    """
+    Map a quantization name to a FAISS scalar quantizer type.
+
+    Args:
+        quantization: "fp16" or "int8".
+
+    Returns:
+        faiss.ScalarQuantizer quantizer type constant.
+    """
+    if quantization == "fp16":
+        return faiss.ScalarQuantizer.QT_fp16
+    return faiss.ScalarQuantizer.QT_8bit
+
+
+def create_faiss_index(
+    dimension: int,
+    n_vectors: int,
+    config: Optional[FaissIndexConfig] = None
+) -> faiss.Index:
+    """
+    Create an empty FAISS index wrapped in an IndexIDMap2.
+
+    The ID map gives every vector a stable ID so documents can be updated
+    or deleted later (where the underlying index supports removal).
+
+    Args:
+        dimension: Vector dimension, probed from the embedding model.
+        n_vectors: Expected number of vectors, used by "auto" and IVF sizing.
+        config: Index configuration. Defaults to FaissIndexConfig().
+
+    Returns:
+        Untrained FAISS index; call train_faiss_index before adding vectors.
+    """
+    config = config or FaissIndexConfig()
+    index_type = config.index_type
+    if index_type == "auto":
+        index_type = choose_index_type(n_vectors)
+
+    quantization = config.quantization
+    if index_type == "ivf_pq":
+        quantization = "pq"
+
+    # k-means needs at least one training point per PQ centroid
+    train_size = min(n_vectors, config.train_sample_size)
+    pq_m = resolve_pq_m(dimension, config.pq_m)
+    pq_nbits = resolve_pq_nbits(train_size, config.pq_nbits)
+
+    if index_type == "flat":
+        if quantization == "none":
+            base = faiss.IndexFlatL2(dimension)
+        elif quantization == "pq":
+            base = faiss.IndexPQ(dimension, pq_m, pq_nbits)
+        else:
+            base = faiss.IndexScalarQuantizer(dimension, scalar_quantizer_type(quantization))
+    elif index_type == "hnsw":
+        if quantization == "none":
+            base = faiss.IndexHNSWFlat(dimension, config.hnsw_m)
+        elif quantization == "pq":
+            base = faiss.IndexHNSWPQ(dimension, pq_m, config.hnsw_m, pq_nbits)
+        else:
+            base = faiss.IndexHNSWSQ(
+                dimension,
+                scalar_quantizer_type(quantization),
+                config.hnsw_m
+            )
+        base.hnsw.efConstruction = config.ef_construction
+        base.hnsw.efSearch = config.ef_search
+    else:
+        nlist = resolve_nlist(train_size, config.nlist)
+        quantizer = faiss.IndexFlatL2(dimension)
+        if quantization == "none":
+            base = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+        elif quantization == "pq":
+            base = faiss.IndexIVFPQ(quantizer, dimension, nlist, pq_m, pq_nbits)
+        else:
+            base = faiss.IndexIVFScalarQuantizer(
+                quantizer,
+                dimension,
+                nlist,
+                scalar_quantizer_type(quantization)
+            )
+        base.nprobe = min(config.nprobe, nlist)
+
+    print(
+        f"FAISS index type: {index_type} (dimension {dimension}, "
+        f"quantization {quantization})"
+    )
+    return faiss.IndexIDMap2(base)
+
+
+def train_faiss_index(
+    index: faiss.Index,
+    vectors: np.ndarray,
+    config: Optional[FaissIndexConfig] = None,
+    seed: int = 1234
+) -> None:
+    """
+    Train an index on a random sample of vectors if it requires training.
+
+    Args:
+        index: Index returned by create_faiss_index.
+        vectors: Float32 matrix of all vectors to be indexed.
+        config: Index configuration providing train_sample_size.
+        seed: Random seed for sampling.
+    """
+    if index.is_trained:
+        return
+
+    config = config or FaissIndexConfig()
+    sample = vectors
+    if len(vectors) > config.train_sample_size:
+        rng = np.random.default_rng(seed)
+        rows = rng.choice(len(vectors), config.train_sample_size, replace=False)
+        sample = vectors[rows]
+
+    print(f"Training FAISS index on {len(sample)} vectors...")
+    index.train(np.ascontiguousarray(sample, dtype="float32"))
+
+
+def set_search_params(
+    index: faiss.Index,
+    ef_search: Optional[int] = None,
+    nprobe: Optional[int] = None
+) -> None:
+    """
+    Adjust query-time parameters of a (possibly wrapped) FAISS index.
+
+    Parameters that do not apply to the index family are ignored.
+
+    Args:
+        index: FAISS index, including IndexIDMap2 wrappers.
+        ef_search: HNSW efSearch.
+        nprobe: IVF nprobe.
+    """
+    params = faiss.ParameterSpace()
+    base = faiss.downcast_index(index.index) if hasattr(index, "id_map") else index
+
+    if ef_search is not None and hasattr(base, "hnsw"):
+        params.set_index_parameter(index, "efSearch", ef_search)
+    if nprobe is not None and hasattr(base, "nprobe"):
+        params.set_index_parameter(index, "nprobe", nprobe)
+
+
+def supports_removal(index: faiss.Index) -> bool:
+    """
+    Check whether vectors can be removed from an index.
+
+    Args:
+        index: FAISS index, including IndexIDMap2 wrappers.
+
+    Returns:
+        False for graph-based indexes (HNSW) that cannot delete vectors.
+    """
+    base = faiss.downcast_index(index.index) if hasattr(index, "id_map") else index
+    return not hasattr(base, "hnsw")
@@ -0,0 +1,39 @@
+"""Deterministic Offline Embedding for SuperStream RAG System."""
+
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def hash_embedding(text: str, dimension: int = 1536) -> List[float]:
+    """
+    Compute a deterministic bag-of-words embedding by feature hashing.
+
+    Each lower-cased word is hashed to a signed bucket, so texts sharing
+    words have a positive cosine similarity. The result is L2-normalized.
+    No model or network access is needed, which makes it suitable for
+    offline tests and benchmarks.
+
+    Args:
+        text: Text to embed.
+        dimension: Embedding dimension.
+
+    Returns:
+        Unit-length embedding as a list of floats.
+    """
+    vector = np.zeros(dimension, dtype=np.float32)
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        sign = 1.0 if value & 1 else -1.0
+        vector[(value >> 1) % dimension] += sign
+
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        vector[0] = 1.0
+        norm = 1.0
+    return (vector / norm).tolist()
@@ -1,21 +1,239 @@
 """Glossary Extractor for SuperStream Glossary HTML files."""
 
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
-from llama_index.core.schema import Document
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+try:
+    import pytesseract
+    HAS_OCR = True
+except ImportError:
+    HAS_OCR = False
 
 from config import GLOSSARY_OUTPUT_DIR
+from ingest.dedup import deduplicate_records
+from ingest.glossary_records import GlossaryRecords
+
+# Bump when extraction logic changes so incremental runs re-extract everything
+EXTRACTOR_VERSION = "1"
+
+# Header cells repeated at the top of glossary tables on each PDF page
+PDF_HEADER_TERMS = {"term", "terms", "glossary term"}
+
+# Page status reported by iter_pdf_pages
+PAGE_TABLES = "tables"
+PAGE_OCR = "ocr"
+PAGE_IMAGE_ONLY = "image_only"
+PAGE_NO_TABLES = "no_tables"
+
+
+def _iter_rows_lxml(html_path: Path) -> Iterator[Tuple[str, str]]:
+    """Stream table rows with lxml iterparse, discarding parsed elements."""
+    table_rows = []
+    found_table = False
+    for event, elem in etree.iterparse(
+        str(html_path),
+        events=("start", "end"),
+        html=True,
+        encoding="utf-8"
+    ):
+        if event == "start":
+            if elem.tag == "table":
+                table_rows.append(0)
+                found_table = True
+            continue
+
+        if elem.tag == "tr" and table_rows:
+            table_rows[-1] += 1
+            # Skip header row (first row of each table)
+            if table_rows[-1] > 1:
+                cells = [cell for cell in elem.iter("td", "th")]
+                if len(cells) >= 2:
+                    # Match BeautifulSoup get_text(strip=True): strip and join
+                    term, definition = (
+                        "".join(
+                            text.strip() for text in cell.xpath(".//text()")
+                        )
+                        for cell in cells[:2]
+                    )
+                    yield term, definition
+        elif elem.tag == "table" and table_rows:
+            table_rows.pop()
+
+        # Keep only the open ancestors of the current element in memory
+        if not table_rows or elem.tag in ("tr", "table"):
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    if not found_table:
+        raise ValueError("No tables found in HTML file")
+
+
+def _iter_rows_strainer(html_content: str) -> Iterator[Tuple[str, str]]:
+    """Parse only table subtrees with BeautifulSoup and yield rows."""
+    soup = BeautifulSoup(html_content, 'html.parser', parse_only=SoupStrainer('table'))
+    tables = soup.find_all('table')
+    if not tables:
+        raise ValueError("No tables found in HTML file")
+    for table in tables:
+        for row in table.find_all('tr')[1:]:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                yield cells[0].get_text(strip=True), cells[1].get_text(strip=True)
+
+
+# (page number, [(term, definition)], status or error message)
+PdfPageOutcome = Tuple[int, List[Tuple[str, str]], str]
+
+
+def _clean_cell(cell: Optional[str]) -> str:
+    """Collapse the line breaks pdfplumber keeps inside table cells."""
+    return " ".join((cell or "").split())
+
+
+def _ocr_rows(page: Any) -> List[Tuple[str, str]]:
+    """OCR an image-only page, splitting lines into term and definition columns."""
+    image = page.to_image(resolution=300).original
+    rows = []
+    for line in pytesseract.image_to_string(image).splitlines():
+        # Columns come out separated by runs of spaces
+        parts = [part.strip() for part in line.split("   ") if part.strip()]
+        if len(parts) >= 2:
+            rows.append((parts[0], " ".join(parts[1:])))
+    return rows
+
+
+def _pdf_page_rows(page: Any, ocr: bool) -> Tuple[List[Tuple[str, str]], str]:
+    """Extract the two-column table rows of one pdfplumber page."""
+    rows = []
+    for table in page.extract_tables():
+        for cells in table:
+            if len(cells) < 2:
+                continue
+            term, definition = _clean_cell(cells[0]), _clean_cell(cells[1])
+            if term.lower() in PDF_HEADER_TERMS:
+                continue
+            if term or definition:
+                rows.append((term, definition))
+    if rows:
+        return rows, PAGE_TABLES
+
+    # Images but no characters means a scanned page; blank pages have neither
+    if page.chars or not page.images:
+        return [], PAGE_NO_TABLES
+    if ocr and HAS_OCR:
+        return _ocr_rows(page), PAGE_OCR
+    return [], PAGE_IMAGE_ONLY
+
+
+def _pdf_pages_worker(task: Tuple[Path, int, int, bool]) -> List[PdfPageOutcome]:
+    """Extract a range of PDF pages in a worker process."""
+    pdf_path, start, stop, ocr = task
+    outcomes = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_number in range(start, stop):
+            page = pdf.pages[page_number]
+            try:
+                rows, status = _pdf_page_rows(page, ocr)
+            except Exception as e:
+                rows, status = [], f"{type(e).__name__}: {e}"
+            finally:
+                # Drop the page's parsed objects before moving on
+                page.close()
+            outcomes.append((page_number + 1, rows, status))
+    return outcomes
+
+
+def merge_pdf_rows(pages: Iterable[PdfPageOutcome]) -> Iterator[Tuple[str, str]]:
+    """
+    Join page outcomes into term-definition pairs.
+
+    A row with an empty term cell continues the previous definition, which
+    is how rows split across a page break come out of pdfplumber.
+
+    Args:
+        pages: Page outcomes in page order.
+
+    Yields:
+        (term, definition) tuples in document order.
+    """
+    term, definition = "", ""
+    for _, rows, _ in pages:
+        for row_term, row_definition in rows:
+            if not row_term:
+                definition = f"{definition} {row_definition}".strip()
+                continue
+            if term and definition:
+                yield term, definition
+            term, definition = row_term, row_definition
+    if term and definition:
+        yield term, definition
+
+
+# (input index, path, extraction result or None, error message or None)
+ExtractionOutcome = Tuple[int, Path, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _extract_worker(
+    task: Tuple[int, Path, str, bool, Path]
+) -> ExtractionOutcome:
+    """Extract one file in a worker process, capturing any failure."""
+    index, html_path, source_name, fast, output_dir = task
+    try:
+        extractor = GlossaryExtractor(output_dir=output_dir)
+        result = extractor.extract_from_html(html_path, source_name, fast=fast)
+        return index, html_path, result, None
+    except Exception as e:
+        return index, html_path, None, f"{type(e).__name__}: {e}"
+
+
+def in_input_order(outcomes: Iterable[ExtractionOutcome]) -> Iterator[ExtractionOutcome]:
+    """
+    Re-order extraction outcomes that arrive in completion order.
+
+    Outcomes are buffered until every earlier input index has been seen, so
+    results are merged in the same order regardless of worker scheduling.
+
+    Args:
+        outcomes: Outcomes in any order, with indices 0..n-1.
+
+    Yields:
+        Outcomes ordered by input index.
+    """
+    pending: Dict[int, ExtractionOutcome] = {}
+    next_index = 0
+    for outcome in outcomes:
+        pending[outcome[0]] = outcome
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
 
 
 class GlossaryExtractor:
     """
     Extracts glossary terms and definitions from HTML files.
 
-    Uses BeautifulSoup to extract table-structured data and converts
-    term-definition pairs into LlamaIndex Document objects and JSON format.
+    Uses BeautifulSoup to extract table-structured data and collects
+    term-definition pairs into a compact GlossaryRecords store (from which
+    LlamaIndex Documents are materialized on demand) and JSON format.
 
     Attributes:
         output_dir: Directory to save extracted glossary JSON files.
@@ -32,32 +250,97 @@ class GlossaryExtractor:
         self.output_dir = output_dir or GLOSSARY_OUTPUT_DIR
         self.output_dir.mkdir(exist_ok=True, parents=True)
 
+    def iter_terms(
+        self,
+        html_path: Path,
+        parser: Optional[str] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Stream term-definition pairs from the tables of an HTML file.
+
+        Only table subtrees are parsed. With lxml installed the file is
+        parsed incrementally and finished rows are discarded, so memory
+        stays flat regardless of page size; otherwise BeautifulSoup is
+        restricted to tables with a SoupStrainer. Rows are handled exactly
+        like extract_from_html: the first row of each table is skipped and
+        rows with fewer than two cells or empty cells are ignored.
+
+        Args:
+            html_path: Path to HTML file.
+            parser: "lxml" or "strainer". Defaults to lxml when installed.
+
+        Yields:
+            (term, definition) tuples in document order.
+
+        Raises:
+            FileNotFoundError: If HTML file does not exist.
+            ValueError: If the requested parser is unknown or unavailable,
+                        or the file has no tables.
+        """
+        html_path = Path(html_path)
+        if not html_path.is_file():
+            raise FileNotFoundError(f"HTML file does not exist: {html_path}")
+
+        parser = parser or ("lxml" if HAS_LXML else "strainer")
+        if parser == "lxml" and not HAS_LXML:
+            raise ValueError("lxml is required for the lxml parser. Install with: pip install lxml")
+        if parser not in ("lxml", "strainer"):
+            raise ValueError(f"Unsupported parser: {parser}")
+
+        if parser == "lxml":
+            rows = _iter_rows_lxml(html_path)
+        else:
+            rows = _iter_rows_strainer(html_path.read_text(encoding='utf-8'))
+
+        for term, definition in rows:
+            term = term.strip()
+            definition = definition.strip()
+            if term and definition:
+                yield term, definition
+
     def extract_from_html(
         self,
         html_path: Path,
         source_name: str = "SuperStream Glossary",
-        last_updated: Optional[str] = None
+        last_updated: Optional[str] = None,
+        fast: bool = False
     ) -> Dict[str, any]:
         """
         Extract glossary terms from an HTML file.
 
-        Searches for tables in the HTML and extracts term-definition pairs.
-        Each pair is converted into a Document with metadata.
+        Searches for tables in the HTML and extracts term-definition pairs
+        into a GlossaryRecords store.
 
         Args:
             html_path: Path to HTML file.
             source_name: Name of the glossary source.
             last_updated: Last update date (YYYY-MM-DD format).
+            fast: Use the table-only streaming parser (iter_terms) instead
+                  of building the full BeautifulSoup tree.
 
         Returns:
-            Dictionary containing extracted terms and Document objects.
+            Dictionary containing the extracted records and the number of
+            distinct terms.
 
         Raises:
             FileNotFoundError: If HTML file does not exist.
             ValueError: If no tables found in HTML.
         """
-        terms_dict = {}
-        documents = []
+        records = GlossaryRecords()
+        file_name = Path(html_path).name
+
+        if fast:
+            try:
+                for term, definition in self.iter_terms(html_path):
+                    records.append(term, definition, source_name, last_updated, file_name)
+            except Exception as e:
+                print(f"Error extracting glossary from {html_path}: {e}")
+                raise
+
+            return {
+                "records": records,
+                "count": len(set(records.term))
+            }
 
         try:
             # Try to open the file with different approaches
@@ -112,33 +395,161 @@ class GlossaryExtractor:
                     if not term or not definition:
                         continue
 
-                    # Store in dictionary
-                    terms_dict[term] = definition
-
-                    # Create Document object
-                    doc = Document(
-                        text=f"{term}: {definition}",
-                        metadata={
-                            "term": term,
-                            "definition": definition,
-                            "source": source_name,
-                            "doc_type": "glossary",
-                            "last_updated": last_updated or "2025-08-12",
-                            "file_name": html_path.name
-                        }
-                    )
-                    documents.append(doc)
+                    records.append(term, definition, source_name, last_updated, file_name)
 
             return {
-                "terms": terms_dict,
-                "documents": documents,
-                "count": len(terms_dict)
+                "records": records,
+                "count": len(set(records.term))
             }
 
         except Exception as e:
             print(f"Error extracting glossary from {html_path}: {e}")
             raise
 
+    def iter_pdf_pages(
+        self,
+        pdf_path: Path,
+        workers: int = 1,
+        pages_per_task: int = 8,
+        ocr: bool = False
+    ) -> Iterator[PdfPageOutcome]:
+        """
+        Stream table rows from a PDF page by page.
+
+        Pages are split into ranges of ``pages_per_task`` and, with more
+        than one worker, extracted by a process pool; each worker opens the
+        PDF itself and releases every page after reading it. At most two
+        ranges per worker are in flight, so memory stays bounded regardless
+        of document length, and outcomes are yielded in page order.
+
+        Pages with images but no characters are scans: they are OCR'd
+        when ``ocr`` is set and pytesseract is installed, and otherwise
+        reported as image-only with no rows instead of failing.
+
+        Args:
+            pdf_path: Path to PDF file.
+            workers: Number of worker processes (1 = run in this process).
+            pages_per_task: Pages extracted per worker task.
+            ocr: OCR image-only pages.
+
+        Yields:
+            (page number, rows, status) tuples, where status is one of
+            "tables", "ocr", "image_only", "no_tables" or an error message.
+
+        Raises:
+            FileNotFoundError: If PDF file does not exist.
+            ImportError: If pdfplumber is not installed.
+        """
+        pdf_path = Path(pdf_path)
+        if not pdf_path.is_file():
+            raise FileNotFoundError(f"PDF file does not exist: {pdf_path}")
+        if not HAS_PDFPLUMBER:
+            raise ImportError("pdfplumber is required for PDF extraction. Install with: pip install pdfplumber")
+
+        with pdfplumber.open(pdf_path) as pdf:
+            page_count = len(pdf.pages)
+        tasks = [
+            (pdf_path, start, min(start + pages_per_task, page_count), ocr)
+            for start in range(0, page_count, pages_per_task)
+        ]
+
+        if workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield from _pdf_pages_worker(task)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            remaining = iter(tasks)
+            pending = deque(
+                executor.submit(_pdf_pages_worker, task)
+                for task in islice(remaining, 2 * workers)
+            )
+            while pending:
+                outcomes = pending.popleft().result()
+                for task in islice(remaining, 1):
+                    pending.append(executor.submit(_pdf_pages_worker, task))
+                yield from outcomes
+
+    def iter_pdf_terms(
+        self,
+        pdf_path: Path,
+        workers: int = 1,
+        pages_per_task: int = 8,
+        ocr: bool = False
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Stream term-definition pairs from the tables of a PDF.
+
+        Rows split across page breaks are joined (see merge_pdf_rows).
+
+        Args:
+            pdf_path: Path to PDF file.
+            workers: Number of worker processes.
+            pages_per_task: Pages extracted per worker task.
+            ocr: OCR image-only pages.
+
+        Yields:
+            (term, definition) tuples in document order.
+        """
+        pages = self.iter_pdf_pages(pdf_path, workers, pages_per_task, ocr)
+        yield from merge_pdf_rows(pages)
+
+    def extract_from_file(
+        self,
+        pdf_path: Path,
+        source_name: str = "SuperStream Glossary",
+        last_updated: Optional[str] = None,
+        workers: int = 1,
+        pages_per_task: int = 8,
+        ocr: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Extract glossary terms from the tables of a PDF file.
+
+        Args:
+            pdf_path: Path to PDF file.
+            source_name: Name of the glossary source.
+            last_updated: Last update date (YYYY-MM-DD format).
+            workers: Number of worker processes for page-parallel extraction.
+            pages_per_task: Pages extracted per worker task.
+            ocr: OCR image-only pages (requires pytesseract).
+
+        Returns:
+            Dictionary containing the extracted records, the number of
+            distinct terms, the page count and the pages that yielded
+            nothing, by status.
+
+        Raises:
+            FileNotFoundError: If PDF file does not exist.
+            ImportError: If pdfplumber is not installed.
+        """
+        pdf_path = Path(pdf_path)
+        records = GlossaryRecords()
+        pages = 0
+        skipped_pages: Dict[str, List[int]] = {}
+
+        def counted_pages() -> Iterator[PdfPageOutcome]:
+            nonlocal pages
+            for outcome in self.iter_pdf_pages(pdf_path, workers, pages_per_task, ocr):
+                page_number, page_rows, status = outcome
+                pages += 1
+                if not page_rows:
+                    skipped_pages.setdefault(status, []).append(page_number)
+                yield outcome
+
+        for term, definition in merge_pdf_rows(counted_pages()):
+            records.append(term, definition, source_name, last_updated, pdf_path.name)
+
+        for status, numbers in skipped_pages.items():
+            print(f"[WARNING] {len(numbers)} page(s) of {pdf_path.name} skipped ({status})")
+
+        return {
+            "records": records,
+            "count": len(set(records.term)),
+            "pages": pages,
+            "skipped_pages": skipped_pages
+        }
+
     def save_glossary_json(
         self,
         terms_dict: Dict[str, str],
@@ -162,31 +573,103 @@ class GlossaryExtractor:
         print(f"Glossary saved to {output_path}")
         return output_path
 
+    def iter_extract(
+        self,
+        html_paths: List[Path],
+        source_name: str = "SuperStream Glossaries",
+        workers: int = 1,
+        fast: bool = False
+    ) -> Iterator[ExtractionOutcome]:
+        """
+        Extract multiple HTML files, yielding each outcome as it completes.
+
+        With more than one worker, files are fanned out to a process pool
+        and outcomes arrive in completion order; wrap the iterator in
+        in_input_order for a deterministic order. A failing file yields an
+        outcome with an error message instead of aborting the batch.
+
+        Args:
+            html_paths: List of HTML file paths.
+            source_name: Name of the glossary source.
+            workers: Number of worker processes (1 = run in this process).
+            fast: Use the table-only streaming parser.
+
+        Yields:
+            (index, path, result, error) tuples.
+        """
+        tasks = [
+            (index, Path(html_path), source_name, fast, self.output_dir)
+            for index, html_path in enumerate(html_paths)
+        ]
+
+        if workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield _extract_worker(task)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_extract_worker, task): task for task in tasks}
+            for future in as_completed(futures):
+                index, html_path = futures[future][:2]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. out of memory)
+                    yield index, html_path, None, f"{type(e).__name__}: {e}"
+
     def extract_multiple(
         self,
         html_paths: List[Path],
-        source_name: str = "SuperStream Glossaries"
+        source_name: str = "SuperStream Glossaries",
+        workers: int = 1,
+        fast: bool = False,
+        dedup: bool = True,
+        dedup_threshold: float = 0.85
     ) -> Dict[str, any]:
         """
         Extract glossaries from multiple HTML files.
 
+        Results are merged in input order, so later files win on duplicate
+        terms regardless of how many workers are used. Files that fail are
+        reported under "errors" and do not stop the remaining files.
+
+        Unless disabled, records are deduplicated before they reach the
+        embedding stage (see deduplicate_records): entries repeated across
+        pages, exactly or nearly, are collapsed into one record carrying
+        the merged provenance, and "duplicates" lists every collapsed
+        cluster.
+
         Args:
             html_paths: List of HTML file paths.
             source_name: Name of the glossary source.
+            workers: Number of worker processes (1 = run in this process).
+            fast: Use the table-only streaming parser.
+            dedup: Collapse exact and near-duplicate documents.
+            dedup_threshold: Minimum Jaccard similarity of word 3-grams
+                             for a near-duplicate.
 
         Returns:
-            Dictionary with combined terms and documents.
+            Dictionary with the combined records, number of distinct terms,
+            duplicate report and per-file errors.
         """
-        combined_terms = {}
-        combined_documents = []
+        combined = GlossaryRecords()
+        errors = {}
+
+        outcomes = self.iter_extract(html_paths, source_name, workers=workers, fast=fast)
+        for _, html_path, result, error in in_input_order(outcomes):
+            if error is not None:
+                errors[str(html_path)] = error
+                continue
+            combined.extend(result["records"])
 
-        for html_path in html_paths:
-            result = self.extract_from_html(html_path, source_name)
-            combined_terms.update(result["terms"])
-            combined_documents.extend(result["documents"])
+        count = len(set(combined.term))
+        duplicates = []
+        if dedup:
+            combined, duplicates = deduplicate_records(combined, threshold=dedup_threshold)
 
         return {
-            "terms": combined_terms,
-            "documents": combined_documents,
-            "count": len(combined_terms)
+            "records": combined,
+            "count": count,
+            "duplicates": duplicates,
+            "errors": errors
         }
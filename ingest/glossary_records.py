@@ -0,0 +1,333 @@
+"""Compact Columnar Glossary Record Store for SuperStream RAG System."""
+
+import uuid
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from llama_index.core.schema import Document
+
+GLOSSARY_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "superstream-rag/glossary")
+
+GLOSSARY_DOC_TYPE = "glossary"
+DEFAULT_LAST_UPDATED = "2025-08-12"
+
+
+def glossary_doc_id(term: str) -> str:
+    """
+    Return the stable document ID for a glossary term.
+
+    The same term always maps to the same ID, which lets incremental index
+    updates match incoming terms against documents already in the docstore.
+
+    Args:
+        term: Glossary term.
+
+    Returns:
+        UUID string derived from the term.
+    """
+    return str(uuid.uuid5(GLOSSARY_ID_NAMESPACE, term))
+
+
+class StringColumn:
+    """
+    Append-only column of strings packed into one UTF-8 buffer.
+
+    Row i is ``data[offsets[i]:offsets[i + 1]]``, so a row costs 8 bytes
+    of offset plus its encoded text instead of a Python str object each.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self._data = bytearray()
+        self._offsets = array("Q", [0])
+        for value in values:
+            self.append(value)
+
+    def append(self, value: str) -> None:
+        self._data += value.encode("utf-8")
+        self._offsets.append(len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self._data[self._offsets[row]:self._offsets[row + 1]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(len(self)):
+            yield self[row]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the buffer and the offsets."""
+        return len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+
+class InternedColumn:
+    """
+    Append-only column of low-cardinality strings stored as integer codes.
+
+    Each distinct value is kept once; rows hold a 4-byte code into it.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self._lookup: Dict[str, int] = {}
+        self._codes = array("I")
+        for value in values:
+            self.append(value)
+
+    def append(self, value: str) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        self._codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self._codes[row]]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the codes and the distinct values."""
+        return self._codes.itemsize * len(self._codes) + sum(len(value) for value in self.values)
+
+
+class GlossaryRecords:
+    """
+    Columnar store of extracted glossary entries.
+
+    Terms and definitions are packed into StringColumns; source,
+    last_updated and file_name repeat across thousands of rows and are
+    interned. The document text ("term: definition"), the document ID and
+    the constant doc_type are derived on access rather than stored, and a
+    LlamaIndex Document is only built by document()/documents() at the
+    point where LlamaIndex needs one. The store pickles as a handful of
+    buffers, which keeps extraction worker results cheap to ship back.
+
+    Rows may carry extra provenance metadata (see deduplicate_records),
+    which is excluded from the embedded and LLM text of their Document.
+
+    Attributes:
+        term: Term column.
+        definition: Definition column.
+        source: Source name column.
+        last_updated: Last update date column.
+        file_name: Source file name column.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.term = StringColumn()
+        self.definition = StringColumn()
+        self.source = InternedColumn()
+        self.last_updated = InternedColumn()
+        self.file_name = InternedColumn()
+        self._extra: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_terms(
+        cls,
+        terms: Dict[str, str],
+        source: str,
+        last_updated: Optional[str],
+        file_name: str
+    ) -> "GlossaryRecords":
+        """
+        Build a store from a term to definition mapping.
+
+        Args:
+            terms: Term to definition mapping.
+            source: Source name shared by all rows.
+            last_updated: Last update date shared by all rows.
+            file_name: Source file name shared by all rows.
+
+        Returns:
+            GlossaryRecords instance.
+        """
+        records = cls()
+        for term, definition in terms.items():
+            records.append(term, definition, source, last_updated, file_name)
+        return records
+
+    def append(
+        self,
+        term: str,
+        definition: str,
+        source: str,
+        last_updated: Optional[str],
+        file_name: str
+    ) -> None:
+        """
+        Append one term-definition pair.
+
+        Args:
+            term: Glossary term.
+            definition: Term definition.
+            source: Name of the glossary source.
+            last_updated: Last update date (YYYY-MM-DD format).
+            file_name: Name of the file the pair was extracted from.
+        """
+        self.term.append(term)
+        self.definition.append(definition)
+        self.source.append(source)
+        self.last_updated.append(last_updated or DEFAULT_LAST_UPDATED)
+        self.file_name.append(file_name)
+
+    def extend(self, other: "GlossaryRecords") -> None:
+        """
+        Append every row of another store, keeping its extra metadata.
+
+        Args:
+            other: Store to append.
+        """
+        offset = len(self)
+        for row in range(len(other)):
+            self.append(
+                other.term[row],
+                other.definition[row],
+                other.source[row],
+                other.last_updated[row],
+                other.file_name[row]
+            )
+        for row, extra in other._extra.items():
+            self._extra[offset + row] = dict(extra)
+
+    def select(
+        self,
+        rows: Iterable[int],
+        extra: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> "GlossaryRecords":
+        """
+        Copy a subset of rows into a new store.
+
+        Args:
+            rows: Rows to keep, in the order they should appear.
+            extra: Extra metadata keyed by row of this store, replacing
+                   any extra metadata those rows already carry.
+
+        Returns:
+            New GlossaryRecords instance.
+        """
+        extra = extra or {}
+        selected = GlossaryRecords()
+        for new_row, row in enumerate(rows):
+            selected.append(
+                self.term[row],
+                self.definition[row],
+                self.source[row],
+                self.last_updated[row],
+                self.file_name[row]
+            )
+            row_extra = extra.get(row, self._extra.get(row))
+            if row_extra:
+                selected._extra[new_row] = dict(row_extra)
+        return selected
+
+    def latest_per_term(self) -> "GlossaryRecords":
+        """
+        Keep only the last row of every term.
+
+        Document IDs are derived from the term, so two rows with the same
+        term (e.g. different definitions from different glossaries) would
+        share a docstore entry and mix up their metadata. The later row
+        wins, as in terms().
+
+        Returns:
+            This store if every term is unique, else a new store with the
+            last row of each term, in input order.
+        """
+        last_rows = {term: row for row, term in enumerate(self.term)}
+        if len(last_rows) == len(self):
+            return self
+        return self.select(sorted(last_rows.values()))
+
+    def __len__(self) -> int:
+        return len(self.term)
+
+    def text(self, row: int) -> str:
+        """Document text of a row ("term: definition")."""
+        return f"{self.term[row]}: {self.definition[row]}"
+
+    def doc_id(self, row: int) -> str:
+        """Stable document ID of a row."""
+        return glossary_doc_id(self.term[row])
+
+    def metadata(self, row: int) -> Dict[str, Any]:
+        """
+        Document metadata of a row, extra provenance last.
+
+        Args:
+            row: Row number.
+
+        Returns:
+            Metadata dictionary in the key order Documents always had.
+        """
+        metadata: Dict[str, Any] = {
+            "term": self.term[row],
+            "definition": self.definition[row],
+            "source": self.source[row],
+            "doc_type": GLOSSARY_DOC_TYPE,
+            "last_updated": self.last_updated[row],
+            "file_name": self.file_name[row],
+        }
+        metadata.update(self._extra.get(row, {}))
+        return metadata
+
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        return self.metadata(row)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(len(self)):
+            yield self.metadata(row)
+
+    def terms(self) -> Dict[str, str]:
+        """
+        Term to definition mapping; later rows win on duplicate terms.
+
+        Returns:
+            Dictionary of terms to definitions.
+        """
+        return dict(zip(self.term, self.definition))
+
+    def document(self, row: int) -> "Document":
+        """
+        Materialize the LlamaIndex Document of a row.
+
+        Args:
+            row: Row number.
+
+        Returns:
+            Document with the stable glossary ID, text and metadata.
+        """
+        # Imported here so extraction workers and query processes skip llama_index
+        from llama_index.core.schema import Document
+
+        excluded = list(self._extra.get(row, {}))
+        return Document(
+            id_=self.doc_id(row),
+            text=self.text(row),
+            metadata=self.metadata(row),
+            excluded_embed_metadata_keys=excluded,
+            excluded_llm_metadata_keys=list(excluded)
+        )
+
+    def iter_documents(self) -> Iterator["Document"]:
+        """Materialize Documents one row at a time."""
+        for row in range(len(self)):
+            yield self.document(row)
+
+    def documents(self) -> List["Document"]:
+        """Materialize the Documents of every row."""
+        return list(self.iter_documents())
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by the columns."""
+        return sum(
+            column.nbytes
+            for column in (self.term, self.definition, self.source, self.last_updated, self.file_name)
+        )
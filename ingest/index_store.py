@@ -0,0 +1,689 @@
+"""Compact Binary Index Persistence for SuperStream RAG System."""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+from ingest.snapshots import resolve_index_dir
+
+# LlamaIndex's FaissVectorStore already writes the native FAISS binary
+# format under this (misleading) name, so query workers map it directly
+VECTOR_STORE_FILE = "default__vector_store.json"
+RECORDS_FILE = "records.bin"
+
+# Full-precision vectors aligned with record rows, kept next to a quantized
+# FAISS index so the top candidates can be reranked exactly
+FULL_VECTORS_FILE = "vectors.npy"
+DEFAULT_RERANK_FACTOR = 4
+
+# FAISS pads missing L2 results with the largest float32
+MISSING_DISTANCE = np.finfo("float32").max
+
+RECORDS_MAGIC = b"SSRECS01"
+ALIGNMENT = 64
+
+# Map index codes from disk instead of copying them into process memory
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+
+
+def _pad(length: int) -> int:
+    return (ALIGNMENT - length % ALIGNMENT) % ALIGNMENT
+
+
+def _layout_header(
+    header: Dict[str, Any],
+    sections: List[Tuple[Dict[str, Any], int]]
+) -> bytes:
+    """Assign section positions in a records header and encode it."""
+    # Header size depends on the offsets it contains, so iterate until stable
+    header_length = 0
+    while True:
+        position = len(RECORDS_MAGIC) + 8 + header_length
+        position += _pad(position)
+        for section, length in sections:
+            section["start"] = position
+            section["length"] = length
+            position += length + _pad(length)
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(header_bytes) == header_length:
+            return header_bytes
+        header_length = len(header_bytes)
+
+
+class ColumnarRecords:
+    """
+    Read-only columnar store of string records backed by a single file.
+
+    Each string column is stored as one UTF-8 byte blob plus an int64
+    offsets array; numeric arrays are stored raw. The file starts with a
+    small JSON header describing where each section lives, so loading only
+    parses the header and memory-maps the rest.
+
+    File layout::
+
+        magic (8 bytes) | header length (uint64) | header JSON | padding
+        section 0 | padding | section 1 | padding | ...
+
+    Attributes:
+        columns: Names of the string columns.
+        meta: Free-form metadata stored in the header.
+    """
+
+    def __init__(
+        self,
+        buffer: np.ndarray,
+        header: Dict[str, Any]
+    ):
+        """
+        Initialize records from a (memory-mapped) byte buffer and its header.
+
+        Args:
+            buffer: uint8 array holding the whole file.
+            header: Parsed JSON header.
+        """
+        self._buffer = buffer
+        self._count = header["count"]
+        self.meta = header.get("meta", {})
+        self.columns = list(header["columns"])
+
+        self._offsets: Dict[str, np.ndarray] = {}
+        self._data: Dict[str, np.ndarray] = {}
+        for name, section in header["columns"].items():
+            self._offsets[name] = self._view(section["offsets"], np.int64)
+            self._data[name] = self._view(section["data"], np.uint8)
+
+        self._arrays: Dict[str, np.ndarray] = {
+            name: self._view(section, np.dtype(section["dtype"]))
+            for name, section in header.get("arrays", {}).items()
+        }
+
+    def _view(self, section: Dict[str, Any], dtype: Any) -> np.ndarray:
+        start, length = section["start"], section["length"]
+        return self._buffer[start:start + length].view(dtype)
+
+    @staticmethod
+    def write(
+        path: Path,
+        columns: Dict[str, Sequence[str]],
+        arrays: Optional[Dict[str, np.ndarray]] = None,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """
+        Write string columns and numeric arrays to a records file.
+
+        Args:
+            path: Output file path.
+            columns: Column name to list of strings, all the same length.
+            arrays: Optional named numeric arrays stored alongside.
+            meta: Optional JSON-serializable metadata.
+
+        Returns:
+            Path to the written file.
+
+        Raises:
+            ValueError: If columns have different lengths.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same number of values")
+        count = lengths.pop() if lengths else 0
+
+        sections: List[Tuple[Dict[str, Any], bytes]] = []
+        header: Dict[str, Any] = {
+            "count": count,
+            "meta": meta or {},
+            "columns": {},
+            "arrays": {},
+        }
+
+        for name, values in columns.items():
+            encoded = [value.encode("utf-8") for value in values]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            offsets_section: Dict[str, Any] = {}
+            data_section: Dict[str, Any] = {}
+            header["columns"][name] = {"offsets": offsets_section, "data": data_section}
+            sections.append((offsets_section, offsets.tobytes()))
+            sections.append((data_section, b"".join(encoded)))
+
+        for name, array in (arrays or {}).items():
+            array = np.ascontiguousarray(array)
+            array_section: Dict[str, Any] = {"dtype": array.dtype.str}
+            header["arrays"][name] = array_section
+            sections.append((array_section, array.tobytes()))
+
+        header_bytes = _layout_header(
+            header,
+            [(section, len(payload)) for section, payload in sections]
+        )
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(RECORDS_MAGIC)
+            f.write(np.uint64(len(header_bytes)).tobytes())
+            f.write(header_bytes)
+            f.write(b"\0" * _pad(f.tell()))
+            for _, payload in sections:
+                f.write(payload)
+                f.write(b"\0" * _pad(len(payload)))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "ColumnarRecords":
+        """
+        Load a records file.
+
+        Args:
+            path: Records file path.
+            mmap: Memory-map the file instead of reading it into memory.
+
+        Returns:
+            ColumnarRecords instance.
+
+        Raises:
+            ValueError: If the file is not a records file.
+        """
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        else:
+            buffer = np.fromfile(path, dtype=np.uint8)
+
+        if bytes(buffer[:len(RECORDS_MAGIC)]) != RECORDS_MAGIC:
+            raise ValueError(f"Not a records file: {path}")
+
+        start = len(RECORDS_MAGIC)
+        header_length = int(buffer[start:start + 8].view(np.uint64)[0])
+        header = json.loads(bytes(buffer[start + 8:start + 8 + header_length]))
+        return cls(buffer, header)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, row: int, column: str) -> str:
+        """
+        Return a single value.
+
+        Args:
+            row: Row number.
+            column: Column name.
+
+        Returns:
+            Decoded string value.
+        """
+        offsets = self._offsets[column]
+        return bytes(self._data[column][offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def __getitem__(self, row: int) -> Dict[str, str]:
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return {column: self.get(row, column) for column in self.columns}
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for row in range(self._count):
+            yield self[row]
+
+    def column(self, name: str) -> List[str]:
+        """
+        Decode a whole string column.
+
+        Args:
+            name: Column name.
+
+        Returns:
+            List of values in row order.
+        """
+        return [self.get(row, name) for row in range(self._count)]
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Return a stored numeric array (memory-mapped when loaded with mmap).
+
+        Args:
+            name: Array name.
+
+        Returns:
+            Numpy array view.
+        """
+        return self._arrays[name]
+
+
+def save_full_vectors(persist_dir: Path, vectors: np.ndarray) -> Path:
+    """
+    Write full-precision vectors for reranking as a .npy file.
+
+    Args:
+        persist_dir: Index directory.
+        vectors: Float32 matrix with one row per record row.
+
+    Returns:
+        Path to the written file.
+    """
+    path = Path(persist_dir) / FULL_VECTORS_FILE
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(vectors, dtype="float32"))
+    os.replace(tmp_path, path)
+    return path
+
+
+class ColumnarRecordsWriter:
+    """
+    Appends string records to spool files and assembles a records file.
+
+    Each column is spooled to a data file and an end-offsets file in
+    ``spool_dir``, so memory use does not grow with the number of rows.
+    Spools are append-only: a checkpoint records their sizes (see
+    ``checkpoint``) and ``truncate`` rolls them back to it after a crash.
+    ``finish`` streams the spools into the same layout ColumnarRecords.write
+    produces.
+
+    Attributes:
+        spool_dir: Directory holding the spool files.
+        columns: Column names.
+        count: Number of rows appended.
+    """
+
+    def __init__(self, spool_dir: Path, columns: Sequence[str]):
+        """
+        Open (or continue) spool files for the given columns.
+
+        Args:
+            spool_dir: Directory for the spool files.
+            columns: Column names.
+        """
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.columns = list(columns)
+        self._data = {name: open(self._path(name, "data"), "ab") for name in self.columns}
+        self._offsets = {name: open(self._path(name, "offsets"), "ab") for name in self.columns}
+        self._ends = {name: self._data[name].tell() for name in self.columns}
+        self.count = self._offsets[self.columns[0]].tell() // 8 if self.columns else 0
+
+    def _path(self, column: str, kind: str) -> Path:
+        return self.spool_dir / f"{column}.{kind}"
+
+    def append(self, record: Dict[str, str]) -> None:
+        """
+        Append one record; missing columns are stored as empty strings.
+
+        Args:
+            record: Column name to value.
+        """
+        for name in self.columns:
+            encoded = record.get(name, "").encode("utf-8")
+            self._data[name].write(encoded)
+            self._ends[name] += len(encoded)
+            self._offsets[name].write(np.int64(self._ends[name]).tobytes())
+        self.count += 1
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Flush the spools and describe their current state.
+
+        Returns:
+            JSON-serializable state for truncate.
+        """
+        for f in list(self._data.values()) + list(self._offsets.values()):
+            f.flush()
+            os.fsync(f.fileno())
+        return {"count": self.count, "data_bytes": dict(self._ends)}
+
+    def truncate(self, state: Dict[str, Any]) -> None:
+        """
+        Roll the spools back to a checkpointed state.
+
+        Args:
+            state: Value returned by checkpoint.
+        """
+        for name in self.columns:
+            self._data[name].truncate(state["data_bytes"][name])
+            self._offsets[name].truncate(state["count"] * 8)
+            self._ends[name] = state["data_bytes"][name]
+        self.count = state["count"]
+
+    def close(self) -> None:
+        """Close the spool files."""
+        for f in list(self._data.values()) + list(self._offsets.values()):
+            f.close()
+
+    def finish(
+        self,
+        path: Path,
+        arrays: Optional[Dict[str, np.ndarray]] = None,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """
+        Assemble the records file from the spools and close them.
+
+        Args:
+            path: Output file path.
+            arrays: Optional named numeric arrays stored alongside.
+            meta: Optional JSON-serializable metadata.
+
+        Returns:
+            Path to the written file.
+        """
+        self.checkpoint()
+        self.close()
+
+        leading_zero = np.int64(0).tobytes()
+        sections: List[Tuple[Dict[str, Any], int]] = []
+        payloads: List[Any] = []
+        header: Dict[str, Any] = {
+            "count": self.count,
+            "meta": meta or {},
+            "columns": {},
+            "arrays": {},
+        }
+        for name in self.columns:
+            offsets_section: Dict[str, Any] = {}
+            data_section: Dict[str, Any] = {}
+            header["columns"][name] = {"offsets": offsets_section, "data": data_section}
+            sections.append((offsets_section, 8 * (self.count + 1)))
+            payloads.append((leading_zero, self._path(name, "offsets")))
+            sections.append((data_section, self._ends[name]))
+            payloads.append((b"", self._path(name, "data")))
+        for name, array in (arrays or {}).items():
+            array = np.ascontiguousarray(array)
+            array_section: Dict[str, Any] = {"dtype": array.dtype.str}
+            header["arrays"][name] = array_section
+            sections.append((array_section, array.nbytes))
+            payloads.append((array.tobytes(), None))
+
+        header_bytes = _layout_header(header, sections)
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(RECORDS_MAGIC)
+            f.write(np.uint64(len(header_bytes)).tobytes())
+            f.write(header_bytes)
+            f.write(b"\0" * _pad(f.tell()))
+            for (_, length), (prefix, spool_path) in zip(sections, payloads):
+                f.write(prefix)
+                if spool_path is not None:
+                    with open(spool_path, "rb") as spool:
+                        shutil.copyfileobj(spool, f)
+                f.write(b"\0" * _pad(length))
+        os.replace(tmp_path, path)
+        return path
+
+
+def index_version(persist_dir: Path) -> str:
+    """
+    Identify the current contents of an index directory.
+
+    Every save rewrites the FAISS and records files, so their size and
+    modification time change whenever the index is rebuilt or updated.
+
+    Args:
+        persist_dir: Index directory.
+
+    Returns:
+        Version string.
+    """
+    parts = []
+    for name in (VECTOR_STORE_FILE, RECORDS_FILE):
+        stat = (Path(persist_dir) / name).stat()
+        parts.append(f"{stat.st_size:x}.{stat.st_mtime_ns:x}")
+    return "-".join(parts)
+
+
+class CompactIndex:
+    """
+    Query-side view of a persisted index: FAISS binary plus columnar records.
+
+    Both files are memory-mapped by default, so loading costs little more
+    than opening them and worker processes share the same page cache.
+
+    When the FAISS index stores quantized codes, full-precision vectors can
+    be kept in a memory-mapped side file: search then fetches
+    ``top_k * rerank_factor`` candidates from FAISS and reorders them by
+    exact L2 distance, touching only the candidates' pages.
+
+    Attributes:
+        faiss_index: Loaded FAISS index.
+        records: Record store, one row per vector.
+        faiss_ids: Sorted FAISS IDs aligned with record rows.
+        full_vectors: Full-precision vectors aligned with record rows, or None.
+        rerank_factor: Candidates fetched per result when reranking
+                       (0 disables reranking).
+        version: Identifier of the files the index was loaded from, used to
+                 invalidate caches when the index is rebuilt (None when the
+                 index was not loaded from disk).
+    """
+
+    def __init__(
+        self,
+        faiss_index: faiss.Index,
+        records: ColumnarRecords,
+        full_vectors: Optional[np.ndarray] = None,
+        rerank_factor: Optional[int] = None
+    ):
+        """
+        Initialize compact index.
+
+        Args:
+            faiss_index: Loaded FAISS index.
+            records: Records with a "faiss_ids" array.
+            full_vectors: Full-precision vectors for reranking.
+            rerank_factor: Candidates fetched per result when reranking.
+                           Defaults to the factor stored at export time.
+        """
+        self.faiss_index = faiss_index
+        self.records = records
+        self.faiss_ids = records.array("faiss_ids")
+        self.full_vectors = full_vectors
+        if rerank_factor is None:
+            rerank_factor = records.meta.get("rerank_factor", DEFAULT_RERANK_FACTOR)
+        self.rerank_factor = rerank_factor if full_vectors is not None else 0
+        self.version: Optional[str] = None
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """Metadata stored at export time (embedding model, dimension, ...)."""
+        return self.records.meta
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def rows_for_ids(self, labels: np.ndarray) -> np.ndarray:
+        """
+        Translate FAISS labels to record rows.
+
+        Args:
+            labels: FAISS IDs returned by search (-1 for empty slots).
+
+        Returns:
+            Row numbers, -1 where the label is missing.
+        """
+        labels = np.asarray(labels)
+        if len(self.faiss_ids) == 0:
+            return np.full(labels.shape, -1, dtype=np.int64)
+        rows = np.searchsorted(self.faiss_ids, labels)
+        rows = np.clip(rows, 0, len(self.faiss_ids) - 1)
+        found = (labels >= 0) & (self.faiss_ids[rows] == labels)
+        return np.where(found, rows, -1)
+
+    def search(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int = 5
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search the FAISS index with a matrix of query vectors.
+
+        Args:
+            query_vectors: Float32 array of shape (n_queries, dimension).
+            top_k: Number of neighbours per query.
+
+        Returns:
+            Tuple of (distances, rows), each shaped (n_queries, top_k).
+            Rows are -1 where fewer than top_k results exist.
+        """
+        queries = np.ascontiguousarray(query_vectors, dtype="float32")
+        if queries.ndim == 1:
+            queries = queries[np.newaxis, :]
+        if self.rerank_factor <= 1:
+            distances, labels = self.faiss_index.search(queries, top_k)
+            return distances, self.rows_for_ids(labels)
+
+        _, labels = self.faiss_index.search(queries, top_k * self.rerank_factor)
+        return self.rerank(queries, self.rows_for_ids(labels), top_k)
+
+    def rerank(
+        self,
+        queries: np.ndarray,
+        candidates: np.ndarray,
+        top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reorder candidate rows by exact L2 distance to full-precision vectors.
+
+        Args:
+            queries: Float32 array of shape (n_queries, dimension).
+            candidates: Candidate rows per query, -1 for empty slots.
+            top_k: Number of results to keep per query.
+
+        Returns:
+            Tuple of (distances, rows), each shaped (n_queries, top_k),
+            padded like FAISS pads missing results.
+        """
+        distances = np.full((len(queries), top_k), MISSING_DISTANCE, dtype="float32")
+        rows = np.full((len(queries), top_k), -1, dtype=np.int64)
+        for i, (query, query_rows) in enumerate(zip(queries, candidates)):
+            query_rows = query_rows[query_rows >= 0]
+            if len(query_rows) == 0:
+                continue
+            exact = ((self.full_vectors[query_rows] - query) ** 2).sum(axis=1)
+            order = np.argsort(exact, kind="stable")[:top_k]
+            distances[i, :len(order)] = exact[order]
+            rows[i, :len(order)] = query_rows[order]
+        return distances, rows
+
+    @classmethod
+    def load(cls, persist_dir: Path, mmap: bool = True) -> "CompactIndex":
+        """
+        Load a compact index written by save_compact_index.
+
+        Full-precision vectors for reranking are loaded when the index
+        directory contains them. An index root with published snapshots
+        loads its current snapshot.
+
+        Args:
+            persist_dir: Index directory or snapshot root.
+            mmap: Memory-map the FAISS codes, records and full vectors.
+
+        Returns:
+            CompactIndex instance.
+
+        Raises:
+            FileNotFoundError: If the index files are missing.
+        """
+        persist_dir = resolve_index_dir(persist_dir)
+        vector_path = persist_dir / VECTOR_STORE_FILE
+        records_path = persist_dir / RECORDS_FILE
+        for path in (vector_path, records_path):
+            if not path.exists():
+                raise FileNotFoundError(f"Index file not found: {path}")
+
+        faiss_index = faiss.read_index(str(vector_path), MMAP_FLAGS if mmap else 0)
+        records = ColumnarRecords.load(records_path, mmap=mmap)
+
+        full_vectors = None
+        full_vectors_path = persist_dir / FULL_VECTORS_FILE
+        if full_vectors_path.exists():
+            full_vectors = np.load(full_vectors_path, mmap_mode="r" if mmap else None)
+        index = cls(faiss_index, records, full_vectors)
+        index.version = index_version(persist_dir)
+        return index
+
+
+def save_compact_index(
+    vector_index: Any,
+    persist_dir: Path,
+    embedding_model: Optional[str] = None,
+    node_vectors: Optional[Mapping[str, Sequence[float]]] = None,
+    rerank_factor: int = DEFAULT_RERANK_FACTOR
+) -> Path:
+    """
+    Export a built VectorStoreIndex to the compact query format.
+
+    Writes the FAISS index in its native binary format and one record per
+    vector (node text, document ID and metadata) to a columnar file, ordered
+    by FAISS ID.
+
+    The docstore does not keep embeddings, so full-precision vectors for
+    reranking are taken from ``node_vectors`` (normally
+    IndexBuilder.node_vectors, the vectors the build already computed).
+    If any node is missing from it, no vectors are written and reranking
+    stays off for this index.
+
+    Args:
+        vector_index: VectorStoreIndex backed by StableIdFaissVectorStore.
+        persist_dir: Output directory (usually the LlamaIndex persist dir).
+        embedding_model: Embedding model name recorded in the metadata.
+        node_vectors: Full-precision vectors keyed by node ID. When given,
+                      they are written alongside for reranking.
+        rerank_factor: Candidates fetched per result when reranking.
+
+    Returns:
+        Path to the records file.
+    """
+    persist_dir = Path(persist_dir)
+    persist_dir.mkdir(parents=True, exist_ok=True)
+
+    vector_store = vector_index.vector_store
+    faiss_index = vector_store.client
+    docstore = vector_index.docstore
+
+    id_map = vector_store.faiss_id_to_node_id
+    faiss_ids = np.array(sorted(id_map), dtype=np.int64)
+    nodes = [docstore.get_node(id_map[int(faiss_id)]) for faiss_id in faiss_ids]
+
+    metadata_keys = sorted({key for node in nodes for key in node.metadata})
+    columns: Dict[str, List[str]] = {
+        "node_id": [node.node_id for node in nodes],
+        "doc_id": [node.ref_doc_id or "" for node in nodes],
+        "text": [node.get_content() for node in nodes],
+    }
+    for key in metadata_keys:
+        columns[key] = [str(node.metadata.get(key, "")) for node in nodes]
+
+    meta: Dict[str, Any] = {
+        "embedding_model": embedding_model,
+        "dimension": faiss_index.d,
+        "count": len(nodes),
+    }
+
+    full_vectors_path = persist_dir / FULL_VECTORS_FILE
+    if node_vectors is not None:
+        missing = sum(1 for node in nodes if node.node_id not in node_vectors)
+        if missing:
+            print(f"[WARNING] No full-precision vectors for {missing} node(s); "
+                  f"reranking is off until the next full build")
+            node_vectors = None
+    if node_vectors is not None:
+        vectors = np.empty((len(nodes), faiss_index.d), dtype="float32")
+        for row, node in enumerate(nodes):
+            vectors[row] = node_vectors[node.node_id]
+        save_full_vectors(persist_dir, vectors)
+        meta["rerank_factor"] = rerank_factor
+    elif full_vectors_path.exists():
+        # Stale vectors would no longer line up with the records
+        full_vectors_path.unlink()
+
+    faiss.write_index(faiss_index, str(persist_dir / VECTOR_STORE_FILE))
+    return ColumnarRecords.write(
+        persist_dir / RECORDS_FILE,
+        columns,
+        arrays={"faiss_ids": faiss_ids},
+        meta=meta
+    )
@@ -1,48 +1,126 @@
 """Vector Index Builder for SuperStream RAG System."""
 
 from pathlib import Path
-from typing import List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 
-from llama_index.core import VectorStoreIndex, StorageContext
-from llama_index.core.schema import Document
-from llama_index.embeddings.openai import OpenAIEmbedding
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.vector_stores.faiss import FaissVectorStore
-
-import faiss
+import numpy as np
+from llama_index.core import (
+    VectorStoreIndex,
+    StorageContext,
+    Settings,
+    load_index_from_storage,
+)
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.ingestion import run_transformations
+from llama_index.core.schema import BaseNode, Document, MetadataMode
+from llama_index.vector_stores.faiss import FaissMapVectorStore
+from pydantic import PrivateAttr
 
 from config import EMBEDDING_MODEL, EMBEDDING_MODEL_TYPE, OPENAI_API_KEY, OPENAI_API_BASE
+from ingest.async_embedding import AsyncBatchEmbedder
+from ingest.embedding_backends import create_embedding_model, embedding_fingerprint
+from ingest.embedding_cache import EmbeddingCache
+from ingest.faiss_index import (
+    FaissIndexConfig,
+    create_faiss_index,
+    supports_removal,
+    train_faiss_index,
+)
+from ingest.index_store import FULL_VECTORS_FILE, RECORDS_FILE, ColumnarRecords
+from ingest.parallel_embedding import ParallelEmbedder
+from ingest.profiling import span
+
 
+class StableIdFaissVectorStore(FaissMapVectorStore):
+    """
+    FAISS vector store with stable, never reused vector IDs.
 
-def create_embedding_model(
-    model_name: str,
-    model_type: str = EMBEDDING_MODEL_TYPE,
-    api_key: Optional[str] = None,
-    api_base: Optional[str] = None
-) -> Any:
+    FaissMapVectorStore assigns ``ntotal`` as the next FAISS ID, which collides
+    with live IDs once vectors have been removed. This store hands out
+    monotonically increasing IDs so add/delete cycles from incremental
+    updates keep every node mapped to its own vector.
     """
-    Create embedding model based on type.
 
-    Args:
-        model_name: Name of the embedding model.
-        model_type: Type of model - "openai" or "huggingface".
-        api_key: OpenAI API key (required for OpenAI models).
-        api_base: OpenAI API base URL (optional for OpenAI models).
+    def add(
+        self,
+        nodes: List[BaseNode],
+        **add_kwargs: Any,
+    ) -> List[str]:
+        """
+        Add nodes to index, replacing any existing vector for the same node.
+
+        Args:
+            nodes: Nodes with embeddings.
+
+        Returns:
+            Node IDs of the added nodes.
+        """
+        if not nodes:
+            return []
+
+        existing = [node.id_ for node in nodes if node.id_ in self._node_id_to_faiss_id_map]
+        if existing:
+            self.delete_nodes(existing)
+
+        next_id = max(self._faiss_id_to_node_id_map, default=-1) + 1
+        faiss_ids = np.arange(next_id, next_id + len(nodes), dtype=np.int64)
+        vectors = np.array([node.get_embedding() for node in nodes], dtype="float32")
+        self._faiss_index.add_with_ids(vectors, faiss_ids)
+
+        for node, faiss_id in zip(nodes, faiss_ids.tolist()):
+            self._node_id_to_faiss_id_map[node.id_] = faiss_id
+            self._faiss_id_to_node_id_map[faiss_id] = node.id_
+        return [node.id_ for node in nodes]
+
+    @property
+    def faiss_id_to_node_id(self) -> Dict[int, str]:
+        """Mapping from FAISS vector ID to node ID."""
+        return self._faiss_id_to_node_id_map
+
 
-    Returns:
-        Embedding model instance.
+class LazyEmbedding(BaseEmbedding):
     """
-    if model_type == "openai":
-        return OpenAIEmbedding(
-            model=model_name,
-            api_key=api_key or OPENAI_API_KEY,
-            api_base=api_base or OPENAI_API_BASE
-        )
-    elif model_type == "huggingface":
-        # HuggingFace embedding models (like E5-Large-V2)
-        return HuggingFaceEmbedding(model_name=model_name)
-    else:
-        raise ValueError(f"Unsupported embedding model type: {model_type}")
+    Embedding model that is only created when something embeds with it.
+
+    With embedding worker processes, every node reaches LlamaIndex already
+    embedded, so the parent never needs its own copy of the model (a local
+    one holds over a gigabyte). LlamaIndex still requires an embed_model,
+    and this stands in for it, loading the real model on first use, e.g.
+    when the built index is queried.
+    """
+
+    _factory: Callable[[], BaseEmbedding] = PrivateAttr()
+    _model: Optional[BaseEmbedding] = PrivateAttr(default=None)
+
+    def __init__(self, model_name: str, factory: Callable[[], BaseEmbedding], **kwargs: Any):
+        """
+        Initialize lazy embedding.
+
+        Args:
+            model_name: Embedding model name.
+            factory: Creates the real embedding model.
+        """
+        super().__init__(model_name=model_name, **kwargs)
+        self._factory = factory
+
+    @property
+    def model(self) -> BaseEmbedding:
+        """The real embedding model, created on first access."""
+        if self._model is None:
+            self._model = self._factory()
+        return self._model
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self.model.get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return await self.model.aget_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self.model.get_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self.model.get_text_embedding_batch(texts)
 
 
 class IndexBuilder:
@@ -50,17 +128,34 @@ class IndexBuilder:
     Builds and manages FAISS vector indexes for RAG system.
 
     Uses embeddings (OpenAI or HuggingFace) to vectorize documents and stores them
-    in FAISS for efficient similarity search.
+    in FAISS for efficient similarity search. Embeddings are looked up in a
+    persistent EmbeddingCache first, so only new or changed texts are sent
+    to the embedding model, in concurrent rate-limited batches.
 
     Attributes:
         embedding_model: Embedding model name.
+        cache: Embedding cache, or None when caching is disabled.
+        cache_key: Model fingerprint the cached vectors are stored under
+                   (backend, model name and precision).
+        embedder: Concurrent batch embedding stage (AsyncBatchEmbedder, or
+                  ParallelEmbedder with multiple worker processes).
+        index_config: FAISS index family and parameters.
+        node_vectors: Full-precision vector of every node in the index
+                      last built or updated, keyed by node ID.
     """
 
     def __init__(
         self,
         embedding_model: str = EMBEDDING_MODEL,
         api_key: Optional[str] = None,
-        api_base: Optional[str] = None
+        api_base: Optional[str] = None,
+        cache: Optional[EmbeddingCache] = None,
+        use_cache: bool = True,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        tokens_per_minute: Optional[int] = None,
+        index_config: Optional[FaissIndexConfig] = None,
+        workers: int = 1
     ):
         """
         Initialize index builder.
@@ -69,25 +164,132 @@ class IndexBuilder:
             embedding_model: Embedding model name.
             api_key: OpenAI API key. Defaults to OPENAI_API_KEY from config.
             api_base: OpenAI API base URL. Defaults to OPENAI_API_BASE from config.
+            cache: Embedding cache to use. Defaults to an EmbeddingCache at
+                   the default cache path when use_cache is True.
+            use_cache: Whether to consult the embedding cache at all.
+            batch_size: Number of texts per embedding request.
+            max_concurrency: Maximum number of embedding requests in flight.
+            tokens_per_minute: Provider token limit per minute (None = unlimited).
+            index_config: FAISS index configuration. Defaults to "auto",
+                          which picks the index family by corpus size.
+            workers: Embedding worker processes. Above 1, texts missing
+                     from the cache are embedded by a ParallelEmbedder,
+                     each worker holding its own copy of a local model;
+                     the parent only loads one if the index is queried.
         """
         self.embedding_model = embedding_model
         self.api_key = api_key or OPENAI_API_KEY
         self.api_base = api_base or OPENAI_API_BASE
+        self.index_config = index_config or FaissIndexConfig()
+        self.node_vectors: Dict[str, np.ndarray] = {}
+        self.cache_key = embedding_fingerprint(embedding_model, EMBEDDING_MODEL_TYPE)
+        if not use_cache:
+            self.cache = None
+        else:
+            self.cache = cache if cache is not None else EmbeddingCache()
 
-        # Initialize embedding model
-        self.embedding = create_embedding_model(
-            model_name=embedding_model,
-            model_type=EMBEDDING_MODEL_TYPE,
-            api_key=self.api_key,
-            api_base=self.api_base
-        )
+        # Initialize embedding model; rate-limit retries are handled by
+        # the batch embedder rather than the OpenAI client
+        model_kwargs = {"max_retries": 0} if EMBEDDING_MODEL_TYPE == "openai" else {}
+
+        def load_model() -> BaseEmbedding:
+            return create_embedding_model(
+                model_name=embedding_model,
+                model_type=EMBEDDING_MODEL_TYPE,
+                api_key=self.api_key,
+                api_base=self.api_base,
+                **model_kwargs
+            )
+
+        if workers > 1:
+            # Workers load their own copies; the parent only loads one if
+            # the index is queried
+            self.embedding = LazyEmbedding(embedding_model, load_model)
+            self.embedder = ParallelEmbedder(
+                embedding_model,
+                model_type=EMBEDDING_MODEL_TYPE,
+                workers=workers,
+                model_kwargs=model_kwargs
+            )
+        else:
+            self.embedding = load_model()
+            self.embedder = AsyncBatchEmbedder(
+                self.embedding,
+                batch_size=batch_size,
+                max_concurrency=max_concurrency,
+                tokens_per_minute=tokens_per_minute,
+                model_name=embedding_model
+            )
+
+    def close(self) -> None:
+        """Shut down embedding worker processes, if any."""
+        if isinstance(self.embedder, ParallelEmbedder):
+            self.embedder.close()
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, reusing cached embeddings where available.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            Embeddings aligned with ``texts``.
+        """
+        if self.cache is None:
+            with span("embed", items=len(texts)):
+                return self.embedder.embed(texts)
+
+        with span("embedding_cache_lookup", items=len(texts)) as lookup_span:
+            embeddings = self.cache.get_many(self.cache_key, texts)
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            lookup_span.attributes["hits"] = len(texts) - len(missing)
+            lookup_span.attributes["misses"] = len(missing)
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            with span("embed", items=len(missing_texts)):
+                new_embeddings = self.embedder.embed(missing_texts)
+            with span("embedding_cache_store", items=len(missing_texts)):
+                self.cache.put_many(self.cache_key, missing_texts, new_embeddings)
+            for i, embedding in zip(missing, new_embeddings):
+                embeddings[i] = embedding
+        return embeddings
+
+    def embed_nodes(self, nodes: List[BaseNode]) -> List[BaseNode]:
+        """
+        Attach embeddings to nodes that do not have one yet.
+
+        Prints the embedding cache hits and misses of the call, once per
+        build_index/update_index rather than once per embed_texts batch.
+
+        Args:
+            nodes: Nodes to embed in place.
+
+        Returns:
+            The same nodes with ``embedding`` populated.
+        """
+        pending = [node for node in nodes if node.embedding is None]
+        if pending:
+            texts = [
+                node.get_content(metadata_mode=MetadataMode.EMBED)
+                for node in pending
+            ]
+            if self.cache is not None:
+                hits, misses = self.cache.hits, self.cache.misses
+            for node, embedding in zip(pending, self.embed_texts(texts)):
+                node.embedding = embedding
+            if self.cache is not None:
+                print(f"Embedding cache: {self.cache.hits - hits} hits, "
+                      f"{self.cache.misses - misses} misses")
+        return nodes
 
     def build_index(self, documents: List[Document]) -> VectorStoreIndex:
         """
         Build a FAISS vector index from documents.
 
-        Creates a new FAISS index, embeds all documents, and returns
-        a VectorStoreIndex ready for querying.
+        Creates a new FAISS index, embeds all documents (through the
+        embedding cache), and returns a VectorStoreIndex ready for querying.
 
         Args:
             documents: List of Document objects to index.
@@ -102,24 +304,45 @@ class IndexBuilder:
             raise ValueError("Documents list is empty")
 
         try:
-            # Create FAISS index
-            # E5-Large-V2 uses 1024 dimensions, OpenAI embeddings use 1536
-            dimension = 1024 if EMBEDDING_MODEL_TYPE == "huggingface" else 1536
-            faiss_index = faiss.IndexFlatL2(dimension)
+            # Split documents into nodes the same way from_documents does
+            with span("transform", items=len(documents)) as transform_span:
+                nodes = run_transformations(
+                    documents,
+                    Settings.transformations,
+                    show_progress=True
+                )
+                transform_span.attributes["nodes"] = len(nodes)
+
+            # Embed up front so cached vectors skip the embedding model
+            self.embed_nodes(nodes)
+            vectors = np.array([node.embedding for node in nodes], dtype="float32")
+            self.node_vectors = {node.node_id: vector for node, vector in zip(nodes, vectors)}
+
+            # Create FAISS index sized by the embeddings actually produced
+            with span("faiss_train", items=len(vectors)):
+                faiss_index = create_faiss_index(
+                    dimension=vectors.shape[1],
+                    n_vectors=len(vectors),
+                    config=self.index_config
+                )
+                train_faiss_index(faiss_index, vectors, self.index_config)
 
             # Create vector store
-            vector_store = FaissVectorStore(faiss_index=faiss_index)
+            vector_store = StableIdFaissVectorStore(faiss_index=faiss_index)
             storage_context = StorageContext.from_defaults(
                 vector_store=vector_store
             )
+            for doc in documents:
+                storage_context.docstore.set_document_hash(doc.id_, doc.hash)
 
-            # Build index from documents
-            index = VectorStoreIndex.from_documents(
-                documents,
-                storage_context=storage_context,
-                embed_model=self.embedding,
-                show_progress=True
-            )
+            # Build index from pre-embedded nodes
+            with span("faiss_add", items=len(nodes)):
+                index = VectorStoreIndex(
+                    nodes=nodes,
+                    storage_context=storage_context,
+                    embed_model=self.embedding,
+                    show_progress=True
+                )
 
             print(f"Index built successfully with {len(documents)} documents")
             return index
@@ -128,3 +351,101 @@ class IndexBuilder:
             print(f"Error building index: {e}")
             raise
 
+    def _load_node_vectors(self, persist_dir: Path) -> Dict[str, np.ndarray]:
+        # Rows of a memory-mapped vectors.npy, keyed by the node ID of the
+        # record row they line up with; only rows still indexed are read
+        vectors_path = persist_dir / FULL_VECTORS_FILE
+        records_path = persist_dir / RECORDS_FILE
+        if not (vectors_path.exists() and records_path.exists()):
+            return {}
+        vectors = np.load(vectors_path, mmap_mode="r")
+        node_ids = ColumnarRecords.load(records_path).column("node_id")
+        return dict(zip(node_ids, vectors))
+
+    def update_index(
+        self,
+        persist_dir: Path,
+        documents: List[Document]
+    ) -> Dict[str, Any]:
+        """
+        Incrementally update a persisted FAISS index to match documents.
+
+        Loads the index from ``persist_dir`` and diffs the incoming documents
+        against the docstore by document ID and hash. Only new and changed
+        documents are embedded and inserted; changed and removed documents
+        have their old vectors deleted. Unchanged documents are not touched;
+        their full-precision vectors are carried over into node_vectors
+        when ``persist_dir`` holds them (see save_compact_index).
+
+        Args:
+            persist_dir: Directory of an index previously built by build_index.
+            documents: Full current set of documents with stable IDs.
+
+        Returns:
+            Dictionary with the updated index and added/updated/deleted/
+            unchanged counts.
+
+        Raises:
+            FileNotFoundError: If persist_dir does not contain an updatable index.
+            NotImplementedError: If terms must be removed from an index type
+                                 that cannot delete vectors (HNSW).
+        """
+        persist_dir = Path(persist_dir)
+        if not (persist_dir / "id_map.json").exists():
+            raise FileNotFoundError(
+                f"No incrementally updatable index found at {persist_dir}"
+            )
+
+        with span("load_index"):
+            vector_store = StableIdFaissVectorStore.from_persist_dir(str(persist_dir))
+            storage_context = StorageContext.from_defaults(
+                vector_store=vector_store,
+                persist_dir=str(persist_dir)
+            )
+            index = load_index_from_storage(storage_context, embed_model=self.embedding)
+        docstore = storage_context.docstore
+        self.node_vectors = self._load_node_vectors(persist_dir)
+
+        incoming = {doc.id_: doc for doc in documents}
+        existing_ids = set(docstore.get_all_ref_doc_info() or {})
+
+        deleted_ids = existing_ids - incoming.keys()
+        added = [doc for doc_id, doc in incoming.items() if doc_id not in existing_ids]
+        updated = [
+            doc for doc_id, doc in incoming.items()
+            if doc_id in existing_ids and docstore.get_document_hash(doc_id) != doc.hash
+        ]
+
+        removed_ids = list(deleted_ids) + [doc.id_ for doc in updated]
+        if removed_ids and not supports_removal(vector_store.client):
+            raise NotImplementedError(
+                "Index type does not support removing vectors; rebuild required"
+            )
+
+        with span("faiss_remove", items=len(removed_ids)):
+            for doc_id in removed_ids:
+                index.delete_ref_doc(doc_id, delete_from_docstore=True)
+
+        changed = added + updated
+        if changed:
+            with span("transform", items=len(changed)):
+                nodes = run_transformations(changed, Settings.transformations)
+            self.embed_nodes(nodes)
+            for node in nodes:
+                self.node_vectors[node.node_id] = np.asarray(node.embedding, dtype="float32")
+            with span("faiss_add", items=len(nodes)):
+                index.insert_nodes(nodes)
+            for doc in changed:
+                docstore.set_document_hash(doc.id_, doc.hash)
+
+        stats = {
+            "added": len(added),
+            "updated": len(updated),
+            "deleted": len(deleted_ids),
+            "unchanged": len(incoming) - len(changed),
+        }
+        print(
+            f"Index updated: {stats['added']} added, {stats['updated']} updated, "
+            f"{stats['deleted']} deleted, {stats['unchanged']} unchanged"
+        )
+        return {"index": index, **stats}
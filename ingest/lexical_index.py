@@ -0,0 +1,184 @@
+"""BM25 Inverted Index for SuperStream RAG System."""
+
+import math
+import re
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ingest.index_store import ColumnarRecords
+from ingest.snapshots import resolve_index_dir
+
+LEXICAL_FILE = "lexical.bin"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-case alphanumeric tokens.
+
+    Regulatory acronyms ("BECS", "SBSCH", "PRN") survive as single tokens.
+
+    Args:
+        text: Input text.
+
+    Returns:
+        List of tokens.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index over the rows of a compact index.
+
+    Postings are stored term-major in flat arrays (rows and term
+    frequencies) with an offsets array per vocabulary entry, inside a
+    ColumnarRecords file, so the index is memory-mapped on load and rows
+    line up with the vector index records.
+
+    Attributes:
+        k1: BM25 term frequency saturation.
+        b: BM25 length normalization.
+        vocabulary: Token to vocabulary position.
+    """
+
+    def __init__(self, records: ColumnarRecords):
+        """
+        Initialize from a loaded records file.
+
+        Args:
+            records: Records written by LexicalIndex.build.
+        """
+        self._records = records
+        self.k1 = records.meta["k1"]
+        self.b = records.meta["b"]
+        self._avg_length = records.meta["avg_length"]
+        self._offsets = records.array("offsets")
+        self._rows = records.array("rows")
+        self._tfs = records.array("tfs")
+        self._lengths = records.array("lengths")
+        self.vocabulary: Dict[str, int] = {
+            token: position for position, token in enumerate(records.column("token"))
+        }
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @staticmethod
+    def build(
+        texts: Sequence[str],
+        path: Path,
+        k1: float = 1.2,
+        b: float = 0.75
+    ) -> Path:
+        """
+        Build and write an inverted index; row i indexes texts[i].
+
+        Args:
+            texts: Document texts in record order.
+            path: Output file path.
+            k1: BM25 term frequency saturation.
+            b: BM25 length normalization.
+
+        Returns:
+            Path to the written file.
+        """
+        # Collect (token, row, tf) triples in typed buffers rather than
+        # per-posting Python objects, then sort them term-major
+        token_ids: Dict[str, int] = {}
+        posting_tokens, posting_rows, posting_tfs = array("i"), array("i"), array("f")
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths[row] = sum(counts.values())
+            for token, tf in counts.items():
+                posting_tokens.append(token_ids.setdefault(token, len(token_ids)))
+                posting_rows.append(row)
+                posting_tfs.append(tf)
+
+        vocabulary = sorted(token_ids)
+        rank = np.empty(len(vocabulary), dtype=np.int32)
+        rank[[token_ids[token] for token in vocabulary]] = np.arange(len(vocabulary), dtype=np.int32)
+        del token_ids
+
+        positions = rank[np.frombuffer(posting_tokens, dtype=np.int32)]
+        order = np.argsort(positions, kind="stable")
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(positions, minlength=len(vocabulary)), out=offsets[1:])
+        rows = np.frombuffer(posting_rows, dtype=np.int32)[order]
+        tfs = np.frombuffer(posting_tfs, dtype=np.float32)[order]
+
+        return ColumnarRecords.write(
+            path,
+            {"token": vocabulary},
+            arrays={"offsets": offsets, "rows": rows, "tfs": tfs, "lengths": lengths},
+            meta={
+                "k1": k1,
+                "b": b,
+                "avg_length": float(lengths.mean()) if len(texts) else 0.0,
+            }
+        )
+
+    @classmethod
+    def load(cls, persist_dir: Path, mmap: bool = True) -> "LexicalIndex":
+        """
+        Load the inverted index stored in an index directory.
+
+        Args:
+            persist_dir: Index directory or snapshot root.
+            mmap: Memory-map the postings.
+
+        Returns:
+            LexicalIndex instance.
+
+        Raises:
+            FileNotFoundError: If the index has no lexical file.
+        """
+        path = resolve_index_dir(persist_dir) / LEXICAL_FILE
+        if not path.exists():
+            raise FileNotFoundError(f"Lexical index not found: {path}")
+        return cls(ColumnarRecords.load(path, mmap=mmap))
+
+    def search(self, query: str, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score rows against a query with BM25.
+
+        Args:
+            query: Query text.
+            top_k: Number of results.
+
+        Returns:
+            Tuple of (scores, rows), best first. Only rows sharing at least
+            one token with the query are returned.
+        """
+        n_docs = len(self)
+        row_parts, score_parts = [], []
+        for token in set(tokenize(query)):
+            position = self.vocabulary.get(token)
+            if position is None:
+                continue
+            start, end = self._offsets[position], self._offsets[position + 1]
+            rows = self._rows[start:end]
+            tfs = self._tfs[start:end]
+            df = end - start
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self._lengths[rows] / self._avg_length)
+            row_parts.append(rows)
+            score_parts.append(idf * tfs * (self.k1 + 1.0) / (tfs + norm))
+
+        if not row_parts:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+        rows, inverse = np.unique(np.concatenate(row_parts), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+        if len(rows) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            best = np.arange(len(rows))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return scores[best].astype(np.float32), rows[best].astype(np.int64)
@@ -0,0 +1,194 @@
+"""Multi-Process Embedding Stage for SuperStream RAG System."""
+
+import math
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ingest.embedding_backends import create_embedding_model
+from ingest.profiling import span
+
+# Thread pools of the numeric libraries, read when they are first imported
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# Embedding model loaded once per worker process by _init_worker
+_worker_model: Any = None
+
+
+def _init_worker(
+    model_name: str,
+    model_type: str,
+    model_kwargs: Dict[str, Any],
+    threads: int
+) -> None:
+    global _worker_model
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    _worker_model = create_embedding_model(model_name, model_type=model_type, **model_kwargs)
+    # Backends may size torch's pool to every core; split the cores instead
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+def _embed_dimension() -> int:
+    return len(_worker_model.get_text_embedding("dimension"))
+
+
+def _embed_into(path: str, start: int, texts: List[str]) -> int:
+    embeddings = np.asarray(_worker_model.get_text_embedding_batch(texts), dtype=np.float32)
+    output = np.load(path, mmap_mode="r+")
+    output[start:start + len(texts)] = embeddings
+    output.flush()
+    del output
+    return len(texts)
+
+
+class ParallelEmbedder:
+    """
+    Embeds texts across worker processes into a shared memory-mapped array.
+
+    Each worker loads the embedding model once and gets an equal share of
+    the cores. Texts are cut into contiguous chunks (several per worker,
+    so a slow chunk does not idle the others); a worker embeds a chunk and
+    writes the vectors straight into rows ``start:start + len(chunk)`` of
+    a temporary .npy file. Row positions are fixed before any work starts,
+    so the output order is the input order no matter which worker
+    finishes first, and vectors never travel back through a pipe.
+
+    Meant for local models (HuggingFace), which are CPU-bound in a single
+    process; API backends are better served by AsyncBatchEmbedder.
+
+    Attributes:
+        model_name: Embedding model name.
+        model_type: Registered embedding backend name.
+        workers: Number of worker processes.
+        threads_per_worker: Intra-op threads given to each worker.
+        chunks_per_worker: Chunks each worker gets per call, on average.
+        last_stats: Throughput statistics of the most recent run.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_type: str,
+        workers: int,
+        threads_per_worker: Optional[int] = None,
+        chunks_per_worker: int = 4,
+        model_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize parallel embedder. Workers start on first use.
+
+        Args:
+            model_name: Embedding model name.
+            model_type: Registered embedding backend name.
+            workers: Number of worker processes.
+            threads_per_worker: Intra-op threads per worker. Defaults to
+                                the cores divided evenly among workers.
+            chunks_per_worker: Chunks each worker gets per call, on average.
+            model_kwargs: Extra keyword arguments for create_embedding_model.
+
+        Raises:
+            ValueError: If workers or chunks_per_worker is not positive.
+        """
+        if workers <= 0 or chunks_per_worker <= 0:
+            raise ValueError("workers and chunks_per_worker must be positive")
+
+        self.model_name = model_name
+        self.model_type = model_type
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        self.chunks_per_worker = chunks_per_worker
+        self.model_kwargs = model_kwargs or {}
+        self.last_stats: Dict[str, float] = {}
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dimension: Optional[int] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned rather than forked: torch's thread pools do not survive fork
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.model_type, self.model_kwargs, self.threads_per_worker)
+            )
+        return self._pool
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts across the worker processes, preserving input order.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            Embeddings aligned with ``texts``.
+        """
+        if not texts:
+            return []
+
+        pool = self._executor()
+        start_time = time.perf_counter()
+        if self._dimension is None:
+            with span("embedding_workers_start", workers=self.workers):
+                self._dimension = pool.submit(_embed_dimension).result()
+
+        chunk_size = math.ceil(len(texts) / (self.workers * self.chunks_per_worker))
+        starts = range(0, len(texts), chunk_size)
+
+        spool_dir = Path(tempfile.mkdtemp(prefix="superstream_embed_"))
+        try:
+            path = str(spool_dir / "vectors.npy")
+            output = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float32, shape=(len(texts), self._dimension)
+            )
+            del output
+
+            with span("embedding_workers", items=len(texts), workers=self.workers, chunks=len(starts)):
+                futures = [
+                    pool.submit(_embed_into, path, start, texts[start:start + chunk_size])
+                    for start in starts
+                ]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    # Let running chunks finish before their file is removed
+                    for future in futures:
+                        future.cancel()
+                    wait(futures)
+                    raise
+            embeddings = np.load(path).tolist()
+        finally:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+        elapsed = time.perf_counter() - start_time
+        self.last_stats = {
+            "texts": len(texts),
+            "chunks": len(starts),
+            "workers": self.workers,
+            "seconds": elapsed,
+            "texts_per_second": len(texts) / elapsed if elapsed else 0.0,
+        }
+        print(
+            f"Embedded {len(texts)} texts in {len(starts)} chunks across {self.workers} workers "
+            f"({elapsed:.2f}s, {self.last_stats['texts_per_second']:.1f} texts/s)"
+        )
+        return embeddings
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
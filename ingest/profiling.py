@@ -0,0 +1,370 @@
+"""Pipeline Timing and Profiling Spans for SuperStream RAG System."""
+
+import cProfile
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+# Comma-separated extra captures, e.g. SUPERSTREAM_PROFILE=cprofile,tracemalloc
+PROFILE_ENV_VAR = "SUPERSTREAM_PROFILE"
+CAPTURE_OPTIONS = ("cprofile", "tracemalloc")
+
+# Stack of open spans for the current thread or asyncio task
+_active_spans: contextvars.ContextVar[Tuple["Span", ...]] = contextvars.ContextVar(
+    "superstream_active_spans", default=()
+)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Return the peak resident set size of this process so far.
+
+    Returns:
+        Peak RSS in MiB, or None where the resource module is unavailable.
+    """
+    if not HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def parse_capture(value: Optional[str]) -> List[str]:
+    """
+    Parse the capture list from the environment variable value.
+
+    Args:
+        value: Comma-separated capture names ("1"/"all" enables all).
+
+    Returns:
+        Enabled capture names.
+    """
+    names = [name.strip().lower() for name in (value or "").split(",") if name.strip()]
+    if any(name in ("1", "all", "true") for name in names):
+        return list(CAPTURE_OPTIONS)
+    return [name for name in names if name in CAPTURE_OPTIONS]
+
+
+@dataclass
+class Span:
+    """
+    One timed pipeline stage.
+
+    Attributes:
+        name: Stage name.
+        start: Start time in seconds, relative to the profiler start.
+        wall_seconds: Elapsed wall time.
+        cpu_seconds: Process CPU time consumed (all threads).
+        peak_rss_mb: Process peak RSS when the span ended.
+        rss_growth_mb: Increase of the peak RSS during the span.
+        items: Number of items processed, if known.
+        depth: Nesting depth (0 for top-level spans).
+        parent: Name of the enclosing span.
+        thread_id: Thread that ran the span.
+        traced_peak_mb: Peak Python heap during the span (tracemalloc only).
+        attributes: Extra values attached by the caller.
+    """
+
+    name: str
+    start: float = 0.0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    rss_growth_mb: Optional[float] = None
+    items: Optional[int] = None
+    depth: int = 0
+    parent: Optional[str] = None
+    thread_id: int = 0
+    traced_peak_mb: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    _traced_peak: int = field(default=0, repr=False)
+
+    @property
+    def items_per_second(self) -> Optional[float]:
+        """Throughput, if an item count was recorded."""
+        if self.items is None or self.wall_seconds <= 0:
+            return None
+        return self.items / self.wall_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the span as a JSON-serializable dictionary."""
+        data = {key: value for key, value in asdict(self).items() if not key.startswith("_")}
+        data["items_per_second"] = self.items_per_second
+        return data
+
+
+class Profiler:
+    """
+    Records nested timing spans for pipeline stages.
+
+    Spans always record wall time, CPU time, peak RSS and item counts; the
+    overhead is a few microseconds per span. Setting SUPERSTREAM_PROFILE to
+    "cprofile" and/or "tracemalloc" additionally captures a cProfile of all
+    top-level spans and the Python heap peak of every span.
+
+    Attributes:
+        spans: Finished spans in completion order.
+        capture: Enabled extra captures.
+    """
+
+    def __init__(self, capture: Optional[List[str]] = None):
+        """
+        Initialize profiler.
+
+        Args:
+            capture: Extra captures to enable. Defaults to the value of the
+                     SUPERSTREAM_PROFILE environment variable.
+        """
+        if capture is None:
+            capture = parse_capture(os.environ.get(PROFILE_ENV_VAR))
+        self.capture = capture
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._cprofile = cProfile.Profile() if "cprofile" in capture else None
+        self._cprofile_depth = 0
+
+    def reset(self) -> None:
+        """Discard recorded spans and profiles."""
+        with self._lock:
+            self.spans = []
+            self._origin = time.perf_counter()
+            if self._cprofile is not None:
+                self._cprofile = cProfile.Profile()
+
+    @contextmanager
+    def span(self, name: str, items: Optional[int] = None, **attributes: Any) -> Iterator[Span]:
+        """
+        Time a block of code.
+
+        The yielded span may be updated inside the block, e.g. to set
+        ``items`` once the count is known.
+
+        Args:
+            name: Stage name.
+            items: Number of items processed, if known up front.
+            **attributes: Extra values stored with the span.
+
+        Yields:
+            The open Span.
+        """
+        stack = _active_spans.get()
+        span = Span(
+            name=name,
+            items=items,
+            depth=len(stack),
+            parent=stack[-1].name if stack else None,
+            thread_id=threading.get_ident(),
+            attributes=attributes
+        )
+        token = _active_spans.set(stack + (span,))
+
+        tracing = "tracemalloc" in self.capture
+        if tracing:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if stack:
+                stack[-1]._traced_peak = max(stack[-1]._traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        self._start_cprofile()
+        rss_before = peak_rss_mb()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.wall_seconds = time.perf_counter() - wall_start
+            span.cpu_seconds = time.process_time() - cpu_start
+            span.start = wall_start - self._origin
+            span.peak_rss_mb = peak_rss_mb()
+            if rss_before is not None:
+                span.rss_growth_mb = span.peak_rss_mb - rss_before
+            self._stop_cprofile()
+
+            if tracing:
+                span._traced_peak = max(span._traced_peak, tracemalloc.get_traced_memory()[1])
+                span.traced_peak_mb = span._traced_peak / (1024 * 1024)
+                if stack:
+                    stack[-1]._traced_peak = max(stack[-1]._traced_peak, span._traced_peak)
+
+            _active_spans.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def _start_cprofile(self) -> None:
+        # Only one cProfile can be active, so profile from the outermost span
+        if self._cprofile is None:
+            return
+        with self._lock:
+            self._cprofile_depth += 1
+            if self._cprofile_depth == 1:
+                try:
+                    self._cprofile.enable()
+                except ValueError:
+                    # Another profiler is already active in this process
+                    pass
+
+    def _stop_cprofile(self) -> None:
+        if self._cprofile is None:
+            return
+        with self._lock:
+            self._cprofile_depth -= 1
+            if self._cprofile_depth == 0:
+                self._cprofile.disable()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate spans by name.
+
+        Returns:
+            One row per span name with count, total wall/CPU seconds, items,
+            throughput and the highest peak RSS, in first-seen order.
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for span in sorted(self.spans, key=lambda s: s.start):
+            row = rows.setdefault(span.name, {
+                "name": span.name,
+                "depth": span.depth,
+                "count": 0,
+                "wall_seconds": 0.0,
+                "cpu_seconds": 0.0,
+                "items": None,
+                "peak_rss_mb": None,
+            })
+            row["count"] += 1
+            row["wall_seconds"] += span.wall_seconds
+            row["cpu_seconds"] += span.cpu_seconds
+            if span.items is not None:
+                row["items"] = (row["items"] or 0) + span.items
+            if span.peak_rss_mb is not None:
+                row["peak_rss_mb"] = max(row["peak_rss_mb"] or 0.0, span.peak_rss_mb)
+
+        for row in rows.values():
+            row["items_per_second"] = (
+                row["items"] / row["wall_seconds"]
+                if row["items"] is not None and row["wall_seconds"] > 0 else None
+            )
+        return list(rows.values())
+
+    def print_summary(self) -> None:
+        """Print the aggregated spans as a table."""
+        if not self.spans:
+            return
+        print(f"\n{'Stage':<32}{'count':>7}{'wall s':>10}{'cpu s':>10}{'items/s':>12}{'peak MB':>10}")
+        for row in self.summary():
+            name = "  " * row["depth"] + row["name"]
+            rate = f"{row['items_per_second']:,.0f}" if row["items_per_second"] is not None else "-"
+            peak = f"{row['peak_rss_mb']:.0f}" if row["peak_rss_mb"] is not None else "-"
+            print(
+                f"{name:<32}{row['count']:>7}{row['wall_seconds']:>10.3f}"
+                f"{row['cpu_seconds']:>10.3f}{rate:>12}{peak:>10}"
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return capture settings, the summary and all spans."""
+        return {
+            "capture": self.capture,
+            "summary": self.summary(),
+            "spans": [span.to_dict() for span in sorted(self.spans, key=lambda s: s.start)],
+        }
+
+    def trace_events(self) -> Dict[str, Any]:
+        """
+        Convert spans to the Chrome trace-event format.
+
+        The result can be opened in chrome://tracing or Perfetto.
+
+        Returns:
+            Dictionary with a "traceEvents" list of complete ("X") events.
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            args = {
+                key: value for key, value in span.to_dict().items()
+                if key not in ("name", "start", "wall_seconds", "thread_id", "attributes")
+                and value is not None
+            }
+            args.update(span.attributes)
+            events.append({
+                "name": span.name,
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.wall_seconds * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": sorted(events, key=lambda event: event["ts"])}
+
+    def export(self, output_dir: Path, prefix: str = "profile") -> List[Path]:
+        """
+        Write the profile to a directory.
+
+        Writes ``<prefix>.json`` (summary and spans), ``<prefix>.trace.json``
+        (trace events) and, when cProfile capture is enabled,
+        ``<prefix>.prof`` (loadable with pstats or snakeviz).
+
+        Args:
+            output_dir: Output directory, created if missing.
+            prefix: File name prefix.
+
+        Returns:
+            Paths of the written files.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        paths = [output_dir / f"{prefix}.json", output_dir / f"{prefix}.trace.json"]
+        with open(paths[0], "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        with open(paths[1], "w", encoding="utf-8") as f:
+            json.dump(self.trace_events(), f, default=str)
+
+        if self._cprofile is not None:
+            paths.append(output_dir / f"{prefix}.prof")
+            self._cprofile.dump_stats(str(paths[-1]))
+        return paths
+
+
+_profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    """Return the process-wide profiler used by the pipeline."""
+    return _profiler
+
+
+def span(name: str, items: Optional[int] = None, **attributes: Any):
+    """
+    Time a block of code with the process-wide profiler.
+
+    Example::
+
+        with span("embed", items=len(texts)):
+            vectors = embedder.embed(texts)
+
+    Args:
+        name: Stage name.
+        items: Number of items processed, if known up front.
+        **attributes: Extra values stored with the span.
+
+    Returns:
+        Context manager yielding the open Span.
+    """
+    return _profiler.span(name, items=items, **attributes)
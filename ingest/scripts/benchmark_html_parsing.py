@@ -0,0 +1,123 @@
+"""Benchmark Full-Tree vs Table-Only HTML Glossary Parsing."""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from ingest.glossary_extractor import GlossaryExtractor, HAS_LXML
+
+
+def time_parser(
+    parse: Callable[[Path], Dict[str, str]],
+    html_files: List[Path],
+    repeat: int
+) -> Dict[str, float]:
+    """
+    Time a parsing function over a set of files.
+
+    Args:
+        parse: Function returning the term dictionary for one file.
+        html_files: HTML files to parse.
+        repeat: Number of passes over all files.
+
+    Returns:
+        Dictionary with best pass time, per-file time and throughput.
+    """
+    total_bytes = sum(path.stat().st_size for path in html_files)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in html_files:
+            parse(path)
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        "seconds": best,
+        "ms_per_file": best * 1000 / len(html_files),
+        "mb_per_second": total_bytes / best / 1e6 if best else 0.0,
+    }
+
+
+def run_benchmark(html_files: List[Path], repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Compare the full BeautifulSoup path with the table-only parsers.
+
+    Args:
+        html_files: HTML files to parse.
+        repeat: Number of passes over all files (best pass is reported).
+
+    Returns:
+        Timing results keyed by parser name.
+
+    Raises:
+        ValueError: If a fast parser returns different terms than the full parser.
+    """
+    extractor = GlossaryExtractor()
+
+    parsers = {
+        "full_tree": lambda path: extractor.extract_from_html(path)["records"].terms(),
+        "strainer": lambda path: dict(extractor.iter_terms(path, parser="strainer")),
+    }
+    if HAS_LXML:
+        parsers["lxml_iterparse"] = lambda path: dict(extractor.iter_terms(path, parser="lxml"))
+
+    # Fast paths must produce exactly what the full parser produces
+    for path in html_files:
+        expected = parsers["full_tree"](path)
+        for name, parse in parsers.items():
+            if parse(path) != expected:
+                raise ValueError(f"{name} output differs from full_tree for {path}")
+
+    return {
+        name: time_parser(parse, html_files, repeat)
+        for name, parse in parsers.items()
+    }
+
+
+def main():
+    """Main entry point for the HTML parsing benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark full-tree vs table-only glossary HTML parsing"
+    )
+    parser.add_argument(
+        "source",
+        type=Path,
+        help="HTML file or directory of HTML files"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of timed passes (best is reported)"
+    )
+    args = parser.parse_args()
+
+    if args.source.is_dir():
+        html_files = sorted(args.source.rglob("*.html"))
+    else:
+        html_files = [args.source]
+
+    if not html_files:
+        print(f"[WARNING] No HTML files found in {args.source}")
+        return
+
+    print("=" * 70)
+    print("HTML Glossary Parsing Benchmark")
+    print("=" * 70)
+    print(f"\nFiles: {len(html_files)}, repeat: {args.repeat}")
+
+    results = run_benchmark(html_files, repeat=args.repeat)
+    baseline = results["full_tree"]["seconds"]
+
+    print(f"\n{'Parser':<16}{'ms/file':>12}{'MB/s':>10}{'speedup':>10}")
+    for name, result in results.items():
+        speedup = baseline / result["seconds"] if result["seconds"] else 0.0
+        print(
+            f"{name:<16}{result['ms_per_file']:>12.2f}"
+            f"{result['mb_per_second']:>10.2f}{speedup:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
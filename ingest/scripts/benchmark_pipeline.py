@@ -0,0 +1,478 @@
+"""End-to-End Benchmark for the SuperStream Glossary Pipeline."""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import faiss
+import numpy as np
+
+from ingest.faiss_index import (
+    INDEX_TYPES,
+    QUANTIZATION_TYPES,
+    FaissIndexConfig,
+    create_faiss_index,
+    train_faiss_index,
+)
+from ingest.fake_embedding import hash_embedding
+from ingest.glossary_extractor import GlossaryExtractor
+from ingest.index_store import (
+    FULL_VECTORS_FILE,
+    RECORDS_FILE,
+    VECTOR_STORE_FILE,
+    ColumnarRecords,
+    CompactIndex,
+    save_full_vectors,
+)
+from ingest.lexical_index import LEXICAL_FILE, LexicalIndex
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Metrics checked against a baseline run: (section, metric, higher is better)
+REGRESSION_METRICS = (
+    ("extraction", "terms_per_second", True),
+    ("embedding", "texts_per_second", True),
+    ("build", "seconds", False),
+    ("disk", "bytes_per_vector", False),
+    ("load", "compact_ms", False),
+    ("query", "p95_ms", False),
+    ("query", "recall_at_k", True),
+    ("lexical", "p95_ms", False),
+)
+
+SYLLABLES = (
+    "ab", "ac", "ad", "al", "an", "ar", "be", "ca", "co", "de", "di", "en",
+    "er", "fi", "fu", "ga", "in", "io", "la", "le", "lo", "ma", "me", "mo",
+    "na", "ne", "no", "or", "pa", "pe", "ra", "re", "ri", "ro", "sa", "se",
+    "si", "so", "ta", "te", "ti", "to", "tr", "un", "va", "ve", "vi", "za",
+)
+
+
+def synthetic_glossary(n_terms: int, seed: int = 0) -> Dict[str, str]:
+    """
+    Generate a deterministic synthetic glossary.
+
+    Terms are two to four pseudo-words, a fifth of them followed by an
+    acronym as in "Unique Superannuation Identifier (USI)"; definitions are
+    12-30 words drawn from a Zipf-like vocabulary so that lexical and vector
+    search behave like they do on real text.
+
+    Args:
+        n_terms: Number of terms.
+        seed: Random seed.
+
+    Returns:
+        Dictionary mapping term to definition.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = list(rng.permutation(sorted({
+        "".join(rng.choice(SYLLABLES, size=rng.integers(2, 5)))
+        for _ in range(20_000)
+    })))
+    cumulative = np.cumsum(1.0 / np.arange(1, len(vocabulary) + 1))
+    cumulative /= cumulative[-1]
+
+    glossary: Dict[str, str] = {}
+    while len(glossary) < n_terms:
+        words = [vocabulary[i].capitalize() for i in rng.integers(0, len(vocabulary), rng.integers(2, 5))]
+        term = " ".join(words)
+        if rng.random() < 0.2:
+            term += f" ({''.join(word[0] for word in words).upper()})"
+        if term in glossary:
+            term = f"{term} {len(glossary)}"
+        words = np.searchsorted(cumulative, rng.random(rng.integers(12, 31)))
+        glossary[term] = " ".join(vocabulary[i] for i in words).capitalize() + "."
+    return glossary
+
+
+def write_glossary_html(glossary: Dict[str, str], path: Path) -> Path:
+    """
+    Write a glossary as an HTML table in the layout of the official pages.
+
+    Args:
+        glossary: Term to definition mapping.
+        path: Output HTML file.
+
+    Returns:
+        Path to the written file.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<html><body><table>\n<tr><th>Term</th><th>Definition</th></tr>\n")
+        for term, definition in glossary.items():
+            f.write(f"<tr><td>{escape(term)}</td><td>{escape(definition)}</td></tr>\n")
+        f.write("</table></body></html>\n")
+    return path
+
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples in seconds as milliseconds percentiles.
+
+    Args:
+        samples: Latencies in seconds.
+
+    Returns:
+        Dictionary with mean, p50, p95 and p99 in milliseconds.
+    """
+    ms = np.asarray(samples) * 1000
+    return {
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def benchmark_size(
+    n_terms: int,
+    work_dir: Path,
+    index_config: FaissIndexConfig,
+    dimension: int = 256,
+    n_queries: int = 200,
+    top_k: int = 10,
+    seed: int = 0,
+    rerank_factor: int = 0
+) -> Dict[str, Any]:
+    """
+    Run every pipeline stage on a synthetic glossary of one size.
+
+    Args:
+        n_terms: Number of glossary terms.
+        work_dir: Scratch directory for the HTML file and index files.
+        index_config: FAISS index configuration.
+        dimension: Embedding dimension of the offline embedding.
+        n_queries: Number of timed queries.
+        top_k: Neighbours per query, also the k of recall@k.
+        seed: Random seed for data generation and query sampling.
+        rerank_factor: When > 1, store full-precision vectors and rerank
+                       top_k * rerank_factor candidates at query time.
+
+    Returns:
+        Nested dictionary of metrics for this size.
+    """
+    result: Dict[str, Any] = {"n_terms": n_terms}
+    glossary = synthetic_glossary(n_terms, seed)
+    terms = list(glossary)
+
+    # HTML extraction
+    html_path = write_glossary_html(glossary, work_dir / "glossary.html")
+    extractor = GlossaryExtractor()
+    start = time.perf_counter()
+    extracted = dict(extractor.iter_terms(html_path))
+    seconds = time.perf_counter() - start
+    if len(extracted) != n_terms:
+        raise ValueError(f"Extracted {len(extracted)} of {n_terms} terms")
+    result["extraction"] = {
+        "seconds": seconds,
+        "terms_per_second": n_terms / seconds,
+        "mb_per_second": html_path.stat().st_size / seconds / 1e6,
+    }
+
+    # Embedding
+    texts = [f"{term}: {definition}" for term, definition in glossary.items()]
+    start = time.perf_counter()
+    vectors = np.empty((n_terms, dimension), dtype="float32")
+    for row, text in enumerate(texts):
+        vectors[row] = hash_embedding(text, dimension)
+    seconds = time.perf_counter() - start
+    result["embedding"] = {
+        "seconds": seconds,
+        "texts_per_second": n_terms / seconds,
+        "dimension": dimension,
+    }
+
+    # FAISS build
+    start = time.perf_counter()
+    index = create_faiss_index(dimension, n_terms, index_config)
+    train_faiss_index(index, vectors, index_config, seed)
+    index.add_with_ids(vectors, np.arange(n_terms, dtype=np.int64))
+    seconds = time.perf_counter() - start
+    result["build"] = {
+        "index_type": type(faiss.downcast_index(index.index)).__name__,
+        "seconds": seconds,
+        "vectors_per_second": n_terms / seconds,
+    }
+
+    # Persist in the compact query format
+    index_dir = work_dir / "index"
+    index_dir.mkdir(exist_ok=True)
+    start = time.perf_counter()
+    faiss.write_index(index, str(index_dir / VECTOR_STORE_FILE))
+    meta = {"embedding_model": "hash-embedding", "dimension": dimension, "count": n_terms}
+    if rerank_factor > 1:
+        save_full_vectors(index_dir, vectors)
+        meta["rerank_factor"] = rerank_factor
+    ColumnarRecords.write(
+        index_dir / RECORDS_FILE,
+        {"term": terms, "definition": list(glossary.values()), "text": texts},
+        arrays={"faiss_ids": np.arange(n_terms, dtype=np.int64)},
+        meta=meta
+    )
+    save_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    LexicalIndex.build(texts, index_dir / LEXICAL_FILE)
+    lexical_build_seconds = time.perf_counter() - start
+    vector_bytes = (index_dir / VECTOR_STORE_FILE).stat().st_size
+    full_vectors_path = index_dir / FULL_VECTORS_FILE
+    result["disk"] = {
+        "save_seconds": save_seconds,
+        "vector_bytes": vector_bytes,
+        "bytes_per_vector": vector_bytes / n_terms,
+        "compression_ratio": dimension * 4 * n_terms / vector_bytes,
+        "full_vectors_bytes": full_vectors_path.stat().st_size if full_vectors_path.exists() else 0,
+        "records_bytes": (index_dir / RECORDS_FILE).stat().st_size,
+        "lexical_bytes": (index_dir / LEXICAL_FILE).stat().st_size,
+    }
+    del index
+
+    # Load
+    start = time.perf_counter()
+    compact = CompactIndex.load(index_dir)
+    compact_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    lexical = LexicalIndex.load(index_dir)
+    lexical_ms = (time.perf_counter() - start) * 1000
+    result["load"] = {"compact_ms": compact_ms, "lexical_ms": lexical_ms}
+
+    # Query latency and recall against exact search. Queries are the
+    # definitions of sampled terms: literal term lookups never reach FAISS
+    # (see GlossaryRetriever), descriptive queries do
+    rng = np.random.default_rng(seed + 1)
+    sample = rng.choice(n_terms, size=min(n_queries, n_terms), replace=False)
+    queries = [glossary[terms[i]] for i in sample]
+    query_vectors = np.array([hash_embedding(query, dimension) for query in queries], dtype="float32")
+    k = min(top_k, n_terms)
+
+    latencies, approx_rows = [], []
+    for vector in query_vectors:
+        start = time.perf_counter()
+        _, rows = compact.search(vector, k)
+        latencies.append(time.perf_counter() - start)
+        approx_rows.append(rows[0])
+
+    # A result counts as correct if it is no further than the exact k-th
+    # neighbour, so ties between equidistant vectors are not penalized
+    exact = faiss.IndexFlatL2(dimension)
+    exact.add(vectors)
+    exact_distances, _ = exact.search(query_vectors, k)
+    recall = np.mean([
+        np.sum(((vectors[found[found >= 0]] - query) ** 2).sum(axis=1) <= kth + 1e-5) / k
+        for found, query, kth in zip(approx_rows, query_vectors, exact_distances[:, -1])
+    ])
+    result["query"] = dict(latency_summary(latencies), recall_at_k=float(recall), k=k)
+
+    lexical_latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        lexical.search(query, k)
+        lexical_latencies.append(time.perf_counter() - start)
+    result["lexical"] = dict(latency_summary(lexical_latencies), build_seconds=lexical_build_seconds)
+
+    return result
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.2
+) -> List[str]:
+    """
+    Compare two benchmark reports and list regressions.
+
+    Args:
+        current: Report from this run.
+        baseline: Earlier report to compare against.
+        tolerance: Allowed relative change before a metric counts as regressed.
+
+    Returns:
+        Human-readable descriptions of regressed metrics.
+    """
+    baseline_by_size = {result["n_terms"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        previous = baseline_by_size.get(result["n_terms"])
+        if previous is None:
+            continue
+        for section, metric, higher_is_better in REGRESSION_METRICS:
+            old = previous.get(section, {}).get(metric)
+            new = result.get(section, {}).get(metric)
+            if old is None or new is None or old == 0:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(
+                    f"n={result['n_terms']} {section}.{metric}: "
+                    f"{old:.4g} -> {new:.4g} ({change:+.0%})"
+                )
+    return regressions
+
+
+def run_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    index_config: Optional[FaissIndexConfig] = None,
+    dimension: int = 256,
+    n_queries: int = 200,
+    top_k: int = 10,
+    seed: int = 0,
+    work_dir: Optional[Path] = None,
+    rerank_factor: int = 0
+) -> Dict[str, Any]:
+    """
+    Benchmark the pipeline across glossary sizes.
+
+    Args:
+        sizes: Glossary sizes to benchmark.
+        index_config: FAISS index configuration. Defaults to "auto".
+        dimension: Embedding dimension.
+        n_queries: Number of timed queries per size.
+        top_k: Neighbours per query.
+        seed: Random seed.
+        work_dir: Scratch directory. A temporary directory is used and
+                  removed when not given.
+        rerank_factor: Full-precision rerank factor (0 disables).
+
+    Returns:
+        Report with environment, configuration and per-size results.
+    """
+    index_config = index_config or FaissIndexConfig()
+    report: Dict[str, Any] = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "faiss": faiss.__version__,
+            "numpy": np.__version__,
+        },
+        "config": {
+            "sizes": list(sizes),
+            "dimension": dimension,
+            "n_queries": n_queries,
+            "top_k": top_k,
+            "seed": seed,
+            "index": vars(index_config),
+            "rerank_factor": rerank_factor,
+        },
+        "results": [],
+    }
+
+    scratch = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix="superstream_bench_"))
+    try:
+        for n_terms in sizes:
+            print(f"\n[Benchmark] {n_terms:,} terms...")
+            size_dir = scratch / str(n_terms)
+            size_dir.mkdir(parents=True, exist_ok=True)
+            result = benchmark_size(
+                n_terms, size_dir, index_config, dimension, n_queries, top_k, seed,
+                rerank_factor
+            )
+            report["results"].append(result)
+            print(
+                f"[OK] extract {result['extraction']['terms_per_second']:,.0f} terms/s, "
+                f"embed {result['embedding']['texts_per_second']:,.0f} texts/s, "
+                f"build {result['build']['seconds']:.2f}s, "
+                f"{result['disk']['bytes_per_vector']:,.0f} B/vector, "
+                f"query p95 {result['query']['p95_ms']:.3f} ms, "
+                f"recall@{result['query']['k']} {result['query']['recall_at_k']:.3f}"
+            )
+            if not work_dir:
+                shutil.rmtree(size_dir, ignore_errors=True)
+    finally:
+        if not work_dir:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    return report
+
+
+def main():
+    """Main entry point for the pipeline benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark extraction, indexing and query latency on synthetic glossaries"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(float(size)) for size in value.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="Comma-separated glossary sizes (default: 1e2,1e3,1e4,1e5,1e6)"
+    )
+    parser.add_argument("--dimension", type=int, default=256, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Timed queries per size")
+    parser.add_argument("--top-k", type=int, default=10, help="Neighbours per query (k of recall@k)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--index-type",
+        choices=INDEX_TYPES,
+        default="auto",
+        help="FAISS index family (default: auto by corpus size)"
+    )
+    parser.add_argument("--ef-search", type=int, default=64, help="HNSW efSearch")
+    parser.add_argument("--nprobe", type=int, default=16, help="IVF cells visited per query")
+    parser.add_argument(
+        "--quantization",
+        choices=QUANTIZATION_TYPES,
+        default="none",
+        help="Vector storage inside the index (fp16/int8 scalar or PQ)"
+    )
+    parser.add_argument(
+        "--rerank-factor",
+        type=int,
+        default=0,
+        help="Rerank top_k*N candidates with full-precision vectors (0 disables)"
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON report to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative change allowed before a metric counts as a regression"
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("SuperStream Pipeline Benchmark")
+    print("=" * 70)
+
+    report = run_benchmark(
+        sizes=args.sizes,
+        index_config=FaissIndexConfig(
+            index_type=args.index_type,
+            ef_search=args.ef_search,
+            nprobe=args.nprobe,
+            quantization=args.quantization
+        ),
+        dimension=args.dimension,
+        n_queries=args.queries,
+        top_k=args.top_k,
+        seed=args.seed,
+        rerank_factor=args.rerank_factor
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output, encoding="utf-8")
+        print(f"\n[OK] Report saved to: {args.output}")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_results(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n[WARNING] {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\n[SUCCESS] No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Build a Sharded Glossary Index Collection, One Shard per Source."""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.faiss_index import INDEX_TYPES, QUANTIZATION_TYPES, FaissIndexConfig
+from ingest.glossary_extractor import GlossaryExtractor
+from ingest.index_store import RECORDS_FILE, ColumnarRecords
+from ingest.shards import ShardManifest, group_by_shard
+from ingest.snapshots import DEFAULT_RETAIN, resolve_index_dir
+from ingest.scripts.glossary_to_faiss import create_glossary_faiss_index
+from config import DATA_DIR, EMBEDDING_MODEL
+
+DEFAULT_COLLECTION_DIR = DATA_DIR / "indices" / "superstream_collection"
+
+
+def build_shards(
+    source_dir: Path,
+    collection_dir: Path = DEFAULT_COLLECTION_DIR,
+    shards: Optional[List[str]] = None,
+    embedding_model: str = EMBEDDING_MODEL,
+    workers: int = 1,
+    fast: bool = False,
+    incremental: bool = False,
+    prune: bool = False,
+    dedup: bool = True,
+    dedup_threshold: float = 0.85,
+    index_config: Optional[FaissIndexConfig] = None,
+    rerank_factor: int = 0,
+    keep_snapshots: int = DEFAULT_RETAIN
+) -> ShardManifest:
+    """
+    Extract and index each source directory as its own shard.
+
+    HTML files are grouped by their top-level directory under
+    ``source_dir``; each group is extracted (see
+    GlossaryExtractor.extract_multiple) and indexed into
+    ``collection_dir/<shard>``, each published as a new snapshot of that
+    shard. Only the requested shards are rebuilt, and
+    the manifest is saved after every shard, so the other shards and any
+    already finished ones are never touched.
+
+    Args:
+        source_dir: Root directory of the HTML sources.
+        collection_dir: Collection directory holding shards and manifest.
+        shards: Shard names to (re)build. Defaults to every shard found.
+        embedding_model: Embedding model, shared by all shards.
+        workers: Worker processes for extraction.
+        fast: Use the table-only streaming parser.
+        incremental: Start from each shard's current snapshot, embedding
+                     only added and changed terms.
+        prune: Remove registered shards that no longer have any sources.
+        dedup: Collapse exact and near-duplicate terms before embedding.
+        dedup_threshold: Minimum Jaccard similarity for a near-duplicate.
+        index_config: FAISS index configuration for every shard.
+        rerank_factor: Full-precision rerank factor (0 disables).
+        keep_snapshots: Published snapshots to keep per shard.
+
+    Returns:
+        The saved shard manifest.
+
+    Raises:
+        ValueError: If a requested shard has no sources.
+    """
+    source_dir = Path(source_dir)
+    collection_dir = Path(collection_dir)
+    groups = group_by_shard(sorted(source_dir.rglob("*.html")), source_dir)
+
+    selected = shards or list(groups)
+    unknown = [name for name in selected if name not in groups]
+    if unknown:
+        raise ValueError(f"No sources found for shard(s): {', '.join(unknown)}")
+
+    manifest = ShardManifest.load(collection_dir)
+    extractor = GlossaryExtractor()
+
+    for number, name in enumerate(selected, 1):
+        paths = groups[name]
+        print(f"\n[Shard {number}/{len(selected)}] {name}: {len(paths)} source file(s)")
+
+        result = extractor.extract_multiple(
+            paths,
+            source_name=name,
+            workers=workers,
+            fast=fast,
+            dedup=dedup,
+            dedup_threshold=dedup_threshold
+        )
+        for path, error in result["errors"].items():
+            print(f"  [ERROR] {path}: {error}")
+        if result["duplicates"]:
+            collapsed = sum(len(cluster["collapsed"]) for cluster in result["duplicates"])
+            print(f"  [DEDUP] Collapsed {collapsed} duplicate document(s) "
+                  f"into {len(result['duplicates'])} entries")
+        if not len(result["records"]):
+            print(f"  [WARNING] No terms found, shard {name} left unchanged")
+            continue
+
+        create_glossary_faiss_index(
+            records=result["records"],
+            output_dir=collection_dir,
+            embedding_model=embedding_model,
+            index_name=manifest.shard_dir(name).name,
+            incremental=incremental,
+            index_config=index_config,
+            rerank_factor=rerank_factor,
+            keep_snapshots=keep_snapshots
+        )
+
+        meta = ColumnarRecords.load(resolve_index_dir(manifest.shard_dir(name)) / RECORDS_FILE).meta
+        manifest.register(
+            name,
+            count=meta["count"],
+            embedding_model=meta["embedding_model"],
+            dimension=meta["dimension"],
+            sources=[path.relative_to(source_dir).as_posix() for path in paths]
+        )
+        manifest.save()
+
+    if prune:
+        for name in sorted(set(manifest.shards) - set(groups)):
+            shard_dir = manifest.shard_dir(name)
+            manifest.remove(name)
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            print(f"  [REMOVED] Shard {name} (no sources left)")
+        manifest.save()
+
+    return manifest
+
+
+def main():
+    """Main entry point for building a sharded collection."""
+    parser = argparse.ArgumentParser(
+        description="Build one glossary index shard per source directory"
+    )
+    parser.add_argument("source_dir", type=Path, help="Root directory of the HTML sources")
+    parser.add_argument(
+        "--collection-dir",
+        type=Path,
+        default=DEFAULT_COLLECTION_DIR,
+        help="Collection directory holding the shards and shards.json"
+    )
+    parser.add_argument(
+        "--shards",
+        type=lambda value: [name for name in value.split(",") if name],
+        default=None,
+        help="Comma-separated shards to rebuild (default: all)"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Extraction worker processes")
+    parser.add_argument("--fast", action="store_true", help="Parse only table subtrees")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update existing shards, embedding only added/changed terms"
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete registered shards whose source directory no longer exists"
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Keep duplicate terms repeated across source pages"
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=0.85,
+        help="Word 3-gram Jaccard similarity above which terms are near-duplicates"
+    )
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default="auto", help="FAISS index family")
+    parser.add_argument(
+        "--quantization",
+        choices=QUANTIZATION_TYPES,
+        default="none",
+        help="Vector storage inside the index"
+    )
+    parser.add_argument(
+        "--rerank-factor",
+        type=int,
+        default=0,
+        help="Rerank top_k*N candidates with full-precision vectors (0 disables)"
+    )
+    parser.add_argument(
+        "--keep-snapshots",
+        type=int,
+        default=DEFAULT_RETAIN,
+        help="Published snapshots to keep per shard for rollback (at least 2)"
+    )
+    args = parser.parse_args()
+
+    try:
+        manifest = build_shards(
+            source_dir=args.source_dir,
+            collection_dir=args.collection_dir,
+            shards=args.shards,
+            workers=args.workers,
+            fast=args.fast,
+            incremental=args.incremental,
+            prune=args.prune,
+            dedup=not args.no_dedup,
+            dedup_threshold=args.dedup_threshold,
+            index_config=FaissIndexConfig(
+                index_type=args.index_type,
+                quantization=args.quantization
+            ),
+            rerank_factor=args.rerank_factor,
+            keep_snapshots=args.keep_snapshots
+        )
+    except Exception as e:
+        print(f"[ERROR] Building shards failed: {e}")
+        sys.exit(1)
+
+    print(f"\n[SUCCESS] Collection at {args.collection_dir}:")
+    for name, entry in manifest.shards.items():
+        print(f"  {name}: {entry['count']} vectors ({len(entry['sources'])} sources)")
+
+
+if __name__ == "__main__":
+    main()
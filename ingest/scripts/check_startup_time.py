@@ -0,0 +1,156 @@
+"""Startup Time Check for the SuperStream Ingest Scripts."""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_MODULE = "ingest.scripts.glossary_to_faiss"
+DEFAULT_ARGS = ("--help",)
+DEFAULT_BACKEND = "openai"
+# glossary_to_faiss --help with the OpenAI backend takes 1.6-2.0s on a
+# warm file cache (up to 2.7s on slower hosts), most of it llama_index.core
+# under ingest.indexer; the budget leaves room for that spread
+DEFAULT_BUDGET = 3.0
+
+# Runs the entry point as ``python -m`` would, with the backend forced both
+# in the environment and on the already-imported config module
+BOOTSTRAP = (
+    "import runpy, sys, config; "
+    "config.EMBEDDING_MODEL_TYPE = {backend!r}; "
+    "sys.argv = [{module!r}, *{args!r}]; "
+    "runpy.run_module({module!r}, run_name='__main__', alter_sys=True)"
+)
+
+# Modules that must not be imported when the OpenAI backend is selected
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "llama_index.embeddings.huggingface",
+)
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    Parse ``python -X importtime`` output.
+
+    Args:
+        stderr: Standard error of the interpreter run.
+
+    Returns:
+        Cumulative import time in microseconds keyed by module name.
+    """
+    cumulative: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|", 2)
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def measure_startup(
+    module: str = DEFAULT_MODULE,
+    args: Sequence[str] = DEFAULT_ARGS,
+    backend: str = DEFAULT_BACKEND,
+    runs: int = 3
+) -> Tuple[float, Dict[str, int]]:
+    """
+    Measure how long a fresh interpreter takes to run an entry point.
+
+    The module is run as ``python -m module args`` with the embedding
+    backend forced, so the time covers every import up to the script's
+    first line of work (argument parsing with the default ``--help``).
+
+    Args:
+        module: Entry point module.
+        args: Command line arguments passed to the module.
+        backend: Embedding backend (EMBEDDING_MODEL_TYPE) to select.
+        runs: Number of runs; the fastest is reported (warm file cache).
+
+    Returns:
+        Tuple of (best wall seconds, import times of the best run).
+
+    Raises:
+        RuntimeError: If the entry point fails.
+    """
+    code = BOOTSTRAP.format(module=module, args=tuple(args), backend=backend)
+    env = dict(os.environ, EMBEDDING_MODEL_TYPE=backend)
+    best = float("inf")
+    best_imports: Dict[str, int] = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            env=env
+        )
+        seconds = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(f"Running {module} failed:\n{result.stderr[-2000:]}")
+        if seconds < best:
+            best, best_imports = seconds, parse_importtime(result.stderr)
+    return best, best_imports
+
+
+def heavy_imports(imports: Dict[str, int]) -> List[str]:
+    """Return the heavy backend modules present in an import trace."""
+    return [name for name in HEAVY_MODULES if name in imports]
+
+
+def main():
+    """Main entry point for the startup time check."""
+    parser = argparse.ArgumentParser(
+        description="Check that an ingest script starts within a time budget"
+    )
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="Entry point module to run")
+    parser.add_argument(
+        "--args",
+        nargs=argparse.REMAINDER,
+        default=list(DEFAULT_ARGS),
+        help="Arguments for the entry point (default: --help); must come last"
+    )
+    parser.add_argument(
+        "--backend",
+        default=DEFAULT_BACKEND,
+        help="Embedding backend to select (EMBEDDING_MODEL_TYPE)"
+    )
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Budget in seconds")
+    parser.add_argument("--runs", type=int, default=3, help="Runs (fastest is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    try:
+        seconds, imports = measure_startup(args.module, args.args, args.backend, args.runs)
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    command = " ".join(["python -m", args.module, *args.args])
+    print(f"Startup time for {command} ({args.backend}): {seconds:.2f}s (budget {args.budget:.2f}s)")
+    print(f"\nSlowest imports (cumulative):")
+    top_level = {name: us for name, us in imports.items() if "." not in name or name.startswith("ingest.")}
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1e6:>7.3f}s  {name}")
+
+    failed = False
+    loaded = heavy_imports(imports)
+    if loaded:
+        print(f"\n[ERROR] Heavy embedding backends imported at startup: {', '.join(loaded)}")
+        failed = True
+    if seconds > args.budget:
+        print(f"\n[ERROR] Startup exceeded budget by {seconds - args.budget:.2f}s")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print(f"\n[SUCCESS] Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,24 @@
 import argparse
 import json
 from pathlib import Path
-
-from ingest.glossary_extractor import GlossaryExtractor
+from typing import Iterable, Iterator
+
+from ingest.glossary_extractor import (
+    EXTRACTOR_VERSION,
+    ExtractionOutcome,
+    GlossaryExtractor,
+    in_input_order,
+)
+from ingest.profiling import PROFILE_ENV_VAR, get_profiler, span
+from ingest.source_manifest import SourceManifest
 from config import GLOSSARY_OUTPUT_DIR
 
 
 def extract_glossary_from_html(
     html_path: Path,
     output_name: str = "superstream_glossary",
-    output_dir: Path = None
+    output_dir: Path = None,
+    fast: bool = False
 ) -> None:
     """
     Extract glossary terms from HTML file and save as JSON.
@@ -20,6 +29,7 @@ def extract_glossary_from_html(
         html_path: Path to HTML glossary file.
         output_name: Name for output JSON file (without .json extension).
         output_dir: Directory to save JSON file (defaults to GLOSSARY_OUTPUT_DIR).
+        fast: Use the table-only streaming parser.
     """
     if output_dir is None:
         output_dir = GLOSSARY_OUTPUT_DIR
@@ -37,7 +47,9 @@ def extract_glossary_from_html(
     try:
         # Extract glossary from HTML
         print("\n[Step 1] Extracting glossary terms from HTML...")
-        result = extractor.extract_from_html(html_path)
+        with span("extract") as extract_span:
+            result = extractor.extract_from_html(html_path, fast=fast)
+            extract_span.items = result["count"]
 
         if result["count"] == 0:
             print("[WARNING] No glossary terms found in HTML file.")
@@ -47,7 +59,8 @@ def extract_glossary_from_html(
 
         # Save as JSON
         print("\n[Step 2] Saving glossary as JSON...")
-        output_path = extractor.save_glossary_json(result["terms"], output_name)
+        with span("save_json", items=result["count"]):
+            output_path = extractor.save_glossary_json(result["records"].terms(), output_name)
 
         # Display statistics
         print("\n" + "=" * 70)
@@ -60,12 +73,14 @@ def extract_glossary_from_html(
 
         # Display first few terms as sample
         print(f"\nFirst 5 terms:")
-        for i, (term, definition) in enumerate(list(result["terms"].items())[:5], 1):
+        for i, (term, definition) in enumerate(list(result["records"].terms().items())[:5], 1):
             term_display = term[:50] if len(term) > 50 else term
             def_display = definition[:70] if len(definition) > 70 else definition
             print(f"  {i}. {term_display}")
             print(f"     -> {def_display}...")
 
+        get_profiler().print_summary()
+
     except FileNotFoundError as e:
         print(f"\n[ERROR] HTML file not found - {e}")
         raise
@@ -77,13 +92,51 @@ def extract_glossary_from_html(
         raise
 
 
-def extract_all_glossaries(source_dir: Path, output_dir: Path = None) -> None:
+def _report_progress(
+    outcomes: Iterable[ExtractionOutcome],
+    total: int
+) -> Iterator[ExtractionOutcome]:
+    """Print each extraction outcome as soon as it completes."""
+    for done, outcome in enumerate(outcomes, 1):
+        _, html_file, result, error = outcome
+        print(f"\n[{done}/{total}] Processed: {html_file.name}")
+        if error is not None:
+            print(f"  [ERROR] {error}")
+        elif result["count"] > 0:
+            print(f"  [SUCCESS] Extracted {result['count']} terms")
+        else:
+            print(f"  [WARNING] No terms found")
+        yield outcome
+
+
+def extract_all_glossaries(
+    source_dir: Path,
+    output_dir: Path = None,
+    fast: bool = False,
+    workers: int = 1,
+    incremental: bool = False,
+    profile_dir: Path = None
+) -> None:
     """
     Extract all HTML glossary files from a directory.
 
+    Files are processed by a pool of ``workers`` processes. Progress is
+    reported as each file completes, while JSON outputs are written in
+    sorted path order so runs are reproducible. A failing file is reported
+    and skipped without affecting the others.
+
+    Every processed source is fingerprinted in a manifest next to the
+    outputs. In incremental mode only sources whose fingerprint (or the
+    extractor version) changed are re-extracted, and outputs of deleted
+    sources are removed.
+
     Args:
         source_dir: Directory containing HTML glossary files.
         output_dir: Directory to save JSON files (defaults to GLOSSARY_OUTPUT_DIR).
+        fast: Use the table-only streaming parser.
+        workers: Number of worker processes (1 = sequential).
+        incremental: Skip sources unchanged since the last run.
+        profile_dir: Directory to export per-stage timings to.
     """
     if output_dir is None:
         output_dir = GLOSSARY_OUTPUT_DIR
@@ -94,52 +147,84 @@ def extract_all_glossaries(source_dir: Path, output_dir: Path = None) -> None:
     print(f"\n[Source] Directory: {source_dir}")
     print(f"[Output] Directory: {output_dir}")
 
-    # Find all HTML files
-    html_files = list(source_dir.rglob("*.html"))
+    # Find all HTML files (sorted for a deterministic merge order)
+    html_files = sorted(source_dir.rglob("*.html"))
 
     if not html_files:
         print(f"\n[WARNING] No HTML files found in {source_dir}")
         return
 
-    print(f"\nFound {len(html_files)} HTML file(s)")
+    print(f"\nFound {len(html_files)} HTML file(s), using {workers} worker(s)")
 
     # Create glossary extractor
     extractor = GlossaryExtractor(output_dir=output_dir)
+    manifest = SourceManifest.load(extractor.output_dir, EXTRACTOR_VERSION)
 
-    total_terms = 0
-    successful = 0
-
-    for idx, html_file in enumerate(html_files, 1):
-        print(f"\n[{idx}/{len(html_files)}] Processing: {html_file.name}")
-
-        try:
-            # Extract glossary
-            result = extractor.extract_from_html(html_file)
+    to_process = html_files
+    skipped = 0
+    if incremental:
+        with span("manifest_diff", items=len(html_files)):
+            to_process, unchanged, deleted = manifest.diff(html_files, source_dir)
+        skipped = len(unchanged)
 
-            if result["count"] > 0:
-                # Save JSON with file stem as name
-                output_name = html_file.stem
-                extractor.save_glossary_json(result["terms"], output_name)
+        for key in deleted:
+            orphan = manifest.remove(key)
+            if orphan:
+                (extractor.output_dir / orphan).unlink(missing_ok=True)
+                print(f"  [REMOVED] {orphan} (source {key} deleted)")
 
-                total_terms += result["count"]
-                successful += 1
+        print(f"Incremental: {len(to_process)} new/changed, "
+              f"{skipped} unchanged, {len(deleted)} deleted")
 
-                print(f"  [SUCCESS] Extracted {result['count']} terms")
-            else:
-                print(f"  [WARNING] No terms found")
+    total_terms = 0
+    successful = 0
 
-        except Exception as e:
-            print(f"  [ERROR] {e}")
+    with span("extract", items=len(to_process), workers=workers) as extract_span:
+        outcomes = extractor.iter_extract(to_process, workers=workers, fast=fast)
+        for _, html_file, result, error in in_input_order(
+            _report_progress(outcomes, len(to_process))
+        ):
+            if error is not None:
+                continue
+
+            key = manifest.key(html_file, source_dir)
+            if result["count"] == 0:
+                # Drop the previous output, or indexing keeps its stale terms
+                stale = manifest.remove(key)
+                if stale:
+                    (extractor.output_dir / stale).unlink(missing_ok=True)
+                    print(f"  [REMOVED] {stale} ({key} has no terms left)")
+                manifest.record(key, html_file, None)
+                continue
+
+            # Save JSON with file stem as name
+            with span("save_json", items=result["count"]):
+                output_path = extractor.save_glossary_json(result["records"].terms(), html_file.stem)
+            manifest.record(key, html_file, output_path.name)
+
+            total_terms += result["count"]
+            successful += 1
+        extract_span.attributes["terms"] = total_terms
+
+    manifest.save()
 
     # Summary
     print("\n" + "=" * 70)
     print(f"[SUCCESS] Batch extraction completed!")
     print("=" * 70)
     print(f"\nSummary:")
-    print(f"  Files processed: {successful}/{len(html_files)}")
+    print(f"  Files processed: {successful}/{len(to_process)}")
+    if incremental:
+        print(f"  Files skipped (unchanged): {skipped}")
     print(f"  Total terms extracted: {total_terms}")
     print(f"  Output directory: {output_dir}")
 
+    profiler = get_profiler()
+    profiler.print_summary()
+    if profile_dir is not None:
+        for path in profiler.export(profile_dir, prefix="extract_profile"):
+            print(f"[OK] Profile written: {path}")
+
 
 def main():
     """Main entry point for glossary extraction."""
@@ -169,6 +254,11 @@ def main():
         default=None,
         help="Output directory for JSON file"
     )
+    single_parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Parse only table subtrees (uses lxml iterparse when installed)"
+    )
 
     # Batch extraction
     batch_parser = subparsers.add_parser("batch", help="Extract all HTML files from directory")
@@ -183,6 +273,29 @@ def main():
         default=None,
         help="Output directory for JSON files"
     )
+    batch_parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Parse only table subtrees (uses lxml iterparse when installed)"
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for parallel extraction"
+    )
+    batch_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-extract files whose fingerprint changed since the last run"
+    )
+    batch_parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help=f"Export per-stage timings here (set {PROFILE_ENV_VAR}=cprofile,tracemalloc "
+             "for deeper capture)"
+    )
 
     args = parser.parse_args()
 
@@ -191,12 +304,17 @@ def main():
         extract_glossary_from_html(
             html_path=args.html_file,
             output_name=args.output_name,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            fast=args.fast
         )
     elif args.command == "batch":
         extract_all_glossaries(
             source_dir=args.source_dir,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            fast=args.fast,
+            workers=args.workers,
+            incremental=args.incremental,
+            profile_dir=args.profile_dir
         )
     else:
         parser.print_help()
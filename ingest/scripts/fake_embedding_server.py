@@ -0,0 +1,143 @@
+"""Local Fake OpenAI Embedding Server for Offline Testing."""
+
+import argparse
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from ingest.fake_embedding import hash_embedding
+
+
+class FakeEmbeddingHandler(BaseHTTPRequestHandler):
+    """
+    Serves ``POST /v1/embeddings`` in the OpenAI response format.
+
+    Vectors come from ``hash_embedding`` so responses are deterministic.
+    Latency and a requests-per-minute limit (answered with HTTP 429 and a
+    Retry-After header) can be simulated to exercise client scheduling.
+    """
+
+    dimension = 1536
+    latency = 0.0
+    requests_per_minute = 0
+    request_times = []
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _rate_limited(self) -> float:
+        """Return seconds until a slot frees up, or 0 if the request is admitted."""
+        if not self.requests_per_minute:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            while self.request_times and now - self.request_times[0] >= 60.0:
+                self.request_times.pop(0)
+            if len(self.request_times) >= self.requests_per_minute:
+                return 60.0 - (now - self.request_times[0])
+            self.request_times.append(now)
+            return 0.0
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/embeddings"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        wait = self._rate_limited()
+        if wait:
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit exceeded", "type": "requests"}},
+                {"Retry-After": f"{wait:.2f}"}
+            )
+            return
+
+        inputs = request.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        data = []
+        for i, text in enumerate(inputs):
+            vector = hash_embedding(str(text), self.dimension)
+            if request.get("encoding_format") == "base64":
+                embedding = base64.b64encode(
+                    np.asarray(vector, dtype=np.float32).tobytes()
+                ).decode("ascii")
+            else:
+                embedding = vector
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+
+        tokens = sum(len(str(text).split()) for text in inputs)
+        self._send_json(200, {
+            "object": "list",
+            "data": data,
+            "model": request.get("model", "fake-embedding"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+
+def main():
+    """Main entry point for the fake embedding server."""
+    parser = argparse.ArgumentParser(
+        description="Serve deterministic OpenAI-compatible embeddings locally"
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--dimension",
+        type=int,
+        default=1536,
+        help="Embedding dimension"
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated latency per request in milliseconds"
+    )
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        default=0,
+        help="Requests per minute before answering 429 (0 = unlimited)"
+    )
+    args = parser.parse_args()
+
+    FakeEmbeddingHandler.dimension = args.dimension
+    FakeEmbeddingHandler.latency = args.latency_ms / 1000.0
+    FakeEmbeddingHandler.requests_per_minute = args.rpm
+
+    server = ThreadingHTTPServer((args.host, args.port), FakeEmbeddingHandler)
+    print(f"Fake embedding server listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@ This script supports multiple methods:
 1. Extract from PDF tables (for table-based glossaries)
 2. Extract from JSON file (for pre-processed glossaries)
 3. Extract from text file (for simple text-based glossaries)
+4. Index already extracted glossary records (used by build_shards)
 """
 
+import argparse
 import sys
 from pathlib import Path
 from typing import Optional
@@ -15,7 +17,18 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from ingest.glossary_extractor import GlossaryExtractor
+from ingest.glossary_records import GlossaryRecords
+from ingest.faiss_index import INDEX_TYPES, QUANTIZATION_TYPES, FaissIndexConfig
+from ingest.index_store import (
+    FULL_VECTORS_FILE,
+    VECTOR_STORE_FILE,
+    ColumnarRecords,
+    save_compact_index,
+)
 from ingest.indexer import IndexBuilder
+from ingest.lexical_index import LEXICAL_FILE, LexicalIndex
+from ingest.profiling import PROFILE_ENV_VAR, get_profiler, span
+from ingest.snapshots import DEFAULT_RETAIN, SnapshotStore, resolve_index_dir
 from config import EMBEDDING_MODEL, EMBEDDING_MODEL_TYPE, DATA_DIR
 
 try:
@@ -28,22 +41,53 @@ except ImportError:
 def create_glossary_faiss_index(
     pdf_path: Optional[Path] = None,
     json_path: Optional[Path] = None,
+    records: Optional[GlossaryRecords] = None,
     output_dir: Optional[Path] = None,
     embedding_model: str = EMBEDDING_MODEL,
-    index_name: str = "glossary_index"
+    index_name: str = "glossary_index",
+    use_cache: bool = True,
+    incremental: bool = False,
+    index_config: Optional[FaissIndexConfig] = None,
+    rerank_factor: int = 0,
+    pdf_workers: int = 1,
+    embed_workers: int = 1,
+    keep_snapshots: int = DEFAULT_RETAIN,
+    profile_dir: Optional[Path] = None
 ) -> str:
     """
     Extract glossary from PDF or JSON and create FAISS vector index.
 
+    Every build is written to a new snapshot under
+    ``<output_dir>/<index_name>/snapshots/`` and published by atomically
+    swapping the index's CURRENT.json pointer, so query processes never
+    see a half-written index and pick the new one up on their next reload.
+
     Args:
         pdf_path: Path to the glossary PDF file.
         json_path: Path to glossary JSON file (alternative to PDF).
+        records: Already extracted glossary records (alternative to PDF
+                 and JSON).
         output_dir: Directory to save the FAISS index. Defaults to data/indices.
         embedding_model: Embedding model to use. Defaults to config.EMBEDDING_MODEL.
         index_name: Name for the index (used for saving).
+        use_cache: Reuse embeddings from the persistent embedding cache.
+        incremental: Start from the current snapshot, embedding only added
+                     and changed terms. Falls back to a full build when no
+                     updatable index exists yet.
+        index_config: FAISS index family and parameters. Defaults to "auto".
+        rerank_factor: When > 1, keep full-precision vectors in a memory-mapped
+                       file and rerank top_k * rerank_factor quantized search
+                       candidates by exact distance. 0 disables reranking.
+        pdf_workers: Worker processes for page-parallel PDF extraction.
+        embed_workers: Worker processes for embedding with a local model
+                       (each loads its own copy of the model).
+        keep_snapshots: Published snapshots to keep for rollback.
+        profile_dir: Directory to export per-stage timings to (JSON and
+                     trace events, plus a cProfile dump when
+                     SUPERSTREAM_PROFILE includes "cprofile").
 
     Returns:
-        Path to the saved FAISS index.
+        Path to the index root (loaders resolve its current snapshot).
 
     Raises:
         FileNotFoundError: If file does not exist.
@@ -55,6 +99,10 @@ def create_glossary_faiss_index(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Each run reports only its own stages
+    profiler = get_profiler()
+    profiler.reset()
+
     print(f"\n{'='*60}")
     print(f"SuperStream Glossary to FAISS Index")
     print(f"{'='*60}")
@@ -62,7 +110,10 @@ def create_glossary_faiss_index(
     # Step 1: Extract glossary from source
     print(f"\n[Step 1] Extracting glossary from source...")
 
-    if json_path:
+    if records is not None:
+        terms_count = len(set(records.term))
+
+    elif json_path:
         json_path = Path(json_path)
         if not json_path.exists():
             raise FileNotFoundError(f"JSON file not found: {json_path}")
@@ -70,25 +121,18 @@ def create_glossary_faiss_index(
         import json
         print(f"JSON File: {json_path}")
 
-        with open(json_path, 'r', encoding='utf-8-sig') as f:
-            terms_dict = json.load(f)
-
-        # Convert to Document objects
-        documents = []
-        for term, definition in terms_dict.items():
-            from llama_index.core.schema import Document
-            doc = Document(
-                text=f"{term}: {definition}",
-                metadata={
-                    "term": term,
-                    "definition": definition,
-                    "source": "SuperStream Glossary of Terms",
-                    "doc_type": "glossary",
-                    "last_updated": "2025-12-29",
-                    "file_name": json_path.name
-                }
-            )
-            documents.append(doc)
+        with span("extract") as extract_span:
+            with open(json_path, 'r', encoding='utf-8-sig') as f:
+                terms_dict = json.load(f)
+            extract_span.items = len(terms_dict)
+
+        records = GlossaryRecords.from_terms(
+            terms_dict,
+            source="SuperStream Glossary of Terms",
+            last_updated="2025-12-29",
+            file_name=json_path.name
+        )
+        terms_count = len(terms_dict)
 
     elif pdf_path:
         pdf_path = Path(pdf_path)
@@ -101,41 +145,95 @@ def create_glossary_faiss_index(
         print(f"PDF File: {pdf_path}")
 
         extractor = GlossaryExtractor()
-        extraction_result = extractor.extract_from_file(
-            pdf_path=pdf_path,
-            source_name="SuperStream Glossary of Terms",
-            last_updated="2025-12-24"
-        )
+        with span("extract") as extract_span:
+            extraction_result = extractor.extract_from_file(
+                pdf_path=pdf_path,
+                source_name="SuperStream Glossary of Terms",
+                last_updated="2025-12-24",
+                workers=pdf_workers
+            )
+            extract_span.items = extraction_result["count"]
+            extract_span.attributes["pages"] = extraction_result["pages"]
 
-        terms_dict = extraction_result["terms"]
-        documents = extraction_result["documents"]
+        records = extraction_result["records"]
+        terms_count = extraction_result["count"]
 
     else:
-        raise ValueError("Either pdf_path or json_path must be provided")
-
-    terms_count = len(terms_dict)
+        raise ValueError("One of pdf_path, json_path or records must be provided")
 
     if terms_count == 0:
         raise ValueError("No glossary terms found")
 
     print(f"[OK] Successfully extracted {terms_count} glossary terms")
-    print(f"[OK] Created {len(documents)} Document objects")
+    print(f"[OK] Stored {len(records)} records ({records.nbytes / 1024:.1f} KB)")
+
+    # One document per term: document IDs are derived from the term
+    unique_records = records.latest_per_term()
+    if len(unique_records) < len(records):
+        print(f"[INFO] {len(records) - len(unique_records)} record(s) repeat a term, "
+              f"keeping the last definition of each")
+        records = unique_records
+
+    # LlamaIndex needs Document objects from here on
+    with span("documents", items=len(records)):
+        documents = records.documents()
 
     # Step 2: Create embeddings and build FAISS index
     print(f"\n[Step 2] Building FAISS vector index...")
     print(f"Embedding Model: {embedding_model}")
     print(f"Model Type: {EMBEDDING_MODEL_TYPE}")
 
+    store = SnapshotStore(output_dir / index_name, retain=keep_snapshots)
+    index_builder = None
+    staging = None
     try:
-        index_builder = IndexBuilder(embedding_model=embedding_model)
-        vector_index = index_builder.build_index(documents)
+        index_builder = IndexBuilder(
+            embedding_model=embedding_model,
+            use_cache=use_cache,
+            index_config=index_config,
+            workers=embed_workers
+        )
+
+        vector_index = None
+        if incremental:
+            try:
+                with span("update_index", items=len(documents)):
+                    update_result = index_builder.update_index(
+                        resolve_index_dir(store.root), documents
+                    )
+                vector_index = update_result["index"]
+            except (FileNotFoundError, NotImplementedError) as e:
+                print(f"[INFO] {e}, falling back to full build")
+
+        if vector_index is None:
+            with span("build_index", items=len(documents)):
+                vector_index = index_builder.build_index(documents)
+
+        # Save the FAISS index, plus the compact records query workers mmap
+        # and a BM25 inverted index over the same rows for hybrid retrieval,
+        # into a staging snapshot that only becomes visible once complete
+        staging = store.begin()
+        with span("persist", items=len(documents)):
+            vector_index.storage_context.persist(str(staging))
+            records_path = save_compact_index(
+                vector_index,
+                staging,
+                embedding_model,
+                node_vectors=index_builder.node_vectors if rerank_factor > 1 else None,
+                rerank_factor=rerank_factor
+            )
+            LexicalIndex.build(
+                ColumnarRecords.load(records_path).column("text"),
+                staging / LEXICAL_FILE
+            )
 
-        # Save the FAISS index
-        index_path = output_dir / index_name
-        vector_index.storage_context.persist(str(index_path))
+        version = store.publish(staging)
+        staging = None
+        index_path = store.snapshot_dir(version)
 
         print(f"[OK] FAISS index built and saved successfully")
-        print(f"[OK] Index location: {index_path}")
+        print(f"[OK] Published snapshot {version} ({len(store.versions())} kept)")
+        print(f"[OK] Index location: {store.root}")
 
         # Print summary
         print(f"\n{'='*60}")
@@ -145,20 +243,144 @@ def create_glossary_faiss_index(
         print(f"Total Documents: {len(documents)}")
         print(f"Embedding Model: {embedding_model}")
         print(f"Index Name: {index_name}")
-        print(f"Index Path: {index_path}")
+        print(f"Index Path: {store.root}")
+        print(f"Snapshot: {version}")
+        vector_count = vector_index.vector_store.client.ntotal
+        if vector_count:
+            dimension = vector_index.vector_store.client.d
+            stored = (index_path / VECTOR_STORE_FILE).stat().st_size / vector_count
+            print(f"Vector Storage: {stored:,.0f} bytes/vector "
+                  f"({dimension * 4 / stored:.1f}x smaller than float32)")
+            if (index_path / FULL_VECTORS_FILE).exists():
+                print(f"Rerank Vectors: {FULL_VECTORS_FILE} (memory-mapped, "
+                      f"{rerank_factor}x candidates)")
+        if index_builder.cache is not None:
+            cache_stats = index_builder.cache.stats()
+            print(f"Embedding Cache: {cache_stats['hits']} hits, "
+                  f"{cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.0%} hit rate)")
+        profiler.print_summary()
         print(f"{'='*60}\n")
 
-        return str(index_path)
+        if profile_dir is not None:
+            for path in profiler.export(profile_dir):
+                print(f"[OK] Profile written: {path}")
+
+        return str(store.root)
 
     except Exception as e:
         print(f"[ERROR] Error building index: {e}")
         raise
 
+    finally:
+        if staging is not None:
+            store.discard(staging)
+        if index_builder is not None:
+            index_builder.close()
+
 
 def main():
     """Main entry point for the script."""
-    import json
-    from pathlib import Path
+    parser = argparse.ArgumentParser(
+        description="Create a FAISS vector index from the SuperStream glossary"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update the existing index, embedding only added/changed terms"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the persistent embedding cache"
+    )
+    parser.add_argument(
+        "--index-type",
+        choices=INDEX_TYPES,
+        default="auto",
+        help="FAISS index family (auto picks by number of terms)"
+    )
+    parser.add_argument("--hnsw-m", type=int, default=32, help="HNSW neighbours per node")
+    parser.add_argument("--ef-search", type=int, default=64, help="HNSW efSearch")
+    parser.add_argument("--nlist", type=int, default=None, help="IVF cells (default 4*sqrt(n))")
+    parser.add_argument("--nprobe", type=int, default=16, help="IVF cells probed per query")
+    parser.add_argument("--pq-m", type=int, default=None, help="PQ sub-quantizers (code bytes)")
+    parser.add_argument(
+        "--quantization",
+        choices=QUANTIZATION_TYPES,
+        default="none",
+        help="Vector storage inside the index: float32, fp16/int8 scalar or PQ codes"
+    )
+    parser.add_argument(
+        "--rerank-factor",
+        type=int,
+        default=0,
+        help="Keep full-precision vectors on disk and rerank top_k*N candidates (0 disables)"
+    )
+    parser.add_argument(
+        "--pdf",
+        type=Path,
+        default=None,
+        help="Extract the glossary from this PDF instead of the JSON file"
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=1,
+        help="Worker processes for page-parallel PDF extraction"
+    )
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=1,
+        help="Worker processes for local-model embedding (cores are split between them)"
+    )
+    parser.add_argument(
+        "--keep-snapshots",
+        type=int,
+        default=DEFAULT_RETAIN,
+        help="Published index snapshots to keep for rollback (at least 2)"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help=f"Export per-stage timings here (set {PROFILE_ENV_VAR}=cprofile,tracemalloc "
+             "for deeper capture)"
+    )
+    args = parser.parse_args()
+
+    index_config = FaissIndexConfig(
+        index_type=args.index_type,
+        hnsw_m=args.hnsw_m,
+        ef_search=args.ef_search,
+        nlist=args.nlist,
+        nprobe=args.nprobe,
+        pq_m=args.pq_m,
+        quantization=args.quantization
+    )
+
+    if args.pdf is not None:
+        try:
+            index_path = create_glossary_faiss_index(
+                pdf_path=args.pdf,
+                embedding_model=EMBEDDING_MODEL,
+                index_name="superstream_glossary_index",
+                use_cache=not args.no_cache,
+                incremental=args.incremental,
+                index_config=index_config,
+                rerank_factor=args.rerank_factor,
+                pdf_workers=args.pdf_workers,
+                embed_workers=args.embed_workers,
+                keep_snapshots=args.keep_snapshots,
+                profile_dir=args.profile_dir
+            )
+            print(f"\n[OK] Script completed successfully!")
+            print(f"Index saved at: {index_path}")
+            return
+        except Exception as e:
+            print(f"[ERROR] Error processing PDF: {e}")
+            sys.exit(1)
 
     # Try JSON file first (preferred method for this problematic PDF)
     json_path = DATA_DIR / "glossaries" / "glossary.json"
@@ -169,7 +391,14 @@ def main():
             index_path = create_glossary_faiss_index(
                 json_path=json_path,
                 embedding_model=EMBEDDING_MODEL,
-                index_name="superstream_glossary_index"
+                index_name="superstream_glossary_index",
+                use_cache=not args.no_cache,
+                incremental=args.incremental,
+                index_config=index_config,
+                rerank_factor=args.rerank_factor,
+                embed_workers=args.embed_workers,
+                keep_snapshots=args.keep_snapshots,
+                profile_dir=args.profile_dir
             )
             print(f"\n[OK] Script completed successfully!")
             print(f"Index saved at: {index_path}")
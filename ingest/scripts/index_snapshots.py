@@ -0,0 +1,99 @@
+"""
+Script to list, roll back and prune published index snapshots.
+
+Query servers started with --reload-interval pick up a rollback on their
+next check, the same way they pick up a newly built snapshot.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.snapshots import DEFAULT_RETAIN, MIN_RETAIN, SnapshotStore
+from config import DATA_DIR
+
+DEFAULT_INDEX_DIR = DATA_DIR / "indices" / "superstream_glossary_index"
+
+
+def list_snapshots(store: SnapshotStore) -> None:
+    """
+    Print the published snapshots of an index, marking the current one.
+
+    Args:
+        store: Snapshot store of the index.
+    """
+    versions = store.versions()
+    if not versions:
+        print(f"[WARNING] No snapshots published under {store.root}")
+        return
+
+    current = store.current()
+    print(f"Snapshots of {store.root}:")
+    for version in reversed(versions):
+        size = sum(
+            path.stat().st_size for path in store.snapshot_dir(version).iterdir() if path.is_file()
+        )
+        marker = "*" if version == current else " "
+        print(f" {marker} {version}  {size / 1024 / 1024:.1f} MB")
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Manage the versioned snapshots of a glossary index"
+    )
+    parser.add_argument(
+        "--index-dir",
+        type=Path,
+        default=DEFAULT_INDEX_DIR,
+        help="Index root holding CURRENT.json and snapshots/"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+
+    subparsers.add_parser("list", help="List snapshots, newest first")
+
+    rollback_parser = subparsers.add_parser("rollback", help="Point the index at an earlier snapshot")
+    rollback_parser.add_argument(
+        "version",
+        nargs="?",
+        default=None,
+        help="Snapshot version to restore (default: the one before current)"
+    )
+
+    prune_parser = subparsers.add_parser("prune", help="Delete all but the newest snapshots")
+    prune_parser.add_argument(
+        "--keep",
+        type=int,
+        default=DEFAULT_RETAIN,
+        help=f"Snapshots to keep, at least {MIN_RETAIN} (the current one is always kept)"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        list_snapshots(SnapshotStore(args.index_dir))
+    elif args.command == "rollback":
+        store = SnapshotStore(args.index_dir)
+        try:
+            version = store.rollback(args.version)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        print(f"[OK] {store.root} now serves snapshot {version}")
+    elif args.command == "prune":
+        if args.keep < MIN_RETAIN:
+            print(f"[WARNING] Keeping {MIN_RETAIN} snapshots, the current one and the one before it")
+        removed = SnapshotStore(args.index_dir, retain=args.keep).prune()
+        for version in removed:
+            print(f"  [REMOVED] Snapshot {version}")
+        print(f"[OK] Removed {len(removed)} snapshot(s)")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Stream the Raw Document Corpus into a Resumable FAISS Index."""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingest.corpus_pipeline import CorpusPipeline
+from ingest.faiss_index import INDEX_TYPES, QUANTIZATION_TYPES, FaissIndexConfig
+from ingest.indexer import IndexBuilder
+from ingest.profiling import PROFILE_ENV_VAR, get_profiler
+from config import DATA_DIR, EMBEDDING_MODEL
+
+DEFAULT_SOURCE_DIR = DATA_DIR / "raw" / "official-documents"
+DEFAULT_OUTPUT_DIR = DATA_DIR / "indices" / "superstream_corpus_index"
+
+
+def ingest_corpus(
+    source_dir: Path = DEFAULT_SOURCE_DIR,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    embedding_model: str = EMBEDDING_MODEL,
+    index_config: Optional[FaissIndexConfig] = None,
+    chunk_size: int = 512,
+    chunk_overlap: int = 64,
+    batch_size: int = 256,
+    queue_size: int = 64,
+    checkpoint_every: int = 50,
+    embed_workers: int = 1,
+    restart: bool = False,
+    profile_dir: Optional[Path] = None
+) -> Path:
+    """
+    Chunk, embed and index every document under ``source_dir``.
+
+    Args:
+        source_dir: Corpus root directory.
+        output_dir: Directory for the compact index.
+        embedding_model: Embedding model to use.
+        index_config: FAISS index configuration ("auto" resolves to "hnsw").
+        chunk_size: Chunk size in tokens.
+        chunk_overlap: Chunk overlap in tokens.
+        batch_size: Chunks per embedding call.
+        queue_size: Capacity of each inter-stage queue.
+        checkpoint_every: Completed sources between checkpoints.
+        embed_workers: Worker processes for local-model embedding.
+        restart: Ignore an existing checkpoint.
+        profile_dir: Directory to export per-stage timings to.
+
+    Returns:
+        Path to the index directory.
+    """
+    profiler = get_profiler()
+    profiler.reset()
+
+    print("=" * 70)
+    print("SuperStream Corpus Ingestion")
+    print("=" * 70)
+    print(f"\n[Source] Directory: {source_dir}")
+    print(f"[Output] Directory: {output_dir}")
+
+    index_builder = IndexBuilder(
+        embedding_model=embedding_model,
+        batch_size=batch_size,
+        workers=embed_workers
+    )
+    pipeline = CorpusPipeline(
+        index_builder,
+        output_dir=output_dir,
+        embedding_model=embedding_model,
+        index_config=index_config,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        batch_size=batch_size,
+        queue_size=queue_size,
+        checkpoint_every=checkpoint_every
+    )
+    try:
+        result = pipeline.run(source_dir, restart=restart)
+    finally:
+        index_builder.close()
+
+    print("\n" + "=" * 70)
+    print("[SUCCESS] Corpus ingestion completed!")
+    print("=" * 70)
+    print(f"  Sources ingested: {result['sources']}")
+    if result["resumed_sources"]:
+        print(f"  Sources from checkpoint: {result['resumed_sources']}")
+    print(f"  Chunks indexed: {result['chunks']}")
+    print(f"  Index location: {output_dir}")
+    if index_builder.cache is not None:
+        cache_stats = index_builder.cache.stats()
+        print(f"  Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+              f"({cache_stats['hit_rate']:.0%} hit rate)")
+    profiler.print_summary()
+    if profile_dir is not None:
+        for path in profiler.export(profile_dir, prefix="ingest_profile"):
+            print(f"[OK] Profile written: {path}")
+    return Path(output_dir)
+
+
+def main():
+    """Main entry point for corpus ingestion."""
+    parser = argparse.ArgumentParser(
+        description="Stream HTML/PDF/text documents through chunking and embedding into a FAISS index"
+    )
+    parser.add_argument("source_dir", type=Path, nargs="?", default=DEFAULT_SOURCE_DIR,
+                        help="Corpus root directory")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR, help="Index directory")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Chunk size in tokens")
+    parser.add_argument("--chunk-overlap", type=int, default=64, help="Chunk overlap in tokens")
+    parser.add_argument("--batch-size", type=int, default=256, help="Chunks per embedding call")
+    parser.add_argument("--queue-size", type=int, default=64, help="Items buffered between stages")
+    parser.add_argument("--checkpoint-every", type=int, default=50,
+                        help="Completed sources between checkpoints")
+    parser.add_argument("--embed-workers", type=int, default=1,
+                        help="Worker processes for local-model embedding")
+    parser.add_argument("--restart", action="store_true", help="Discard any checkpoint and start over")
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default="auto",
+                        help="FAISS index family (auto = hnsw, the corpus size is unknown up front)")
+    parser.add_argument("--quantization", choices=QUANTIZATION_TYPES, default="none",
+                        help="Vector storage inside the index")
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help=f"Export per-stage timings here (set {PROFILE_ENV_VAR}=cprofile,tracemalloc "
+             "for deeper capture)"
+    )
+    args = parser.parse_args()
+
+    try:
+        ingest_corpus(
+            source_dir=args.source_dir,
+            output_dir=args.output_dir,
+            index_config=FaissIndexConfig(index_type=args.index_type, quantization=args.quantization),
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            batch_size=args.batch_size,
+            queue_size=args.queue_size,
+            checkpoint_every=args.checkpoint_every,
+            embed_workers=args.embed_workers,
+            restart=args.restart,
+            profile_dir=args.profile_dir
+        )
+    except Exception as e:
+        print(f"[ERROR] Corpus ingestion failed: {e}")
+        print("Rerun the same command to resume from the last checkpoint.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Sharded Multi-Source Index Collection for SuperStream RAG System."""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ingest.index_store import CompactIndex
+
+SHARD_MANIFEST_NAME = "shards.json"
+
+SHARD_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+def shard_name_for(path: Path, source_dir: Path) -> str:
+    """
+    Name the shard a source file belongs to.
+
+    Sources are sharded by their top-level directory under ``source_dir``
+    ("2-role-based-guide", "technical-standards", ...); files directly in
+    ``source_dir`` go to a shard named after the directory itself.
+
+    Args:
+        path: Source file path.
+        source_dir: Root directory of the sources.
+
+    Returns:
+        Shard name.
+    """
+    parts = Path(path).relative_to(source_dir).parts
+    return parts[0] if len(parts) > 1 else Path(source_dir).resolve().name
+
+
+def group_by_shard(paths: Sequence[Path], source_dir: Path) -> Dict[str, List[Path]]:
+    """
+    Group source files by shard, keeping their order within each shard.
+
+    Args:
+        paths: Source file paths.
+        source_dir: Root directory of the sources.
+
+    Returns:
+        Shard name to source files, in sorted shard order.
+    """
+    groups: Dict[str, List[Path]] = {}
+    for path in paths:
+        groups.setdefault(shard_name_for(path, source_dir), []).append(Path(path))
+    return dict(sorted(groups.items()))
+
+
+class ShardManifest:
+    """
+    Lists the shards of an index collection.
+
+    Every shard is a self-contained index directory (LlamaIndex files plus
+    the compact query files) under the collection directory, so one shard
+    can be rebuilt and re-registered without touching the others. All
+    shards must share one embedding model and dimension, otherwise their
+    distances could not be merged.
+
+    Attributes:
+        collection_dir: Directory holding the shard directories.
+        shards: Mapping of shard name to entry (path, count, embedding
+                model, dimension, sources, update time).
+    """
+
+    def __init__(self, collection_dir: Path):
+        """
+        Initialize an empty manifest.
+
+        Args:
+            collection_dir: Collection directory.
+        """
+        self.collection_dir = Path(collection_dir)
+        self.shards: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def path(self) -> Path:
+        """Manifest file path."""
+        return self.collection_dir / SHARD_MANIFEST_NAME
+
+    @classmethod
+    def load(cls, collection_dir: Path) -> "ShardManifest":
+        """
+        Load the manifest of a collection, or start an empty one.
+
+        Args:
+            collection_dir: Collection directory.
+
+        Returns:
+            ShardManifest instance.
+        """
+        manifest = cls(collection_dir)
+        if manifest.path.exists():
+            with open(manifest.path, "r", encoding="utf-8") as f:
+                manifest.shards = json.load(f).get("shards", {})
+        return manifest
+
+    def shard_dir(self, name: str) -> Path:
+        """
+        Return the index directory of a shard.
+
+        Args:
+            name: Shard name.
+
+        Returns:
+            Directory path.
+
+        Raises:
+            ValueError: If the name is not a safe directory name.
+        """
+        if not SHARD_NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid shard name: {name!r}")
+        entry = self.shards.get(name)
+        return self.collection_dir / (entry["path"] if entry else name)
+
+    def register(
+        self,
+        name: str,
+        count: int,
+        embedding_model: Optional[str],
+        dimension: int,
+        sources: Optional[List[str]] = None
+    ) -> None:
+        """
+        Record a (re)built shard.
+
+        Args:
+            name: Shard name.
+            count: Number of vectors in the shard.
+            embedding_model: Embedding model the shard was built with.
+            dimension: Vector dimension.
+            sources: Source files (relative keys) the shard was built from.
+
+        Raises:
+            ValueError: If the shard does not match the other shards'
+                        embedding model or dimension.
+        """
+        for other_name, other in self.shards.items():
+            if other_name == name:
+                continue
+            if (other["embedding_model"], other["dimension"]) != (embedding_model, dimension):
+                raise ValueError(
+                    f"Shard {name!r} ({embedding_model}, {dimension}d) does not match "
+                    f"shard {other_name!r} ({other['embedding_model']}, {other['dimension']}d)"
+                )
+            break
+
+        self.shards[name] = {
+            "path": self.shard_dir(name).name,
+            "count": count,
+            "embedding_model": embedding_model,
+            "dimension": dimension,
+            "sources": sorted(sources or []),
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+
+    def remove(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Forget a shard. Its directory is left for the caller to delete.
+
+        Args:
+            name: Shard name.
+
+        Returns:
+            The removed entry, or None if the shard was not registered.
+        """
+        return self.shards.pop(name, None)
+
+    def save(self) -> Path:
+        """
+        Atomically write the manifest.
+
+        Returns:
+            Path to the manifest file.
+        """
+        self.collection_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"shards": self.shards}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+
+class ShardedIndex:
+    """
+    Searches every shard of a collection concurrently and merges top-k.
+
+    Each shard is a memory-mapped CompactIndex. A query matrix is searched
+    against all shards in a thread pool (FAISS releases the GIL during
+    search, so shards run in parallel) and the per-shard top-k lists are
+    merged by L2 distance, which is comparable because all shards share
+    one embedding model. Latency is bounded by the slowest shard rather
+    than the total corpus size.
+
+    Attributes:
+        names: Shard names, in manifest order.
+        shards: Loaded shard indexes aligned with ``names``.
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, CompactIndex],
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize sharded index.
+
+        Args:
+            shards: Shard name to loaded compact index.
+            max_workers: Search threads. Defaults to one per shard.
+        """
+        self.names = list(shards)
+        self.shards = [shards[name] for name in self.names]
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, len(self.shards)),
+            thread_name_prefix="shard-search"
+        )
+
+    @classmethod
+    def load(
+        cls,
+        collection_dir: Path,
+        names: Optional[Sequence[str]] = None,
+        mmap: bool = True,
+        max_workers: Optional[int] = None
+    ) -> "ShardedIndex":
+        """
+        Load the shards listed in a collection manifest.
+
+        Args:
+            collection_dir: Collection directory.
+            names: Shards to load. Defaults to all registered shards.
+            mmap: Memory-map the shard files.
+            max_workers: Search threads. Defaults to one per shard.
+
+        Returns:
+            ShardedIndex instance.
+
+        Raises:
+            FileNotFoundError: If the collection has no shards.
+            KeyError: If a requested shard is not registered.
+        """
+        manifest = ShardManifest.load(collection_dir)
+        if not manifest.shards:
+            raise FileNotFoundError(f"No shards registered in {manifest.path}")
+
+        names = list(names) if names else list(manifest.shards)
+        for name in names:
+            if name not in manifest.shards:
+                raise KeyError(f"Shard not registered: {name}")
+        return cls(
+            {name: CompactIndex.load(manifest.shard_dir(name), mmap=mmap) for name in names},
+            max_workers=max_workers
+        )
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """Metadata of the first shard (embedding model, dimension)."""
+        return self.shards[0].meta if self.shards else {}
+
+    def search(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int = 5
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Search all shards in parallel and merge the results.
+
+        Args:
+            query_vectors: Float32 array of shape (n_queries, dimension).
+            top_k: Number of neighbours per query.
+
+        Returns:
+            Tuple of (distances, shard numbers, rows), each shaped
+            (n_queries, top_k). Shard numbers index ``names``; both shard
+            numbers and rows are -1 where fewer than top_k results exist.
+        """
+        queries = np.ascontiguousarray(query_vectors, dtype="float32")
+        if queries.ndim == 1:
+            queries = queries[np.newaxis, :]
+
+        futures = [
+            self._executor.submit(shard.search, queries, top_k)
+            for shard in self.shards
+        ]
+        results = [future.result() for future in futures]
+
+        distances = np.concatenate([d for d, _ in results], axis=1)
+        rows = np.concatenate([r for _, r in results], axis=1)
+        shard_ids = np.concatenate(
+            [np.full(r.shape, i, dtype=np.int64) for i, (_, r) in enumerate(results)],
+            axis=1
+        )
+        distances = np.where(rows >= 0, distances, np.inf)
+
+        order = np.argsort(distances, axis=1, kind="stable")[:, :top_k]
+        distances = np.take_along_axis(distances, order, axis=1)
+        rows = np.take_along_axis(rows, order, axis=1)
+        shard_ids = np.where(rows >= 0, np.take_along_axis(shard_ids, order, axis=1), -1)
+        return distances, shard_ids, rows
+
+    def record(self, shard: int, row: int) -> Dict[str, str]:
+        """
+        Return the record for a search result.
+
+        Args:
+            shard: Shard number from search.
+            row: Row within that shard.
+
+        Returns:
+            Record fields.
+        """
+        return self.shards[shard].records[row]
+
+    def close(self) -> None:
+        """Shut down the search thread pool."""
+        self._executor.shutdown(wait=False)
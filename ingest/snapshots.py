@@ -0,0 +1,220 @@
+"""Versioned Index Snapshots with Atomic Publishing for SuperStream RAG System."""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SNAPSHOTS_DIR = "snapshots"
+CURRENT_FILE = "CURRENT.json"
+STAGING_SUFFIX = ".staging"
+DEFAULT_RETAIN = 3
+# The current snapshot and the one before it, which query processes may
+# still be serving or loading right after a publish
+MIN_RETAIN = 2
+
+
+def resolve_index_dir(index_dir: Path) -> Path:
+    """
+    Resolve an index directory to the snapshot it currently points at.
+
+    Directories without a snapshot pointer (flat layout written before
+    snapshots, or a snapshot directory itself) resolve to themselves, so
+    every loader can call this unconditionally.
+
+    Args:
+        index_dir: Index root or plain index directory.
+
+    Returns:
+        Directory holding the index files.
+    """
+    index_dir = Path(index_dir)
+    version = SnapshotStore(index_dir).current()
+    return index_dir / SNAPSHOTS_DIR / version if version else index_dir
+
+
+class SnapshotStore:
+    """
+    Versioned snapshots of one index under a root directory.
+
+    A build writes into a staging directory (``begin``), which ``publish``
+    renames to ``snapshots/<version>`` and then makes current by atomically
+    replacing ``CURRENT.json``. Files of a published snapshot are never
+    modified again, so a reader resolving the pointer always sees one
+    complete index, and the pointer swap is the only step readers can
+    observe. The last ``retain`` snapshots are kept for rollback; at least
+    two, so a publish never deletes the snapshot that was current a moment
+    earlier while readers may still be using it.
+
+    Layout::
+
+        <root>/CURRENT.json                 {"version": ..., "published_at": ...}
+        <root>/snapshots/<version>/         complete index files
+        <root>/snapshots/<version>.staging/ build in progress
+
+    Attributes:
+        root: Index root directory.
+        retain: Number of snapshots kept by prune (at least MIN_RETAIN).
+    """
+
+    def __init__(self, root: Path, retain: int = DEFAULT_RETAIN):
+        """
+        Initialize snapshot store.
+
+        Args:
+            root: Index root directory.
+            retain: Number of snapshots to keep; raised to MIN_RETAIN
+                    if lower.
+        """
+        self.root = Path(root)
+        self.retain = max(MIN_RETAIN, retain)
+
+    @property
+    def snapshots_dir(self) -> Path:
+        """Directory holding the snapshot directories."""
+        return self.root / SNAPSHOTS_DIR
+
+    def snapshot_dir(self, version: str) -> Path:
+        """Directory of a snapshot version."""
+        return self.snapshots_dir / version
+
+    def current(self) -> Optional[str]:
+        """
+        Get the published version.
+
+        Returns:
+            Current version, or None if nothing was published yet.
+        """
+        try:
+            with open(self.root / CURRENT_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)["version"]
+        except FileNotFoundError:
+            return None
+
+    def versions(self) -> List[str]:
+        """
+        List published snapshot versions.
+
+        Returns:
+            Versions, oldest first.
+        """
+        if not self.snapshots_dir.is_dir():
+            return []
+        return sorted(
+            path.name for path in self.snapshots_dir.iterdir()
+            if path.is_dir() and not path.name.endswith(STAGING_SUFFIX)
+        )
+
+    def _new_version(self) -> str:
+        # Sortable UTC timestamp; bumped if a build finishes within the same microsecond
+        version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        existing = set(self.versions())
+        while version in existing or self.snapshot_dir(version + STAGING_SUFFIX).exists():
+            time.sleep(1e-6)
+            version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        return version
+
+    def begin(self) -> Path:
+        """
+        Create an empty staging directory for a new snapshot.
+
+        Incremental builds read the current snapshot (resolve_index_dir)
+        and write the updated index here, leaving the published files
+        untouched.
+
+        Returns:
+            Staging directory to write the index into.
+        """
+        staging = self.snapshot_dir(self._new_version() + STAGING_SUFFIX)
+        staging.mkdir(parents=True)
+        return staging
+
+    def publish(self, staging: Path) -> str:
+        """
+        Publish a finished staging directory as the current snapshot.
+
+        Args:
+            staging: Directory returned by begin.
+
+        Returns:
+            Published version.
+
+        Raises:
+            ValueError: If the directory is not a staging directory of this store.
+        """
+        staging = Path(staging)
+        if staging.parent != self.snapshots_dir or not staging.name.endswith(STAGING_SUFFIX):
+            raise ValueError(f"Not a staging directory of {self.root}: {staging}")
+
+        version = staging.name[:-len(STAGING_SUFFIX)]
+        os.replace(staging, self.snapshot_dir(version))
+        self._point_to(version)
+        self.prune()
+        return version
+
+    def discard(self, staging: Path) -> None:
+        """Remove an unpublished staging directory."""
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def rollback(self, version: Optional[str] = None) -> str:
+        """
+        Point the index back at an earlier snapshot.
+
+        Args:
+            version: Version to restore. Defaults to the one before current.
+
+        Returns:
+            Restored version.
+
+        Raises:
+            ValueError: If there is no such (or no earlier) snapshot.
+        """
+        versions = self.versions()
+        if version is None:
+            current = self.current()
+            earlier = [v for v in versions if current is None or v < current]
+            if not earlier:
+                raise ValueError(f"No snapshot older than {current} to roll back to")
+            version = earlier[-1]
+        elif version not in versions:
+            raise ValueError(f"Unknown snapshot: {version}")
+        self._point_to(version)
+        return version
+
+    def prune(self) -> List[str]:
+        """
+        Delete snapshots beyond the newest ``retain`` ones.
+
+        The current snapshot is always kept, even after a rollback to an
+        old version. Readers that still have files of a deleted snapshot
+        mapped keep working on POSIX; elsewhere a snapshot in use may
+        survive until the next prune.
+
+        Returns:
+            Removed versions.
+        """
+        current = self.current()
+        versions = self.versions()
+        removed = [
+            version for version in versions[:-self.retain]
+            if version != current
+        ]
+        for version in removed:
+            shutil.rmtree(self.snapshot_dir(version), ignore_errors=True)
+        return removed
+
+    def _point_to(self, version: str) -> None:
+        pointer: Dict[str, Any] = {
+            "version": version,
+            "published_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        path = self.root / CURRENT_FILE
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(pointer, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
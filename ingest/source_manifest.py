@@ -0,0 +1,203 @@
+"""Source Fingerprint Manifest for Incremental Glossary Extraction."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+MANIFEST_NAME = "extraction_manifest.json"
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 digest of a file without loading it into memory.
+
+    Args:
+        path: File path.
+        chunk_size: Bytes read per iteration.
+
+    Returns:
+        Hex-encoded digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SourceManifest:
+    """
+    Records a fingerprint of every extracted source file.
+
+    Each entry stores the source's size, mtime, content hash, the extractor
+    version that processed it and the JSON output it produced. A file is
+    considered unchanged when size and mtime match (no hashing needed), or
+    when they differ but the content hash still matches, as long as the
+    extractor version is the same and the output still exists.
+
+    Attributes:
+        path: Manifest file path.
+        extractor_version: Current extractor version.
+        entries: Mapping of source key (path relative to the source dir) to entry.
+    """
+
+    def __init__(self, path: Path, extractor_version: str):
+        """
+        Initialize an empty manifest.
+
+        Args:
+            path: Manifest file path.
+            extractor_version: Current extractor version.
+        """
+        self.path = Path(path)
+        self.extractor_version = extractor_version
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._hashes: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, output_dir: Path, extractor_version: str) -> "SourceManifest":
+        """
+        Load the manifest from an output directory, or start an empty one.
+
+        Args:
+            output_dir: Directory holding the extracted JSON outputs.
+            extractor_version: Current extractor version.
+
+        Returns:
+            SourceManifest instance.
+        """
+        manifest = cls(Path(output_dir) / MANIFEST_NAME, extractor_version)
+        if manifest.path.exists():
+            with open(manifest.path, "r", encoding="utf-8") as f:
+                manifest.entries = json.load(f).get("files", {})
+        return manifest
+
+    @staticmethod
+    def key(path: Path, source_dir: Path) -> str:
+        """Return the manifest key for a source file."""
+        return Path(path).relative_to(source_dir).as_posix()
+
+    def _hash(self, key: str, path: Path) -> str:
+        if key not in self._hashes:
+            self._hashes[key] = file_sha256(path)
+        return self._hashes[key]
+
+    def is_unchanged(self, key: str, path: Path) -> bool:
+        """
+        Check whether a source file can be skipped.
+
+        Args:
+            key: Manifest key.
+            path: Source file path.
+
+        Returns:
+            True if the file and extractor version match the recorded entry
+            and its output (if any) still exists.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry.get("extractor_version") != self.extractor_version:
+            return False
+
+        output = entry.get("output")
+        if output and not (self.path.parent / output).exists():
+            return False
+
+        stat = path.stat()
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+
+        if stat.st_size != entry["size"] or self._hash(key, path) != entry["sha256"]:
+            return False
+
+        # Touched but identical: refresh the stat so the next run skips hashing
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    def diff(
+        self,
+        html_files: List[Path],
+        source_dir: Path
+    ) -> Tuple[List[Path], List[Path], List[str]]:
+        """
+        Split sources into changed and unchanged files and find deleted ones.
+
+        Args:
+            html_files: Current source files.
+            source_dir: Directory the manifest keys are relative to.
+
+        Returns:
+            Tuple of (changed files, unchanged files, keys of deleted sources).
+        """
+        changed, unchanged = [], []
+        current_keys = set()
+        for path in html_files:
+            key = self.key(path, source_dir)
+            current_keys.add(key)
+            if self.is_unchanged(key, path):
+                unchanged.append(path)
+            else:
+                changed.append(path)
+
+        deleted = sorted(set(self.entries) - current_keys)
+        return changed, unchanged, deleted
+
+    def record(self, key: str, path: Path, output: Optional[str]) -> None:
+        """
+        Record the fingerprint of a successfully processed source.
+
+        Args:
+            key: Manifest key.
+            path: Source file path.
+            output: Output file name relative to the output dir, or None if
+                    the source produced no output.
+        """
+        stat = path.stat()
+        self.entries[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": self._hash(key, path),
+            "extractor_version": self.extractor_version,
+            "output": output,
+        }
+
+    def remove(self, key: str) -> Optional[str]:
+        """
+        Forget a source and return its output if no other source shares it.
+
+        Args:
+            key: Manifest key.
+
+        Returns:
+            Output file name that is now orphaned, or None.
+        """
+        entry = self.entries.pop(key, None)
+        self._hashes.pop(key, None)
+        if entry is None or not entry.get("output"):
+            return None
+
+        output = entry["output"]
+        if any(other.get("output") == output for other in self.entries.values()):
+            return None
+        return output
+
+    def save(self) -> Path:
+        """
+        Atomically write the manifest next to the outputs.
+
+        Returns:
+            Path to the manifest file.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"extractor_version": self.extractor_version, "files": self.entries},
+                f,
+                ensure_ascii=False,
+                indent=2,
+                sort_keys=True
+            )
+        os.replace(tmp_path, self.path)
+        return self.path
@@ -0,0 +1,158 @@
+"""Batch Glossary Retrieval for SuperStream RAG System."""
+
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.glossary_retriever import RETRIEVAL_MODES, GlossaryRetriever
+from config import DATA_DIR
+
+DEFAULT_INDEX_DIR = DATA_DIR / "indices" / "superstream_glossary_index"
+DEFAULT_CHUNK_SIZE = 1024
+
+# A query is either raw text or a record with a "query" field and any
+# extra fields (such as "id") that should be carried into the output
+QueryInput = Union[str, Dict[str, Any]]
+
+
+def read_queries(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream queries from a JSONL or plain text file.
+
+    JSONL lines must be objects with a "query" field; other lines are
+    taken as the query text. Blank lines are skipped.
+
+    Args:
+        path: Query file path.
+
+    Yields:
+        Query records with at least a "query" field.
+
+    Raises:
+        ValueError: If a JSON object line has no "query" field.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                if "query" not in record:
+                    raise ValueError(f"{path}:{line_number}: missing 'query' field")
+                yield record
+            else:
+                yield {"query": line}
+
+
+def batch_retrieve(
+    retriever: GlossaryRetriever,
+    queries: Iterable[QueryInput],
+    top_k: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Retrieve glossary entries for a list or stream of queries.
+
+    Queries are consumed ``chunk_size`` at a time; each chunk is embedded
+    in one batched model call and searched with one FAISS search over the
+    query matrix, so memory stays bounded by the chunk regardless of how
+    many queries are streamed.
+
+    Args:
+        retriever: Loaded glossary retriever.
+        queries: Query texts or records with a "query" field.
+        top_k: Number of results per query. Defaults to retriever.top_k.
+        chunk_size: Queries per embedding and search batch.
+
+    Yields:
+        One record per query, in input order, with the input fields plus
+        "results".
+    """
+    records = (
+        {"query": query} if isinstance(query, str) else query
+        for query in queries
+    )
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        results = retriever.retrieve_batch([record["query"] for record in chunk], top_k)
+        for record, hits in zip(chunk, results):
+            yield {**record, "results": hits}
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], output_path: Path) -> int:
+    """
+    Stream records to a JSONL file.
+
+    Args:
+        records: Records to write.
+        output_path: Output file path.
+
+    Returns:
+        Number of records written.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def main():
+    """Main entry point for batch retrieval."""
+    parser = argparse.ArgumentParser(
+        description="Run a file of queries against the glossary index and write JSONL results"
+    )
+    parser.add_argument("input", type=Path, help="Queries (JSONL with 'query' field, or one per line)")
+    parser.add_argument("output", type=Path, help="Output JSONL path")
+    parser.add_argument(
+        "--index-dir",
+        type=Path,
+        default=DEFAULT_INDEX_DIR,
+        help="Persisted glossary index directory"
+    )
+    parser.add_argument("--mode", choices=RETRIEVAL_MODES, default=None, help="Retrieval mode")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Queries per embedding and search batch"
+    )
+    args = parser.parse_args()
+
+    try:
+        retriever = GlossaryRetriever.from_persist_dir(
+            args.index_dir,
+            top_k=args.top_k,
+            mode=args.mode
+        )
+        print(f"[OK] Loaded {len(retriever.index)} entries from {args.index_dir} (mode: {retriever.mode})")
+
+        start = time.perf_counter()
+        results = batch_retrieve(retriever, read_queries(args.input), args.top_k, args.chunk_size)
+        count = write_jsonl(results, args.output)
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        print(f"[ERROR] Batch retrieval failed: {e}")
+        sys.exit(1)
+
+    print(f"[SUCCESS] Wrote {count} results to {args.output}")
+    print(f"  Time: {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} queries/s)")
+    print(f"  Fast path hits: {retriever.fast_path_hits}, searched: {count - retriever.fast_path_hits}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+"""Glossary Retriever with Exact-Term and Acronym Fast Path."""
+
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ingest.dedup import ALIAS_SEPARATOR
+from ingest.embedding_backends import create_embedding_model, embed_queries
+from ingest.index_store import CompactIndex
+from ingest.lexical_index import LexicalIndex
+from ingest.snapshots import resolve_index_dir
+from retrieval.query_cache import QueryCache
+
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+
+# Reciprocal rank fusion damping constant (Cormack et al.)
+RRF_K = 60
+
+# "Unique Superannuation Identifier (USI)" -> ("Unique Superannuation Identifier", "USI")
+ACRONYM_PATTERN = re.compile(r"^(?P<long>.+?)\s*\((?P<short>[^()]+)\)\s*$")
+
+# Question wrappers stripped before the exact lookup ("what is a USI?" -> "usi")
+QUESTION_PATTERN = re.compile(
+    r"^(?:what\s+(?:is|are|does)\s+(?:an?\s+|the\s+)?|define\s+|definition\s+of\s+"
+    r"|meaning\s+of\s+)?(?P<term>.*?)(?:\s+(?:mean|meaning|stand\s+for))?\s*\??$"
+)
+
+
+def normalize_term(text: str) -> str:
+    """
+    Normalize a term or query for exact lookup.
+
+    Applies Unicode NFKC, lower-cases, turns punctuation into spaces and
+    collapses whitespace, so "APRA-regulated fund" and "apra regulated fund"
+    map to the same key.
+
+    Args:
+        text: Term or query text.
+
+    Returns:
+        Normalized key.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def term_aliases(term: str) -> List[str]:
+    """
+    Derive lookup aliases from a glossary term.
+
+    A term of the form "Long form (SHORT)" yields the long form and the
+    short form as aliases in addition to the full term.
+
+    Args:
+        term: Glossary term.
+
+    Returns:
+        Normalized aliases, the full term first.
+    """
+    aliases = [normalize_term(term)]
+    match = ACRONYM_PATTERN.match(term.strip())
+    if match:
+        for part in (match.group("long"), match.group("short")):
+            alias = normalize_term(part)
+            if alias and alias not in aliases:
+                aliases.append(alias)
+    return aliases
+
+
+def query_keys(query: str) -> List[str]:
+    """
+    Candidate lookup keys for a user query.
+
+    Args:
+        query: Raw query text.
+
+    Returns:
+        The normalized query and, if different, the query with question
+        wrappers such as "what is" or "meaning of" removed.
+    """
+    keys = [normalize_term(query)]
+    match = QUESTION_PATTERN.match(query.strip().lower())
+    if match:
+        stripped = normalize_term(match.group("term"))
+        if stripped and stripped not in keys:
+            keys.append(stripped)
+    return keys
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[int]],
+    k: int = RRF_K
+) -> List[Tuple[int, float]]:
+    """
+    Fuse ranked lists of rows with reciprocal rank fusion.
+
+    Each row scores sum(1 / (k + rank)) over the lists it appears in, so
+    rows ranked well by both lexical and vector search rise to the top
+    without having to calibrate BM25 scores against L2 distances.
+
+    Args:
+        rankings: Ranked row lists, best first.
+        k: Damping constant.
+
+    Returns:
+        (row, score) pairs sorted by descending fused score.
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class GlossaryRetriever:
+    """
+    Retrieves glossary entries, answering literal lookups without embedding.
+
+    Queries are first resolved against an in-memory map of normalized terms
+    and acronym aliases built from the index records. Only on a miss is the
+    query searched, by vector similarity, BM25 or both fused ("hybrid").
+    With a QueryCache, repeated queries (exact after normalization, or
+    with a near-identical embedding) reuse earlier search results.
+
+    Attributes:
+        index: Compact index holding the FAISS vectors and records.
+        lexical_index: BM25 index over the same rows, or None.
+        mode: Search mode used on a fast-path miss, one of RETRIEVAL_MODES.
+        top_k: Default number of results.
+        alias_map: Normalized term/alias to record rows.
+        fast_path_hits: Number of queries answered from the alias map.
+        vector_searches: Number of queries that fell back to vector search.
+        cache: Query result cache, or None.
+    """
+
+    def __init__(
+        self,
+        index: CompactIndex,
+        embed_model: Optional[Any] = None,
+        top_k: int = 5,
+        lexical_index: Optional[LexicalIndex] = None,
+        mode: Optional[str] = None,
+        cache: Optional[QueryCache] = None
+    ):
+        """
+        Initialize glossary retriever.
+
+        Args:
+            index: Loaded compact index.
+            embed_model: Embedding model for the vector fallback. Created
+                         lazily from the index metadata when not provided.
+            top_k: Default number of results.
+            lexical_index: BM25 index aligned with the index records.
+            mode: Search mode on a fast-path miss. Defaults to "hybrid" when
+                  a lexical index is available, otherwise "vector".
+            cache: Query result cache. It is bound to the index version, so
+                   entries from a previous index are discarded.
+
+        Raises:
+            ValueError: If the mode is unknown or needs a missing lexical index.
+        """
+        mode = mode or ("hybrid" if lexical_index is not None else "vector")
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unsupported retrieval mode: {mode}. "
+                f"Choose one of {', '.join(RETRIEVAL_MODES)}"
+            )
+        if mode != "vector" and lexical_index is None:
+            raise ValueError(f"Retrieval mode '{mode}' requires a lexical index")
+
+        self.index = index
+        self.lexical_index = lexical_index
+        self.mode = mode
+        self.top_k = top_k
+        self.fast_path_hits = 0
+        self.vector_searches = 0
+        self.cache = cache
+        if cache is not None:
+            cache.bind(index.version)
+        self._embed_model = embed_model
+
+        self.alias_map: Dict[str, List[int]] = {}
+        if "term" in index.records.columns:
+            terms = index.records.column("term")
+            # Terms of near-duplicate entries collapsed into this row
+            merged = (
+                index.records.column("aliases") if "aliases" in index.records.columns
+                else [""] * len(terms)
+            )
+            for row, (term, merged_terms) in enumerate(zip(terms, merged)):
+                names = [term] + (merged_terms.split(ALIAS_SEPARATOR) if merged_terms else [])
+                for name in names:
+                    if not name:
+                        continue
+                    for alias in term_aliases(name):
+                        rows = self.alias_map.setdefault(alias, [])
+                        if row not in rows:
+                            rows.append(row)
+
+    @classmethod
+    def from_persist_dir(
+        cls,
+        persist_dir: Path,
+        embed_model: Optional[Any] = None,
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        cache: Optional[QueryCache] = None
+    ) -> "GlossaryRetriever":
+        """
+        Load a retriever from a persisted index directory.
+
+        The BM25 index is loaded alongside the vector index when present.
+        For a snapshot root, both come from the snapshot current at call time.
+
+        Args:
+            persist_dir: Directory written by glossary_to_faiss.
+            embed_model: Embedding model for the vector fallback.
+            top_k: Default number of results.
+            mode: Search mode on a fast-path miss (see __init__).
+            cache: Query result cache (see __init__).
+
+        Returns:
+            GlossaryRetriever instance.
+        """
+        # Resolve once so a publish in between cannot mix two snapshots
+        persist_dir = resolve_index_dir(persist_dir)
+        try:
+            lexical_index = LexicalIndex.load(persist_dir)
+        except FileNotFoundError:
+            lexical_index = None
+        return cls(
+            CompactIndex.load(persist_dir),
+            embed_model=embed_model,
+            top_k=top_k,
+            lexical_index=lexical_index,
+            mode=mode,
+            cache=cache
+        )
+
+    @property
+    def embed_model(self) -> Any:
+        """Embedding model used for the vector fallback, created on first use."""
+        if self._embed_model is None:
+            model_name = self.index.meta.get("embedding_model")
+            if not model_name:
+                raise ValueError("Index metadata does not record an embedding model")
+            self._embed_model = create_embedding_model(model_name=model_name)
+        return self._embed_model
+
+    def _hit(self, row: int, match: str, **scores: float) -> Dict[str, Any]:
+        record = self.index.records[row]
+        hit = {
+            "row": row,
+            "term": record.get("term", ""),
+            "definition": record.get("definition", ""),
+            "text": record.get("text", ""),
+            "match": match,
+        }
+        hit.update(scores)
+        return hit
+
+    def lookup(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Resolve a query against the exact term and acronym maps only.
+
+        Args:
+            query: Raw query text.
+
+        Returns:
+            Matching entries (empty list on a miss).
+        """
+        for key in query_keys(query):
+            rows = self.alias_map.get(key)
+            if rows:
+                return [self._hit(row, "exact", distance=0.0) for row in rows]
+        return []
+
+    def vector_search(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Embed a query and search the FAISS index.
+
+        Args:
+            query: Raw query text.
+            top_k: Number of results. Defaults to self.top_k.
+
+        Returns:
+            Entries ordered by increasing L2 distance.
+        """
+        return self.vector_search_batch([query], top_k)[0]
+
+    def vector_search_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Embed queries in one model call and run one FAISS search over them.
+
+        Args:
+            queries: Raw query texts.
+            top_k: Number of results per query. Defaults to self.top_k.
+
+        Returns:
+            Per-query entries ordered by increasing L2 distance.
+        """
+        if not queries:
+            return []
+        embeddings = np.array(embed_queries(self.embed_model, queries), dtype="float32")
+        return self._vector_hits(embeddings, top_k or self.top_k)
+
+    def _vector_hits(
+        self,
+        embeddings: np.ndarray,
+        top_k: int
+    ) -> List[List[Dict[str, Any]]]:
+        distances, rows = self.index.search(embeddings, top_k)
+        return [
+            [
+                self._hit(int(row), "vector", distance=float(distance))
+                for distance, row in zip(query_distances, query_rows)
+                if row >= 0
+            ]
+            for query_distances, query_rows in zip(distances, rows)
+        ]
+
+    def lexical_search(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search the BM25 index; no embedding call is made.
+
+        Args:
+            query: Raw query text.
+            top_k: Number of results. Defaults to self.top_k.
+
+        Returns:
+            Entries ordered by decreasing BM25 score.
+
+        Raises:
+            ValueError: If no lexical index is loaded.
+        """
+        if self.lexical_index is None:
+            raise ValueError("No lexical index loaded")
+        scores, rows = self.lexical_index.search(query, top_k or self.top_k)
+        return [
+            self._hit(int(row), "lexical", score=float(score))
+            for score, row in zip(scores, rows)
+        ]
+
+    def hybrid_search(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        candidates: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run lexical and vector search and fuse them with reciprocal rank fusion.
+
+        Args:
+            query: Raw query text.
+            top_k: Number of results. Defaults to self.top_k.
+            candidates: Results taken from each side before fusion.
+                        Defaults to 4 * top_k.
+
+        Returns:
+            Entries ordered by decreasing fused score.
+        """
+        top_k = top_k or self.top_k
+        candidates = candidates or 4 * top_k
+        return self._fuse(
+            self.lexical_search(query, candidates),
+            self.vector_search(query, candidates),
+            top_k
+        )
+
+    def _fuse(
+        self,
+        lexical: List[Dict[str, Any]],
+        vector: List[Dict[str, Any]],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        fused = reciprocal_rank_fusion([
+            [hit["row"] for hit in lexical],
+            [hit["row"] for hit in vector],
+        ])
+        return [self._hit(row, "hybrid", score=score) for row, score in fused[:top_k]]
+
+    def retrieve(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve glossary entries for a query.
+
+        Literal terms and acronyms are answered from the alias map; anything
+        else is searched according to self.mode.
+
+        Args:
+            query: Raw query text.
+            top_k: Number of results for the search fallback.
+
+        Returns:
+            List of entries with row, term, definition, text and match type
+            ("exact", "vector", "lexical" or "hybrid"), plus "distance" for
+            exact and vector matches or "score" for lexical and hybrid ones.
+        """
+        return self.retrieve_batch([query], top_k)[0]
+
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve glossary entries for many queries at once.
+
+        Equivalent to calling retrieve for each query, except that all
+        queries missing the fast path and the cache are embedded in one
+        model call and searched with one FAISS search over the query matrix.
+
+        Args:
+            queries: Raw query texts.
+            top_k: Number of results per query.
+
+        Returns:
+            Per-query result lists, aligned with ``queries``.
+        """
+        top_k = top_k or self.top_k
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        cache = self.cache
+        cache_keys: Dict[int, str] = {}
+
+        pending = []
+        for i, query in enumerate(queries):
+            hits = self.lookup(query)
+            if hits:
+                self.fast_path_hits += 1
+                results[i] = hits[:top_k]
+                continue
+            if cache is not None:
+                cache_keys[i] = QueryCache.key(normalize_term(query), top_k, self.mode)
+                hits = cache.get(cache_keys[i])
+                if hits is not None:
+                    results[i] = hits
+                    continue
+            pending.append(i)
+
+        if not pending:
+            return results
+
+        if self.mode == "lexical":
+            if cache is not None:
+                cache.record_miss(len(pending))
+            for i in pending:
+                results[i] = self.lexical_search(queries[i], top_k)
+                if cache is not None:
+                    cache.put(cache_keys[i], results[i], index_version=self.index.version)
+            return results
+
+        embeddings = np.array(
+            embed_queries(self.embed_model, [queries[i] for i in pending]),
+            dtype="float32"
+        )
+        if cache is not None:
+            missed = []
+            for position, i in enumerate(pending):
+                hits = cache.get_similar(embeddings[position], top_k, self.mode)
+                if hits is not None:
+                    results[i] = hits
+                else:
+                    missed.append(position)
+            pending = [pending[position] for position in missed]
+            embeddings = embeddings[missed]
+            cache.record_miss(len(pending))
+            if not pending:
+                return results
+
+        self.vector_searches += len(pending)
+        candidates = 4 * top_k if self.mode == "hybrid" else top_k
+        vector_hits = self._vector_hits(embeddings, candidates)
+        for i, embedding, hits in zip(pending, embeddings, vector_hits):
+            if self.mode == "hybrid":
+                hits = self._fuse(self.lexical_search(queries[i], candidates), hits, top_k)
+            results[i] = hits
+            if cache is not None:
+                cache.put(cache_keys[i], hits, embedding, index_version=self.index.version)
+        return results
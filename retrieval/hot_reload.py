@@ -0,0 +1,133 @@
+"""Hot Reload of Published Index Snapshots for SuperStream Query Processes."""
+
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ingest.index_store import RECORDS_FILE, ColumnarRecords
+from ingest.snapshots import SnapshotStore
+from retrieval.glossary_retriever import GlossaryRetriever
+
+
+class SnapshotReloader:
+    """
+    Loads newly published index snapshots next to the serving retriever.
+
+    ``poll`` checks the index's CURRENT.json pointer and, when it names a
+    new version (a publish or a rollback), loads that snapshot into a new
+    GlossaryRetriever with the same mode and top_k, reusing the loaded
+    embedding model when the snapshot was built with the same one, and
+    runs one search to page in the memory-mapped files. The serving
+    retriever is untouched meanwhile, so poll can run in a worker thread.
+    ``activate`` then makes the new retriever current: callers swap their
+    reference to it, queries already running finish on the old one, and
+    the query cache is re-bound to the new index.
+
+    A snapshot that fails to load is reported once and skipped until the
+    pointer moves again. Flat index directories (no snapshots) are never
+    reloaded.
+
+    Attributes:
+        store: Snapshot store of the served index.
+        retriever: Retriever currently serving queries.
+        version: Snapshot version of ``retriever`` (None for a flat index).
+        reloads: Number of snapshots activated.
+        last_reload_seconds: Load time of the most recent snapshot.
+    """
+
+    def __init__(self, index_dir: Path, retriever: GlossaryRetriever):
+        """
+        Initialize snapshot reloader.
+
+        Args:
+            index_dir: Index root the retriever was loaded from.
+            retriever: Retriever currently serving queries.
+        """
+        self.store = SnapshotStore(index_dir)
+        self.retriever = retriever
+        self.version = self.store.current()
+        self.reloads = 0
+        self.last_reload_seconds = 0.0
+        self._failed_version: Optional[str] = None
+
+    def poll(self) -> Optional[Tuple[str, GlossaryRetriever]]:
+        """
+        Load the current snapshot if it differs from the served one.
+
+        Returns:
+            (version, warmed-up retriever) for a new snapshot, or None if
+            the pointer has not moved.
+
+        Raises:
+            Exception: Whatever loading the new snapshot raised.
+        """
+        version = self.store.current()
+        if version is None or version == self.version or version == self._failed_version:
+            return None
+
+        start_time = time.perf_counter()
+        current = self.retriever
+        index_dir = self.store.snapshot_dir(version)
+        try:
+            embed_model = None
+            model_name = ColumnarRecords.load(index_dir / RECORDS_FILE).meta.get("embedding_model")
+            if current.mode != "lexical" and model_name == current.index.meta.get("embedding_model"):
+                embed_model = current.embed_model
+            # The cache is attached on activation, so it stays bound to the
+            # served index until the swap
+            retriever = GlossaryRetriever.from_persist_dir(
+                index_dir,
+                embed_model=embed_model,
+                top_k=current.top_k,
+                mode=current.mode
+            )
+            if retriever.mode == "lexical":
+                retriever.lexical_search("warm up")
+            else:
+                retriever.vector_search("warm up")
+        except Exception:
+            self._failed_version = version
+            raise
+
+        self.last_reload_seconds = time.perf_counter() - start_time
+        return version, retriever
+
+    def activate(self, version: str, retriever: GlossaryRetriever) -> GlossaryRetriever:
+        """
+        Make a retriever returned by poll the serving one.
+
+        Counters carry over and the previous retriever's cache is attached
+        (and cleared, since the index version changed).
+
+        Args:
+            version: Snapshot version returned by poll.
+            retriever: Retriever returned by poll.
+
+        Returns:
+            The retriever, for the caller to swap its reference to.
+        """
+        previous = self.retriever
+        retriever.fast_path_hits += previous.fast_path_hits
+        retriever.vector_searches += previous.vector_searches
+        retriever.cache = previous.cache
+        if retriever.cache is not None:
+            retriever.cache.bind(retriever.index.version)
+
+        self.retriever = retriever
+        self.version = version
+        self.reloads += 1
+        return retriever
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get reload counters.
+
+        Returns:
+            Dictionary with the served version and reload counters.
+        """
+        return {
+            "version": self.version,
+            "reloads": self.reloads,
+            "last_reload_seconds": round(self.last_reload_seconds, 3),
+            "failed_version": self._failed_version,
+        }
@@ -0,0 +1,308 @@
+"""Exact and Semantic Query Result Cache for SuperStream RAG System."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Rows of the semantic matrix allocated by the first put; doubled when full
+INITIAL_SLOTS = 64
+
+
+@dataclass
+class CacheEntry:
+    """
+    Cached results for one normalized query.
+
+    Attributes:
+        results: Retrieved entries.
+        created: time.monotonic() when the entry was stored.
+        slot: Row of the entry's query embedding in the semantic matrix,
+              or None when stored without an embedding.
+    """
+
+    results: List[Dict[str, Any]]
+    created: float
+    slot: Optional[int] = None
+
+
+class QueryCache:
+    """
+    Two-level LRU cache of retrieval results.
+
+    The exact level maps a normalized query (plus top_k and mode) to its
+    results, so it answers repeats without embedding anything. The
+    semantic level keeps the unit-length query embedding of each entry in
+    one matrix; a new query whose embedding has cosine similarity of at
+    least ``similarity_threshold`` to a cached one (same top_k and mode)
+    reuses that entry's results and skips the FAISS search. The embedding
+    matrix grows with the number of cached queries, up to ``max_entries``
+    rows.
+
+    Both levels share one LRU order, bounded by ``max_entries`` and
+    ``ttl_seconds``. ``bind`` clears the cache when the index it was
+    filled from changes; results a retriever still computes against the
+    previous index afterwards are not stored (see ``put``).
+
+    Attributes:
+        max_entries: Maximum number of cached queries.
+        ttl_seconds: Entry lifetime (None = no expiry).
+        similarity_threshold: Minimum cosine similarity for a semantic hit
+                              (None disables the semantic level).
+        index_version: Version of the index the entries came from.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: Optional[float] = 3600.0,
+        similarity_threshold: Optional[float] = 0.95
+    ):
+        """
+        Initialize query cache.
+
+        Args:
+            max_entries: Maximum number of cached queries.
+            ttl_seconds: Entry lifetime in seconds (None = no expiry).
+            similarity_threshold: Minimum cosine similarity for a semantic
+                                  hit (None disables the semantic level).
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.index_version: Optional[str] = None
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_keys: List[Optional[str]] = []
+        self._free_slots: List[int] = []
+        self._lock = threading.Lock()
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(query_key: str, top_k: int, mode: str) -> str:
+        """
+        Build the cache key for a normalized query.
+
+        Args:
+            query_key: Normalized query text.
+            top_k: Number of results requested.
+            mode: Retrieval mode.
+
+        Returns:
+            Cache key.
+        """
+        return f"{mode}\x1f{top_k}\x1f{query_key}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def bind(self, index_version: Optional[str]) -> None:
+        """
+        Associate the cache with an index version, clearing it on change.
+
+        Args:
+            index_version: Version identifier of the loaded index.
+        """
+        with self._lock:
+            if index_version != self.index_version:
+                self._clear()
+                self.index_version = index_version
+
+    def invalidate(self) -> None:
+        """Drop every cached entry (e.g. after an index rebuild)."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._vectors = None
+        self._slot_keys = []
+        self._free_slots = []
+
+    def _expired(self, entry: CacheEntry, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry.created > self.ttl_seconds
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        if entry.slot is not None:
+            self._vectors[entry.slot] = 0.0
+            self._slot_keys[entry.slot] = None
+            self._free_slots.append(entry.slot)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up the exact level.
+
+        Misses are not counted here, since the semantic level may still
+        answer the query; call record_miss once both levels missed.
+
+        Args:
+            key: Cache key from QueryCache.key.
+
+        Returns:
+            Cached results, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, time.monotonic()):
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return entry.results
+
+    def get_similar(
+        self,
+        embedding: np.ndarray,
+        top_k: int,
+        mode: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up the semantic level.
+
+        Args:
+            embedding: Query embedding.
+            top_k: Number of results requested.
+            mode: Retrieval mode.
+
+        Returns:
+            Results of the most similar cached query above the threshold,
+            or None.
+        """
+        if self.similarity_threshold is None:
+            return None
+        with self._lock:
+            if self._vectors is None or not self._entries:
+                return None
+            query = _unit(embedding)
+            if query.shape[0] != self._vectors.shape[1]:
+                return None
+
+            prefix = f"{mode}\x1f{top_k}\x1f"
+            similarities = self._vectors @ query
+            candidates = np.flatnonzero(similarities >= self.similarity_threshold)
+            now = time.monotonic()
+            for slot in candidates[np.argsort(-similarities[candidates], kind="stable")]:
+                key = self._slot_keys[slot]
+                if key is None or not key.startswith(prefix):
+                    continue
+                entry = self._entries[key]
+                if self._expired(entry, now):
+                    self._remove(key)
+                    self.expirations += 1
+                    continue
+                self._entries.move_to_end(key)
+                self.semantic_hits += 1
+                return entry.results
+            return None
+
+    def record_miss(self, count: int = 1) -> None:
+        """
+        Count queries that missed both levels.
+
+        Args:
+            count: Number of missed queries.
+        """
+        with self._lock:
+            self.misses += count
+
+    def put(
+        self,
+        key: str,
+        results: List[Dict[str, Any]],
+        embedding: Optional[np.ndarray] = None,
+        index_version: Optional[str] = None
+    ) -> None:
+        """
+        Store results, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key from QueryCache.key.
+            results: Retrieved entries.
+            embedding: Query embedding for the semantic level, if any.
+            index_version: Version of the index the results came from;
+                           results from another version than the bound
+                           one are dropped.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if index_version is not None and index_version != self.index_version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            slot = None
+            if embedding is not None and self.similarity_threshold is not None:
+                slot = self._allocate(_unit(embedding))
+                if slot is not None:
+                    self._slot_keys[slot] = key
+            self._entries[key] = CacheEntry(results, time.monotonic(), slot)
+
+    def _allocate(self, vector: np.ndarray) -> Optional[int]:
+        if self._vectors is None:
+            self._vectors = np.zeros((0, vector.shape[0]), dtype="float32")
+        if vector.shape[0] != self._vectors.shape[1]:
+            return None
+        if not self._free_slots:
+            # Grow by doubling, so memory follows the number of cached queries
+            size = len(self._vectors)
+            new_size = min(self.max_entries, max(INITIAL_SLOTS, 2 * size))
+            if new_size <= size:
+                return None
+            vectors = np.zeros((new_size, self._vectors.shape[1]), dtype="float32")
+            vectors[:size] = self._vectors
+            self._vectors = vectors
+            self._slot_keys.extend([None] * (new_size - size))
+            self._free_slots = list(range(new_size - 1, size - 1, -1))
+        slot = self._free_slots.pop()
+        self._vectors[slot] = vector
+        return slot
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary of counters and hit rates.
+        """
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            hits = self.exact_hits + self.semantic_hits
+            return {
+                "entries": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "semantic_hit_rate": self.semantic_hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "index_version": self.index_version,
+            }
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    """Return a float32 unit-length copy of a vector."""
+    vector = np.asarray(vector, dtype="float32").ravel()
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
@@ -0,0 +1,351 @@
+"""Local Glossary Query Server for SuperStream RAG System."""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.glossary_retriever import RETRIEVAL_MODES, GlossaryRetriever
+from retrieval.hot_reload import SnapshotReloader
+from retrieval.query_cache import QueryCache
+from config import DATA_DIR
+
+DEFAULT_INDEX_DIR = DATA_DIR / "indices" / "superstream_glossary_index"
+MAX_TOP_K = 100
+
+# (query, top_k, future resolved with the hits)
+PendingQuery = Tuple[str, int, "asyncio.Future[List[Dict[str, Any]]]"]
+
+
+class QueryBatcher:
+    """
+    Collects concurrent queries into micro-batches for one retriever.
+
+    Queries answered by the exact-term fast path return immediately. The
+    rest are queued; a single worker takes the first waiting query, keeps
+    collecting for up to ``max_wait_ms`` or until ``max_batch_size``
+    queries are waiting, and runs them through
+    GlossaryRetriever.retrieve_batch (one embedding call, one FAISS
+    search per distinct top_k) in a worker thread. Queries arriving while a batch runs are
+    collected into the next one, so batches grow with load.
+
+    Attributes:
+        retriever: Retriever shared by all requests.
+        max_batch_size: Maximum queries per batch.
+        max_wait_ms: Time to wait for more queries after the first one.
+        batches: Number of batches run.
+        batched_queries: Number of queries answered through batches.
+    """
+
+    def __init__(
+        self,
+        retriever: GlossaryRetriever,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize query batcher.
+
+        Args:
+            retriever: Retriever to answer queries with.
+            max_batch_size: Maximum queries per batch.
+            max_wait_ms: Collection window after the first queued query.
+        """
+        self.retriever = retriever
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.batched_queries = 0
+        self.max_observed_batch = 0
+        self._queue: Optional["asyncio.Queue[PendingQuery]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+
+    async def start(self) -> None:
+        """Start the batching worker on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Answer one query, batching it with concurrent ones when needed.
+
+        Args:
+            query: Raw query text.
+            top_k: Number of results.
+
+        Returns:
+            Retrieved glossary entries.
+
+        Raises:
+            RuntimeError: If the batcher has not been started.
+        """
+        if self._queue is None:
+            raise RuntimeError("QueryBatcher has not been started")
+
+        hits = self.retriever.lookup(query)
+        if hits:
+            self.retriever.fast_path_hits += 1
+            return hits[:top_k]
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, top_k, future))
+        return await future
+
+    async def _collect(self) -> List[PendingQuery]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Take whatever else is already waiting
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.max_observed_batch = max(self.max_observed_batch, len(batch))
+
+            # retrieve_batch takes one top_k, so run one search per distinct
+            # top_k instead of searching every query at the largest one
+            groups: Dict[int, List[PendingQuery]] = {}
+            for pending in batch:
+                groups.setdefault(pending[1], []).append(pending)
+
+            for top_k, group in groups.items():
+                queries = [query for query, _, _ in group]
+                try:
+                    results = await loop.run_in_executor(
+                        None, self.retriever.retrieve_batch, queries, top_k
+                    )
+                except Exception as e:
+                    print(f"[ERROR] Batch of {len(group)} queries failed: {e}")
+                    for _, _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                self.batches += 1
+                self.batched_queries += len(group)
+                for (_, _, future), hits in zip(group, results):
+                    if not future.done():
+                        future.set_result(hits)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching, retrieval and cache counters.
+
+        Returns:
+            Dictionary of counters.
+        """
+        stats = {
+            "mode": self.retriever.mode,
+            "entries": len(self.retriever.index),
+            "fast_path_hits": self.retriever.fast_path_hits,
+            "batched_queries": self.batched_queries,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_queries / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_observed_batch,
+        }
+        if self.retriever.cache is not None:
+            stats["cache"] = self.retriever.cache.stats()
+        return stats
+
+
+def create_app(
+    retriever: GlossaryRetriever,
+    max_batch_size: int = 64,
+    max_wait_ms: float = 5.0,
+    index_dir: Optional[Path] = None,
+    reload_interval: float = 0.0
+) -> web.Application:
+    """
+    Create the query server application.
+
+    Routes:
+        POST /query: JSON ``{"query": str, "top_k": int}``, returns
+                     ``{"query": str, "results": [...]}``.
+        GET /health: Server status, batching, cache and snapshot counters.
+
+    With ``index_dir`` and a positive ``reload_interval``, a background
+    task polls the index for newly published snapshots, loads them in a
+    worker thread (see SnapshotReloader) and swaps the batcher over to
+    the new retriever between batches. Requests are never paused; a batch
+    already running completes on the previous snapshot.
+
+    Args:
+        retriever: Loaded retriever shared by all requests.
+        max_batch_size: Maximum queries per embedding batch.
+        max_wait_ms: Micro-batch collection window in milliseconds.
+        index_dir: Index root the retriever was loaded from.
+        reload_interval: Seconds between snapshot checks (0 disables).
+
+    Returns:
+        aiohttp application.
+    """
+    batcher = QueryBatcher(retriever, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    reloader = None
+    if index_dir is not None and reload_interval > 0:
+        reloader = SnapshotReloader(index_dir, retriever)
+    reload_task: Optional["asyncio.Task[None]"] = None
+
+    async def watch_snapshots() -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(reload_interval)
+            try:
+                loaded = await loop.run_in_executor(None, reloader.poll)
+            except Exception as e:
+                print(f"[ERROR] Failed to load index snapshot, keeping {reloader.version}: {e}")
+                continue
+            if loaded is not None:
+                version, new_retriever = loaded
+                # Swapped on the event loop, so no request sees a half-made switch
+                batcher.retriever = reloader.activate(version, new_retriever)
+                print(f"[OK] Switched to index snapshot {version} "
+                      f"({len(new_retriever.index)} entries, loaded in {reloader.last_reload_seconds:.2f}s)")
+
+    async def query(request: web.Request) -> web.Response:
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Request body must be JSON")
+
+        text = payload.get("query") if isinstance(payload, dict) else None
+        if not isinstance(text, str) or not text.strip():
+            raise web.HTTPBadRequest(text="'query' must be a non-empty string")
+        top_k = payload.get("top_k", batcher.retriever.top_k)
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or not 1 <= top_k <= MAX_TOP_K:
+            raise web.HTTPBadRequest(text=f"'top_k' must be an integer between 1 and {MAX_TOP_K}")
+
+        results = await batcher.submit(text, top_k)
+        return web.json_response({"query": text, "results": results})
+
+    async def health(request: web.Request) -> web.Response:
+        stats = {"status": "ok", **batcher.stats()}
+        if reloader is not None:
+            stats["snapshot"] = reloader.stats()
+        return web.json_response(stats)
+
+    async def on_startup(app: web.Application) -> None:
+        nonlocal reload_task
+        await batcher.start()
+        if reloader is not None:
+            reload_task = asyncio.create_task(watch_snapshots())
+
+    async def on_cleanup(app: web.Application) -> None:
+        if reload_task is not None:
+            reload_task.cancel()
+            try:
+                await reload_task
+            except asyncio.CancelledError:
+                pass
+        await batcher.stop()
+
+    app = web.Application()
+    app["batcher"] = batcher
+    app["reloader"] = reloader
+    app.router.add_post("/query", query)
+    app.router.add_get("/health", health)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def main():
+    """Main entry point for the query server."""
+    parser = argparse.ArgumentParser(
+        description="Serve glossary queries over HTTP with micro-batched embedding"
+    )
+    parser.add_argument(
+        "--index-dir",
+        type=Path,
+        default=DEFAULT_INDEX_DIR,
+        help="Persisted glossary index directory (or snapshot root)"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to bind")
+    parser.add_argument("--mode", choices=RETRIEVAL_MODES, default=None, help="Retrieval mode")
+    parser.add_argument("--top-k", type=int, default=5, help="Default results per query")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Maximum queries per batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Batch collection window")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=10_000,
+        help="Cached query results (0 disables the cache)"
+    )
+    parser.add_argument("--cache-ttl", type=float, default=3600.0, help="Cache entry lifetime in seconds")
+    parser.add_argument(
+        "--semantic-threshold",
+        type=float,
+        default=0.95,
+        help="Cosine similarity for reusing a near-identical query's results (0 disables)"
+    )
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between checks for a newly published index snapshot (0 disables)"
+    )
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache_size > 0:
+        cache = QueryCache(
+            max_entries=args.cache_size,
+            ttl_seconds=args.cache_ttl if args.cache_ttl > 0 else None,
+            similarity_threshold=args.semantic_threshold if args.semantic_threshold > 0 else None
+        )
+
+    try:
+        retriever = GlossaryRetriever.from_persist_dir(
+            args.index_dir,
+            top_k=args.top_k,
+            mode=args.mode,
+            cache=cache
+        )
+        if retriever.mode != "lexical":
+            # Load the embedding model before accepting requests
+            retriever.embed_model.get_query_embedding("warm up")
+    except Exception as e:
+        print(f"[ERROR] Failed to load index from {args.index_dir}: {e}")
+        sys.exit(1)
+
+    print(f"[OK] Loaded {len(retriever.index)} entries from {args.index_dir} (mode: {retriever.mode})")
+    app = create_app(
+        retriever,
+        args.max_batch_size,
+        args.max_wait_ms,
+        index_dir=args.index_dir,
+        reload_interval=args.reload_interval
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
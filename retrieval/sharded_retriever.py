@@ -0,0 +1,192 @@
+"""Sharded Glossary Retriever for SuperStream RAG System."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ingest.embedding_backends import create_embedding_model, embed_queries
+from ingest.shards import ShardedIndex
+from retrieval.glossary_retriever import GlossaryRetriever
+
+
+class ShardedRetriever:
+    """
+    Retrieves glossary entries from every shard of an index collection.
+
+    Literal terms and acronyms are answered from each shard's alias map
+    (see GlossaryRetriever.lookup). Other queries are embedded once and
+    searched across all shards in parallel through ShardedIndex, with the
+    merged top-k ordered by L2 distance. Every hit carries the name of the
+    shard it came from.
+
+    Attributes:
+        index: Sharded index searched on a fast-path miss.
+        top_k: Default number of results.
+        fast_path_hits: Number of queries answered from the alias maps.
+        vector_searches: Number of queries searched across shards.
+    """
+
+    def __init__(
+        self,
+        index: ShardedIndex,
+        embed_model: Optional[Any] = None,
+        top_k: int = 5
+    ):
+        """
+        Initialize sharded retriever.
+
+        Args:
+            index: Loaded sharded index.
+            embed_model: Embedding model for the vector search. Created
+                         lazily from the shard metadata when not provided.
+            top_k: Default number of results.
+        """
+        self.index = index
+        self.top_k = top_k
+        self.fast_path_hits = 0
+        self.vector_searches = 0
+        self._embed_model = embed_model
+        self._lookups = [
+            GlossaryRetriever(shard, embed_model=embed_model, top_k=top_k, mode="vector")
+            for shard in index.shards
+        ]
+
+    @classmethod
+    def from_collection_dir(
+        cls,
+        collection_dir: Path,
+        shards: Optional[Sequence[str]] = None,
+        embed_model: Optional[Any] = None,
+        top_k: int = 5
+    ) -> "ShardedRetriever":
+        """
+        Load a retriever from a collection directory.
+
+        Args:
+            collection_dir: Directory written by build_shards.
+            shards: Shards to search. Defaults to all registered shards.
+            embed_model: Embedding model for the vector search.
+            top_k: Default number of results.
+
+        Returns:
+            ShardedRetriever instance.
+        """
+        return cls(
+            ShardedIndex.load(collection_dir, names=shards),
+            embed_model=embed_model,
+            top_k=top_k
+        )
+
+    @property
+    def embed_model(self) -> Any:
+        """Embedding model used for the vector search, created on first use."""
+        if self._embed_model is None:
+            model_name = self.index.meta.get("embedding_model")
+            if not model_name:
+                raise ValueError("Shard metadata does not record an embedding model")
+            self._embed_model = create_embedding_model(model_name=model_name)
+        return self._embed_model
+
+    def lookup(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Resolve a query against the exact term and acronym maps of all shards.
+
+        Args:
+            query: Raw query text.
+
+        Returns:
+            Matching entries from every shard (empty list on a miss).
+        """
+        hits = []
+        for name, retriever in zip(self.index.names, self._lookups):
+            hits.extend(dict(hit, shard=name) for hit in retriever.lookup(query))
+        return hits
+
+    def vector_search_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Embed queries in one model call and search all shards with them.
+
+        Args:
+            queries: Raw query texts.
+            top_k: Number of results per query. Defaults to self.top_k.
+
+        Returns:
+            Per-query entries ordered by increasing L2 distance.
+        """
+        if not queries:
+            return []
+        top_k = top_k or self.top_k
+        embeddings = np.array(embed_queries(self.embed_model, queries), dtype="float32")
+        distances, shard_ids, rows = self.index.search(embeddings, top_k)
+
+        results = []
+        for query_distances, query_shards, query_rows in zip(distances, shard_ids, rows):
+            hits = []
+            for distance, shard, row in zip(query_distances, query_shards, query_rows):
+                if row < 0:
+                    continue
+                record = self.index.record(int(shard), int(row))
+                hits.append({
+                    "shard": self.index.names[shard],
+                    "row": int(row),
+                    "term": record.get("term", ""),
+                    "definition": record.get("definition", ""),
+                    "text": record.get("text", ""),
+                    "match": "vector",
+                    "distance": float(distance),
+                })
+            results.append(hits)
+        return results
+
+    def retrieve(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve glossary entries for a query from all shards.
+
+        Args:
+            query: Raw query text.
+            top_k: Number of results.
+
+        Returns:
+            Entries with shard, row, term, definition, text, match type and
+            distance.
+        """
+        return self.retrieve_batch([query], top_k)[0]
+
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve glossary entries for many queries at once.
+
+        Args:
+            queries: Raw query texts.
+            top_k: Number of results per query.
+
+        Returns:
+            Per-query result lists, aligned with ``queries``.
+        """
+        top_k = top_k or self.top_k
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+
+        pending = []
+        for i, query in enumerate(queries):
+            hits = self.lookup(query)
+            if hits:
+                self.fast_path_hits += 1
+                results[i] = hits[:top_k]
+            else:
+                pending.append(i)
+
+        if pending:
+            self.vector_searches += len(pending)
+            vector_hits = self.vector_search_batch([queries[i] for i in pending], top_k)
+            for i, hits in zip(pending, vector_hits):
+                results[i] = hits
+        return results